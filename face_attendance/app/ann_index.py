@@ -0,0 +1,382 @@
+import json
+import threading
+import time
+
+import numpy as np
+
+from face_index import FaceIndex, top_k_smallest
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+def _squared_distances(queries, matrix, norms=None):
+    """(M, D) 와 (N, D) 사이의 제곱 유클리드 거리 (M, N)"""
+    if norms is None:
+        norms = np.einsum('ij,ij->i', matrix, matrix)
+    squared = (np.einsum('ij,ij->i', queries, queries)[:, None]
+               + norms[None, :] - 2.0 * (queries @ matrix.T))
+    np.maximum(squared, 0.0, out=squared)
+    return squared
+
+
+def _nearest_centroid(vectors, centroids, chunk_size=8192):
+    """각 벡터에 가장 가까운 중심점 번호 (메모리 사용량을 제한하기 위해 나누어 계산)"""
+    norms = np.einsum('ij,ij->i', centroids, centroids)
+    assign = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk_size):
+        chunk = vectors[start:start + chunk_size]
+        assign[start:start + chunk_size] = np.argmin(_squared_distances(chunk, centroids, norms), axis=1)
+    return assign
+
+
+def kmeans(vectors, nlist, iterations=10, sample_size=None, seed=0):
+    """순수 NumPy k-means (IVF 중심점 학습용)"""
+    rng = np.random.default_rng(seed)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if sample_size is not None and len(vectors) > sample_size:
+        vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    nlist = min(nlist, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assign = _nearest_centroid(vectors, centroids)
+        counts = np.bincount(assign, minlength=nlist)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+        # 빈 클러스터는 임의의 점으로 다시 시작
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+    return centroids
+
+
+class IVFIndex(FaceIndex):
+    """역파일(IVF) 방식의 근사 최근접 이웃 인덱스
+
+    인코딩을 nlist 개의 클러스터로 나누고, 검색 시에는 쿼리에 가까운 nprobe 개
+    클러스터의 행만 정확히 비교합니다. nprobe 를 키우면 재현율이, 줄이면 속도가
+    올라갑니다. 등록 인원이 min_train_size 보다 적으면 FaceIndex 와 같은 전수 비교를
+    사용하고, build()/add() 로 그 수에 도달하면 그 자리에서 학습합니다.
+    """
+
+    def __init__(self, dim=128, nlist=None, nprobe=8, min_train_size=20000,
+                 train_iterations=10, seed=0, capacity=64):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.train_iterations = train_iterations
+        self.seed = seed
+        self.centroids = None
+        self._assign = np.zeros(capacity, dtype=np.int32)
+        self._order = None      # 클러스터 순으로 정렬된 행 번호
+        self._offsets = None    # 클러스터별 _order 구간 시작 위치
+        super().__init__(dim=dim, capacity=capacity)
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    def set_nprobe(self, nprobe):
+        """재현율/지연 시간 조절 (탐색할 클러스터 수)"""
+        self.nprobe = max(1, int(nprobe))
+
+    def _reserve(self, size):
+        super()._reserve(size)
+        if len(self._assign) < self._matrix.shape[0]:
+            assign = np.zeros(self._matrix.shape[0], dtype=np.int32)
+            assign[:len(self._assign)] = self._assign
+            self._assign = assign
+
+    def _move_row(self, src, dst):
+        super()._move_row(src, dst)
+        self._assign[dst] = self._assign[src]
+        self._order = None
+
+    def train(self, encodings=None):
+        """k-means 로 클러스터 중심점을 학습하고 모든 행을 다시 배정
+
+        k-means 는 잠금 밖에서 실행하므로 학습하는 동안에도 search() 는 전수 비교로 응답합니다.
+        """
+        with self._lock:
+            if encodings is None:
+                encodings = self._matrix[:len(self._names)].copy()
+        encodings = np.asarray(encodings, dtype=np.float32).reshape(-1, self.dim)
+        if len(encodings) == 0:
+            return
+        nlist = self.nlist or int(np.clip(4 * np.sqrt(len(encodings)), 1, 4096))
+        centroids = kmeans(encodings, nlist, self.train_iterations,
+                           sample_size=nlist * 64, seed=self.seed)
+        with self._lock:
+            # 학습 중에 추가/삭제된 행까지 포함해 현재 행 전체를 배정
+            count = len(self._names)
+            self.centroids = centroids
+            self._assign[:count] = _nearest_centroid(self._matrix[:count], centroids)
+            self._order = None
+
+    def _train_if_needed(self):
+        """등록 인원이 min_train_size 에 처음 도달하면 학습 (build/add 를 호출한 스레드에서 실행)"""
+        with self._lock:
+            if self.is_trained or len(self._names) < self.min_train_size:
+                return
+        self.train()
+
+    def build(self, names, encodings):
+        with self._lock:
+            self.centroids = None
+            self._names = []
+            self._rows_by_name = {}
+            FaceIndex.add(self, names, encodings)
+        self._train_if_needed()
+
+    def add(self, names, encodings):
+        with self._lock:
+            start = len(self._names)
+            super().add(names, encodings)
+            if self.is_trained:
+                self._assign[start:len(self._names)] = _nearest_centroid(
+                    self._matrix[start:len(self._names)], self.centroids)
+                self._order = None
+        # 인식 스레드의 search() 가 아니라 갤러리를 갱신하는 쪽에서 학습
+        self._train_if_needed()
+
+    def remove(self, names):
+        with self._lock:
+            super().remove(names)
+            self._order = None
+
+    def _ensure_lists(self):
+        """클러스터별 행 목록(정렬 순서와 구간)을 필요할 때만 다시 계산"""
+        if self._order is None:
+            count = len(self._names)
+            self._order = np.argsort(self._assign[:count], kind='stable')
+            self._offsets = np.searchsorted(self._assign[:count][self._order],
+                                            np.arange(len(self.centroids) + 1))
+
+    def search(self, queries, k=1):
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            count = len(self._names)
+            # 학습은 build()/add() 에서만 하므로 검색이 k-means 를 기다리지 않음
+            if not self.is_trained or count == 0 or len(queries) == 0:
+                return super().search(queries, k)
+
+            self._ensure_lists()
+            nprobe = min(self.nprobe, len(self.centroids))
+            centroid_squared = _squared_distances(queries, self.centroids)
+            probes = np.argpartition(centroid_squared, nprobe - 1, axis=1)[:, :nprobe]
+
+            distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+            indices = np.full((len(queries), k), -1, dtype=np.int64)
+            for i, probe in enumerate(probes):
+                rows = np.concatenate([self._order[self._offsets[c]:self._offsets[c + 1]] for c in probe])
+                if len(rows) == 0:
+                    continue
+                squared = _squared_distances(queries[i:i + 1], self._matrix[rows], self._norms[rows])
+                top_distances, top_columns = top_k_smallest(squared, k)
+                found = top_columns.shape[1]
+                distances[i, :found] = top_distances[0]
+                indices[i, :found] = rows[top_columns[0]]
+
+        # 후보가 k개보다 적은 쿼리가 없으면 열 수를 맞춤
+        k_found = int(np.max(np.sum(indices >= 0, axis=1))) if len(indices) else 0
+        return distances[:, :k_found], indices[:, :k_found]
+
+    def match(self, queries, k=1):
+        with self._lock:
+            distances, indices = self.search(queries, k)
+            names = self._names
+            return [
+                [(names[index], float(distance))
+                 for index, distance in zip(row_indices, row_distances) if index >= 0]
+                for row_indices, row_distances in zip(indices, distances)
+            ]
+
+    def save(self, path):
+        """인덱스 전체(인코딩, 이름, 중심점, 설정)를 .npz 파일로 저장"""
+        with self._lock:
+            count = len(self._names)
+            config = {
+                "nlist": self.nlist, "nprobe": self.nprobe,
+                "min_train_size": self.min_train_size,
+                "train_iterations": self.train_iterations, "seed": self.seed,
+            }
+            np.savez(
+                path,
+                matrix=self._matrix[:count],
+                # 문자열 배열로 저장하여 불러올 때 pickle 을 허용하지 않아도 되도록 함
+                names=np.array(self._names, dtype=str),
+                centroids=self.centroids if self.is_trained else np.zeros((0, self.dim), dtype=np.float32),
+                assign=self._assign[:count],
+                config=np.array(json.dumps(config)),
+            )
+
+    @classmethod
+    def load(cls, path):
+        """save() 로 저장한 인덱스를 다시 학습하지 않고 불러옴"""
+        data = np.load(path, allow_pickle=False)
+        config = json.loads(str(data["config"]))
+        matrix = data["matrix"]
+        index = cls(dim=matrix.shape[1], **config)
+        FaceIndex.add(index, [str(name) for name in data["names"]], matrix)
+        if len(data["centroids"]):
+            index.centroids = data["centroids"].astype(np.float32)
+            index._assign[:len(matrix)] = data["assign"]
+        return index
+
+
+class HNSWIndex:
+    """hnswlib 기반 HNSW 인덱스 (hnswlib 가 설치된 경우에만 사용 가능)
+
+    FaceIndex 와 같은 build/add/remove/search/match 인터페이스를 제공합니다.
+    ef 를 키우면 재현율이, 줄이면 속도가 올라갑니다. 인식 스레드의 검색과 갤러리
+    갱신(add/remove)이 동시에 일어날 수 있으므로 hnswlib 호출과 이름 표는 잠금 안에서 다룹니다.
+    """
+
+    def __init__(self, dim=128, ef=64, m=16, ef_construction=200, capacity=1024):
+        if hnswlib is None:
+            raise ImportError("HNSW 인덱스를 사용하려면 hnswlib 패키지가 필요합니다.")
+        self.dim = dim
+        self.ef = ef
+        self.m = m
+        self.ef_construction = ef_construction
+        self._capacity = capacity
+        self._names = {}          # label -> 이름
+        self._labels_by_name = {}
+        self._next_label = 0
+        self._index = self._create(capacity)
+        self._lock = threading.RLock()
+
+    def _create(self, capacity):
+        index = hnswlib.Index(space='l2', dim=self.dim)
+        index.init_index(max_elements=capacity, ef_construction=self.ef_construction, M=self.m)
+        index.set_ef(self.ef)
+        return index
+
+    def __len__(self):
+        return len(self._names)
+
+    @property
+    def names(self):
+        with self._lock:
+            return [self._names[label] for label in sorted(self._names)]
+
+    def set_ef(self, ef):
+        """재현율/지연 시간 조절 (검색 후보 목록 크기)"""
+        with self._lock:
+            self.ef = max(1, int(ef))
+            self._index.set_ef(self.ef)
+
+    def build(self, names, encodings):
+        with self._lock:
+            self._names = {}
+            self._labels_by_name = {}
+            self._next_label = 0
+            self._capacity = max(len(names), 1024)
+            self._index = self._create(self._capacity)
+            self.add(names, encodings)
+
+    def add(self, names, encodings):
+        encodings = np.asarray(encodings, dtype=np.float32).reshape(-1, self.dim)
+        if len(names) != len(encodings):
+            raise ValueError("이름과 인코딩의 개수가 다릅니다.")
+        if len(names) == 0:
+            return
+        with self._lock:
+            needed = self._next_label + len(names)
+            if needed > self._capacity:
+                self._capacity = max(needed, self._capacity * 2)
+                self._index.resize_index(self._capacity)
+            labels = np.arange(self._next_label, needed)
+            self._index.add_items(encodings, labels)
+            for label, name in zip(labels, names):
+                self._names[int(label)] = name
+                self._labels_by_name.setdefault(name, set()).add(int(label))
+            self._next_label = needed
+
+    def remove(self, names):
+        with self._lock:
+            for name in names:
+                for label in self._labels_by_name.pop(name, ()):
+                    self._index.mark_deleted(label)
+                    del self._names[label]
+
+    def search(self, queries, k=1):
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            k = min(k, len(self._names))
+            if k == 0 or len(queries) == 0:
+                return (np.zeros((len(queries), 0), dtype=np.float32),
+                        np.zeros((len(queries), 0), dtype=np.int64))
+            labels, squared = self._index.knn_query(queries, k=k)
+            return np.sqrt(np.maximum(squared, 0.0)), labels.astype(np.int64)
+
+    def match(self, queries, k=1):
+        # 검색 결과의 label 이 이름으로 바뀌기 전에 지워지지 않도록 같은 잠금 안에서 처리
+        with self._lock:
+            distances, labels = self.search(queries, k)
+            return [
+                [(self._names[int(label)], float(distance)) for label, distance in zip(row_labels, row_distances)]
+                for row_labels, row_distances in zip(labels, distances)
+            ]
+
+    def save(self, path):
+        """그래프는 path, 이름과 설정은 path + '.json' 에 저장"""
+        with self._lock:
+            self._index.save_index(path)
+            with open(path + ".json", 'w', encoding='utf-8') as f:
+                json.dump({
+                    "dim": self.dim, "ef": self.ef, "m": self.m,
+                    "ef_construction": self.ef_construction, "capacity": self._capacity,
+                    "next_label": self._next_label,
+                    "names": {str(label): name for label, name in self._names.items()},
+                }, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        with open(path + ".json", 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        index = cls(dim=meta["dim"], ef=meta["ef"], m=meta["m"],
+                    ef_construction=meta["ef_construction"], capacity=1)
+        index._capacity = meta["capacity"]
+        index._index = hnswlib.Index(space='l2', dim=index.dim)
+        index._index.load_index(path, max_elements=index._capacity)
+        index._index.set_ef(index.ef)
+        index._next_label = meta["next_label"]
+        for label, name in meta["names"].items():
+            index._names[int(label)] = name
+            index._labels_by_name.setdefault(name, set()).add(int(label))
+        return index
+
+
+def create_face_index(backend="exact", **options):
+    """검색 백엔드 선택: "exact" (전수 비교), "ivf" (NumPy IVF), "hnsw" (hnswlib)"""
+    if backend == "exact":
+        return FaceIndex(**options)
+    if backend == "ivf":
+        return IVFIndex(**options)
+    if backend == "hnsw":
+        return HNSWIndex(**options)
+    raise ValueError(f"알 수 없는 인덱스 백엔드: {backend}")
+
+
+def measure_recall(index, reference, queries, k=1):
+    """정확한 전수 비교 인덱스(reference) 대비 재현율과 쿼리당 평균 지연 시간(ms) 측정"""
+    queries = np.asarray(queries, dtype=np.float32)
+    _, expected = reference.search(queries, k)
+
+    start = time.perf_counter()
+    matches = index.match(queries, k)
+    elapsed = time.perf_counter() - start
+
+    reference_names = reference.names
+    hits = 0
+    for expected_rows, candidates in zip(expected, matches):
+        expected_names = set(reference_names[row] for row in expected_rows)
+        hits += len(expected_names & set(name for name, _ in candidates))
+    total = max(1, expected.size)
+    return hits / total, elapsed * 1000.0 / max(1, len(queries))
@@ -1,41 +1,68 @@
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
-    QPushButton, QLabel, QTableWidget, QTableWidgetItem, QFileDialog, QLineEdit,
-    QListWidget, QListWidgetItem, QGridLayout, QScrollArea, QMessageBox, QCheckBox,
-    QTabWidget, QHeaderView, QInputDialog, QComboBox, QGraphicsOpacityEffect
+    QPushButton, QLabel, QTableView, QFileDialog, QLineEdit,
+    QListView, QMessageBox, QCheckBox,
+    QTabWidget, QHeaderView, QInputDialog, QComboBox, QGraphicsOpacityEffect,
+    QProgressDialog
 )
 from PyQt5.QtCore import Qt, QTimer, QPoint, QPropertyAnimation, QEasingCurve
-from PyQt5.QtGui import QPixmap, QImage, QIcon, QFont
+from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import QSize, QParallelAnimationGroup
 import sys
 import cv2
-import face_recognition
 import datetime
-import numpy as np
-import csv
+import time
 import os
 import shutil
-from PIL import Image
+
+from face_cache import FaceEncodingCache
+from identity_gallery import IdentityManifest
+from motion_gate import MotionGate
+from enrollment import BulkEnrollmentThread
+from thumbnail_cache import ThumbnailCache, make_thumbnails
+from face_gallery import FaceGalleryModel, FaceGalleryView
+from roster_model import RosterModel, AbsentFilterProxyModel
+from attendance_table import (
+    AttendanceTableModel, StatusFilterProxyModel, ThumbnailDelegate, PHOTO_COLUMN
+)
+from recognition_engine import RecognitionEngine
+from metrics import METRICS, start_exporters_from_env, stop_exporters
+from frame_source import LatestQueue
+from gallery_service import GalleryService
+from video_widget import VideoWidget
+from recognition_worker import CaptureThread, GalleryUpdateWorker, RecognitionWorker
 
 class AttendanceTab(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, face_cache=None, thumbnail_cache=None, parent=None):
         super().__init__(parent)
+        self.thumbnail_cache = thumbnail_cache or ThumbnailCache()
+        # 등록 명단과 출석 여부 (출석 처리 시 해당 행만 갱신)
+        self.roster_model = RosterModel(self)
         self.initUI()
         # 카메라 및 얼굴인식 관련 변수 초기화
         self.camera = None
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
         self.is_running = False
-        self.frame_count = 0  # frame_count 변수 추가
 
-        # 얼굴 인식 데이터 초기화
-        self.known_face_encodings = []
-        self.known_face_names = []
+        # 캡처 → 인식 → 렌더링 파이프라인 (각 큐는 최신 프레임만 유지)
+        self.preview_queue = LatestQueue(maxsize=1)
+        self.recognition_queue = LatestQueue(maxsize=1)
+        self.capture_thread = None
+        self.recognition_worker = None
+        self.face_tracks = []
+
+        # 얼굴 로딩/인식/출석 기록은 GUI 와 무관한 엔진이 담당
+        self.engine = RecognitionEngine("faces", face_cache=face_cache)
         self.load_known_faces()
+        # 이후 faces 디렉토리 변경은 워커에서 인코딩/인덱싱하고 명단만 GUI 스레드에서 갱신
+        self.gallery_worker = GalleryUpdateWorker(self.engine, parent=self)
+        self.gallery_worker.names_added.connect(self.roster_model.add_names)
+        self.gallery_worker.names_removed.connect(self.roster_model.remove_names)
+        self.gallery_worker.start()
 
-        # 출석한 학생 목록
-        self.present_students = set()
-        self.update_absent_list()
+        # 환경 변수로 계측이 켜져 있으면 오버레이도 표시
+        self.metrics_checkbox.setChecked(METRICS.enabled)
 
     def initUI(self):
         # 메인 레이아웃을 수평 레이아웃으로 변경
@@ -62,10 +89,27 @@ class AttendanceTab(QWidget):
         left_layout = QVBoxLayout()
 
         # 카메라 뷰 크기 확대
-        self.camera_label = QLabel()
-        self.camera_label.setMinimumSize(800, 600)  # 크기 증가
-        self.camera_label.setStyleSheet("border: 2px solid #ccc; border-radius: 8px;")
-        left_layout.addWidget(self.camera_label)
+        # (QPixmap 변환 없이 미리 할당한 버퍼에서 바로 그리는 위젯)
+        self.camera_view = VideoWidget()
+        self.camera_view.setMinimumSize(800, 600)  # 크기 증가
+        left_layout.addWidget(self.camera_view)
+
+        # 성능 지표 오버레이 (카메라 화면 왼쪽 위)
+        self.metrics_overlay = QLabel(self.camera_view)
+        self.metrics_overlay.setStyleSheet("""
+            QLabel {
+                color: #E0E0E0;
+                background-color: rgba(0, 0, 0, 0.6);
+                font-family: Consolas, monospace;
+                font-size: 11px;
+                padding: 6px;
+                border-radius: 4px;
+            }
+        """)
+        self.metrics_overlay.move(10, 10)
+        self.metrics_overlay.hide()
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.update_metrics_overlay)
 
         # 컨트롤 버튼 컨테이너
         control_layout = QHBoxLayout()
@@ -79,6 +123,11 @@ class AttendanceTab(QWidget):
         self.stop_btn.setEnabled(False)
         control_layout.addWidget(self.stop_btn)
 
+        # 실행 중에 계측과 오버레이를 켜고 끄는 체크박스
+        self.metrics_checkbox = QCheckBox('성능 지표')
+        self.metrics_checkbox.toggled.connect(self.toggle_metrics)
+        control_layout.addWidget(self.metrics_checkbox)
+
         left_layout.addLayout(control_layout)
 
         # 상태 표시
@@ -118,10 +167,19 @@ class AttendanceTab(QWidget):
         attendance_group = QGroupBox("출석 기록")
         attendance_layout = QVBoxLayout()
 
-        self.attendance_table = QTableWidget()
-        self.attendance_table.setColumnCount(4)
-        self.attendance_table.setHorizontalHeaderLabels(['이름', '시간', '상태', '사진'])
+        # 출석 기록 모델 → 상태 필터 프록시 → 테이블 뷰
+        self.attendance_model = AttendanceTableModel(self)
+        self.attendance_proxy = StatusFilterProxyModel(self)
+        self.attendance_proxy.setSourceModel(self.attendance_model)
+
+        self.attendance_table = QTableView()
+        self.attendance_table.setModel(self.attendance_proxy)
+        self.attendance_table.setItemDelegateForColumn(
+            PHOTO_COLUMN, ThumbnailDelegate(self.thumbnail_cache, 80, self.attendance_table))
         self.attendance_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.attendance_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.attendance_table.verticalHeader().setDefaultSectionSize(88)
+        self.attendance_table.setSortingEnabled(True)
         attendance_layout.addWidget(self.attendance_table)
 
         # 출석 기록 내보내기 버튼
@@ -148,13 +206,24 @@ class AttendanceTab(QWidget):
         """)
         absent_layout = QVBoxLayout()
 
-        self.absent_list = QListWidget()
+        self.absent_search = QLineEdit()
+        self.absent_search.setPlaceholderText("미출석자 검색...")
+        absent_layout.addWidget(self.absent_search)
+
+        # 명단 모델 위에 미출석자만 보여주는 프록시를 연결
+        self.absent_model = AbsentFilterProxyModel(self)
+        self.absent_model.setSourceModel(self.roster_model)
+        self.absent_search.textChanged.connect(self.absent_model.setFilterFixedString)
+
+        self.absent_list = QListView()
+        self.absent_list.setModel(self.absent_model)
+        self.absent_list.setUniformItemSizes(True)
         self.absent_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 border: none;
                 background: white;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 8px;
                 margin: 2px;
                 border-radius: 5px;
@@ -231,119 +300,71 @@ class AttendanceTab(QWidget):
         self.setLayout(layout)
 
     def load_known_faces(self):
-        self.known_face_encodings = []
-        self.known_face_names = []
+        # 인코딩 캐시에서 로드 (새로 추가/변경된 파일만 다시 인코딩)
+        self.roster_model.set_names(self.engine.load_known_faces())
+
+    def add_known_faces(self, paths):
+        """새로 등록된 얼굴 파일만 인코딩하여 인덱스와 명단에 추가 (워커에서 처리)"""
+        self.gallery_worker.add_faces(paths)
+
+    def remove_known_faces(self, paths):
+        """삭제된 얼굴 파일을 캐시, 인덱스, 명단에서 제거 (워커에서 처리)"""
+        self.gallery_worker.remove_faces(paths)
+
+    def on_faces_recognized(self, tracks):
+        """인식 워커의 결과를 UI에 반영"""
+        self.face_tracks = tracks
+        # 투표/디바운스/쿨다운을 통과한 도착 이벤트만 처리하고,
+        # 실제로 새로 출석 처리된 경우에만 알림 애니메이션 표시
+        for name in self.engine.arrivals(tracks, time.monotonic()):
+            if self.record_attendance(name):
+                self.show_notification(name)
 
-        faces_dir = "faces"
-        if not os.path.exists(faces_dir):
-            os.makedirs(faces_dir)
+    def update_frame(self):
+        frame = self.preview_queue.get_nowait()
+        if frame is None:
             return
 
-        for filename in os.listdir(faces_dir):
-            if filename.endswith((".jpg", ".jpeg", ".png")):
-                try:
-                    image_path = os.path.join(faces_dir, filename)
-                    # PIL로 이미지 읽기
-                    face_image = Image.open(image_path)
-                    # numpy 배열로 변환
-                    face_image_np = np.array(face_image)
-                    # face_recognition 라이브러리 사용
-                    face_encodings = face_recognition.face_encodings(face_image_np)
-
-                    if len(face_encodings) > 0:
-                        face_encoding = face_encodings[0]
-                        name = os.path.splitext(filename)[0]
-
-                        self.known_face_encodings.append(face_encoding)
-                        self.known_face_names.append(name)
-                    else:
-                        print(f"경고: {filename}에서 얼굴을 찾을 수 없습니다.")
-
-                except Exception as e:
-                    print(f"얼굴 로딩 중 오류 발생 ({filename}): {str(e)}")
-
-    def update_frame(self):
-        ret, frame = self.camera.read()
-        if ret:
-            # 프레임 처리 최적화
-            process_this_frame = self.frame_count % 3 == 0  # 3프레임마다 처리
-            self.frame_count += 1
-
-            if process_this_frame:
-                # 프레임 크기 조정 최적화
-                height, width = frame.shape[:2]
-                small_frame = cv2.resize(frame, (width//4, height//4))
-                rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-
-                try:
-                    # 얼굴 인식 처리
-                    face_locations = face_recognition.face_locations(rgb_small_frame, model="hog")  # CPU 최적화
-
-                    if face_locations:
-                        face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
-
-                        for (top, right, bottom, left), face_encoding in zip(face_locations, face_encodings):
-                            if len(self.known_face_encodings) > 0:
-                                # 벡터화된 연산으로 최적화
-                                face_distances = face_recognition.face_distance(self.known_face_encodings, face_encoding)
-                                best_match_index = np.argmin(face_distances)
-
-                                if face_distances[best_match_index] < 0.6:
-                                    name = self.known_face_names[best_match_index]
-                                    self.record_attendance(name)
-                                    self.show_notification(name)  # 알림 표시
-                                else:
-                                    name = "미등록"
-                            else:
-                                name = "미등록"
-
-                            # 좌표 변환 및 박스 그리기
-                            scale = 4
-                            cv2.rectangle(frame, 
-                                        (left*scale, top*scale), 
-                                        (right*scale, bottom*scale), 
-                                        (0, 255, 0), 3)  # 박스 두께 증가
-
-                            # 텍스트 표시 최적화
-                            y_position = bottom*scale + 30
-                            cv2.rectangle(frame,
-                                        (left*scale, y_position-30),
-                                        (right*scale, y_position+10),
-                                        (0, 255, 0), cv2.FILLED)
-
-                            # OpenCV putText로 변경 (성능 향상)
-                            cv2.putText(frame, name,
-                                      (left*scale + 10, y_position),
-                                      cv2.FONT_HERSHEY_DUPLEX, 0.8,  # 글자 크기 증가
-                                      (255, 255, 255), 2)  # 글자 두께 증가
-
-                except Exception as e:
-                    print(f"프레임 처리 중 오류 발생: {str(e)}")
-
-            # OpenCV 프레임을 Qt 이미지로 변환
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            scaled_image = qt_image.scaled(self.camera_label.size(), Qt.KeepAspectRatio)
-            self.camera_label.setPixmap(QPixmap.fromImage(scaled_image))
+        # 화면 크기로 한 번만 줄인 버퍼에 박스를 그림
+        # (캡처 스레드와 공유하는 원본 프레임은 수정하지 않음)
+        # 검출 사이의 프레임에서는 트랙의 이동 속도로 박스 위치를 보간
+        self.camera_view.set_frame(frame, self.face_tracks, time.monotonic())
+        METRICS.inc("frames_displayed")
+
+    def toggle_metrics(self, enabled):
+        """계측을 켜고 끄며 오버레이 표시 여부도 함께 전환"""
+        METRICS.set_enabled(enabled)
+        self.metrics_overlay.setVisible(enabled)
+        if enabled:
+            self.update_metrics_overlay()
+            self.metrics_timer.start(500)
+        else:
+            self.metrics_timer.stop()
+
+    def update_metrics_overlay(self):
+        """단계별 지연 시간, 프레임/드롭 수, 스케줄러 상태를 오버레이에 표시"""
+        scheduler = self.engine.scheduler.metrics()
+        METRICS.set_gauge("scheduler_interval", scheduler["interval"])
+        METRICS.set_gauge("scheduler_scale", scheduler["scale"])
+        METRICS.set_gauge("scheduler_idle", scheduler["idle"])
+        self.metrics_overlay.setText(METRICS.format_overlay())
+        self.metrics_overlay.adjustSize()
 
     def record_attendance(self, name):
         try:
             current_time = datetime.datetime.now()
             time_string = current_time.strftime('%H:%M:%S')
 
-            # 최근 출석 확인을 위한 시간 체크 (5분 이내 중복 방지)
-            if name in self.present_students:
-                return
+            # 오늘 이미 출석 처리된 이름은 무시
+            # (같은 사람의 반복 인식은 RecognitionEvents 의 쿨다운이 먼저 걸러냄)
+            if self.engine.is_present(name):
+                return False
 
-            # 얼굴 이미지 처리
-            faces_dir = "faces"
-            image_path = os.path.join(faces_dir, f"{name}.jpg")
-            if os.path.exists(image_path):
-                # 최근 인식된 얼굴 표시 - 원본 이미지 사용
-                pixmap = QPixmap(image_path)
-                pixmap = pixmap.scaled(250, 250, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            # 얼굴 이미지 처리 (사진이 여러 장이면 대표 사진 사용)
+            image_path = self.engine.identity_image(name)
+            if image_path:
+                # 최근 인식된 얼굴 표시 - 미리 만든 썸네일 사용
+                pixmap = self.thumbnail_cache.pixmap(image_path, 250)
                 self.recent_face_label.setPixmap(pixmap)
 
                 # 상태 메시지 업데이트
@@ -359,65 +380,27 @@ class AttendanceTab(QWidget):
                 """)
                 self.status_label.setText(f'✓ {name}님 출석이 확인되었습니다.')
 
-                # 테이블에 기록 추가 - 원본 이미지 사용
-                table_pixmap = QPixmap(image_path)
-                table_pixmap = table_pixmap.scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                image_label = QLabel()
-                image_label.setPixmap(table_pixmap)
-                image_label.setAlignment(Qt.AlignCenter)
-                image_label.setStyleSheet("""
-                    QLabel {
-                        border-radius: 40px;
-                        padding: 2px;
-                        background-color: white;
-                    }
-                """)
-
-                row_position = self.attendance_table.rowCount()
-                self.attendance_table.insertRow(row_position)
-
-                # 테이블 아이템 설정
-                name_item = QTableWidgetItem(name)
-                time_item = QTableWidgetItem(time_string)
-                status_item = QTableWidgetItem("출석")
+                # 테이블 모델에 기록 추가 (사진은 델리게이트가 썸네일 캐시에서 그림)
+                self.attendance_model.append_record(name, time_string, "출석", image_path)
 
-                # 아이템 정렬 및 스타일 설정
-                for item in [name_item, time_item, status_item]:
-                    item.setTextAlignment(Qt.AlignCenter)
-                    item.setFont(QFont("Arial", 12))
+                # 출석 기록 (기록기 스레드에서 배치로 저장)
+                self.engine.record_attendance(name, current_time)
 
-                self.attendance_table.setItem(row_position, 0, name_item)
-                self.attendance_table.setItem(row_position, 1, time_item)
-                self.attendance_table.setItem(row_position, 2, status_item)
-                self.attendance_table.setCellWidget(row_position, 3, image_label)
-
-                # CSV 기록
-                self.save_attendance_record(name, time_string)
-
-                # 출석 상태 업데이트
-                self.present_students.add(name)
-                self.update_absent_list()
+                # 출석 상태 업데이트 (미출석자 목록은 프록시 모델이 해당 행만 숨김)
+                self.roster_model.mark_present(name)
+                return True
 
         except Exception as e:
             print(f"출석 기록 중 오류 발생: {str(e)}")
             self.status_label.setText(f'오류 발생: {str(e)}')
             self.status_label.setStyleSheet("color: #F44336; padding: 10px; font-size: 16px;")
+        return False
 
-    def save_attendance_record(self, name, time_string):
-        """출석 기록을 CSV 파일에 저장하는 별도의 메서드"""
-        date_string = datetime.datetime.now().strftime('%Y-%m-%d')
-        filename = f'attendance_{date_string}.csv'
-
-        # 파일이 없으면 헤더 추가
-        if not os.path.exists(filename):
-            with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                writer.writerow(['이름', '시간', '상태'])
-
-        # 출석 기록 추가
-        with open(filename, 'a', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f)
-            writer.writerow([name, time_string, "출석"])
+    def shutdown(self):
+        """카메라를 멈추고 남은 출석 기록을 모두 저장"""
+        self.stop_attendance()
+        self.gallery_worker.stop()
+        self.engine.close()
 
     def export_attendance(self):
         date_string = datetime.datetime.now().strftime('%Y-%m-%d')
@@ -426,15 +409,8 @@ class AttendanceTab(QWidget):
                                                  "CSV files (*.csv)")
         if file_name:
             try:
-                with open(file_name, 'w', newline='', encoding='utf-8-sig') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['이름', '시간', '상태'])
-
-                    for row in range(self.attendance_table.rowCount()):
-                        name = self.attendance_table.item(row, 0).text()
-                        time = self.attendance_table.item(row, 1).text()
-                        status = self.attendance_table.item(row, 2).text()
-                        writer.writerow([name, time, status])
+                # 대기 중인 기록을 반영한 뒤 저장소에서 오늘 기록을 내보냄
+                self.engine.export_csv(file_name, date_string)
 
                 QMessageBox.information(self, '내보내기 완료', f'출석 기록이 {file_name}에 저장되었습니다.')
             except Exception as e:
@@ -456,7 +432,20 @@ class AttendanceTab(QWidget):
                 QMessageBox.warning(self, '오류', '카메라를 열 수 없니다.')
                 return
 
-            self.timer.start(30)  # 30ms 간격으로 프레임 업데이트
+            # 캡처 스레드와 인식 워커 시작
+            self.preview_queue.clear()
+            self.recognition_queue.clear()
+            self.face_tracks = []
+            scheduler = self.engine.reset_session()
+            self.recognition_worker = RecognitionWorker(self.recognition_queue, self.engine.recognize_faces)
+            self.recognition_worker.faces_recognized.connect(self.on_faces_recognized)
+            self.capture_thread = CaptureThread(self.camera, self.preview_queue, self.recognition_queue,
+                                                scheduler, MotionGate())
+            self.capture_thread.capture_failed.connect(self.stop_attendance)
+            self.recognition_worker.start()
+            self.capture_thread.start()
+
+            self.timer.start(30)  # 30ms 간격으로 미리보기 갱신
             self.is_running = True
             self.status_label.setText('출석 확인 중...')
             self.status_label.setStyleSheet("color: #4CAF50; padding: 10px; font-size: 16px;")
@@ -466,38 +455,22 @@ class AttendanceTab(QWidget):
     def stop_attendance(self):
         if self.is_running:
             self.timer.stop()
+            self.capture_thread.stop()
+            self.recognition_worker.stop()
+            self.capture_thread = None
+            self.recognition_worker = None
+            self.face_tracks = []
             self.camera.release()
             self.is_running = False
-            self.camera_label.clear()
+            self.camera_view.clear()
             self.status_label.setText('시스템 중지됨')
             self.status_label.setStyleSheet("color: #F44336; padding: 10px; font-size: 16px;")
             self.start_btn.setEnabled(True)
             self.stop_btn.setEnabled(False)
 
     def filter_attendance(self, filter_status):
-        """출석 상태별 필터링"""
-        for row in range(self.attendance_table.rowCount()):
-            status = self.attendance_table.item(row, 2).text()
-            should_show = (
-                filter_status == "전체" or
-                (filter_status == "출석" and status == "출석") or
-                (filter_status == "미출석" and status == "미출석")
-            )
-            self.attendance_table.setRowHidden(row, not should_show)
-
-    def update_absent_list(self):
-        """미출석자 목록 업데이트"""
-        self.absent_list.clear()
-        present_names = self.present_students
-
-        faces_dir = "faces"
-        if os.path.exists(faces_dir):
-            for filename in os.listdir(faces_dir):
-                if filename.endswith((".jpg", ".jpeg", ".png")):
-                    name = os.path.splitext(filename)[0]
-                    if name not in present_names:
-                        item = QListWidgetItem(f"⚠ {name}")
-                        self.absent_list.addItem(item)
+        """출석 상태별 필터링 (프록시 모델의 필터만 바꿈)"""
+        self.attendance_proxy.set_status(filter_status)
 
     def update_chart(self):
         """시간대별 출석 현황 그래프 업데이트"""
@@ -555,12 +528,18 @@ class AttendanceTab(QWidget):
 
 
 class ManagementTab(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, face_cache=None, thumbnail_cache=None, gallery_service=None, parent=None):
         super().__init__(parent)
-        self.current_page = 0
-        self.items_per_page = 20  # 페이지당 표시할 얼굴 수
+        self.face_cache = face_cache or FaceEncodingCache("faces")
+        self.thumbnail_cache = thumbnail_cache or ThumbnailCache()
+        # faces 디렉토리 변경은 갤러리 서비스가 감시하여 바뀐 파일만 알려 줌
+        self.gallery_service = gallery_service or GalleryService("faces", self.thumbnail_cache, parent=self)
+        self.bulk_thread = None
         self.initUI()
         self.load_known_faces()
+        self.gallery_service.faces_added.connect(self.on_faces_added)
+        self.gallery_service.faces_removed.connect(self.face_model.remove_faces)
+        self.gallery_service.faces_modified.connect(self.face_model.refresh_faces)
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -569,37 +548,22 @@ class ManagementTab(QWidget):
         search_layout = QHBoxLayout()
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("이름으로 검색...")
-        self.search_bar.textChanged.connect(self.update_face_grid)
         search_layout.addWidget(QLabel("검색:"))
         search_layout.addWidget(self.search_bar)
         layout.addLayout(search_layout)
 
-        # 얼굴 목록을 스크롤 가능한 그리드로 변경
+        # 화면에 보이는 항목만 그리는 얼굴 목록 (썸네일은 백그라운드에서 로드)
         face_group = QGroupBox("등록된 얼굴 목록")
         face_layout = QVBoxLayout()
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.grid_widget = QWidget()
-        self.grid_layout = QGridLayout(self.grid_widget)
-        self.grid_layout.setSpacing(10)
-        self.scroll_area.setWidget(self.grid_widget)
+        self.face_model = FaceGalleryModel(self.thumbnail_cache)
+        self.face_view = FaceGalleryView(self.face_model)
+        self.search_bar.textChanged.connect(self.face_view.set_search_text)
 
-        face_layout.addWidget(self.scroll_area)
+        face_layout.addWidget(self.face_view)
         face_group.setLayout(face_layout)
         layout.addWidget(face_group)
 
-        # 페이지 네게이션 추가
-        pagination_layout = QHBoxLayout()
-        self.prev_page_btn = QPushButton("이전 페이지")
-        self.prev_page_btn.clicked.connect(self.prev_page)
-        self.next_page_btn = QPushButton("다음 페이지")
-        self.next_page_btn.clicked.connect(self.next_page)
-        pagination_layout.addWidget(self.prev_page_btn)
-        pagination_layout.addStretch()
-        pagination_layout.addWidget(self.next_page_btn)
-        layout.addLayout(pagination_layout)
-
         # 얼굴 등록 및 삭제 버튼
         button_layout = QHBoxLayout()
         self.register_btn = QPushButton('얼굴 등록')
@@ -617,98 +581,11 @@ class ManagementTab(QWidget):
         self.setLayout(layout)
 
     def load_known_faces(self):
-        self.known_faces = []
-        faces_dir = "faces"
-        if not os.path.exists(faces_dir):
-            os.makedirs(faces_dir)
-            return
-
-        for filename in os.listdir(faces_dir):
-            if filename.endswith((".jpg", ".jpeg", ".png")):
-                name = os.path.splitext(filename)[0]
-                image_path = os.path.join(faces_dir, filename)
-                self.known_faces.append((name, image_path))
-
-        self.update_face_grid()
-
-    def update_face_grid(self):
-        # 그리드 초기화
-        for i in reversed(range(self.grid_layout.count())):
-            widget = self.grid_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.setParent(None)
-
-        # 검색 필터 적용
-        search_text = self.search_bar.text().lower()
-        filtered_faces = [
-            face for face in self.known_faces 
-            if search_text in face[0].lower()
-        ]
-
-        # 페이지네이션 적용
-        total_pages = (len(filtered_faces) - 1) // self.items_per_page + 1
-        self.current_page = max(0, min(self.current_page, total_pages - 1))
-
-        start_index = self.current_page * self.items_per_page
-        end_index = start_index + self.items_per_page
-        page_faces = filtered_faces[start_index:end_index]
-
-        # 그리드에 얼굴 추가
-        columns = 4
-        for idx, (name, image_path) in enumerate(page_faces):
-            row = idx // columns
-            col = idx % columns
-            face_widget = self.create_face_widget(name, image_path)
-            self.grid_layout.addWidget(face_widget, row, col)
-
-    def create_face_widget(self, name, image_path):
-        widget = QWidget()
-        layout = QVBoxLayout()
-        layout.setAlignment(Qt.AlignCenter)
+        """처음 한 번 전체 목록을 채움 (이후에는 갤러리 서비스의 변경분만 반영)"""
+        self.face_model.set_faces(self.gallery_service.faces())
 
-        # 얼굴 이미지 처리 수정
-        image = Image.open(image_path)
-        image = image.convert('RGB')  # RGB 모드로 변환
-        image = image.resize((100, 100), Image.Resampling.LANCZOS)
-        
-        # PIL 이미지를 QPixmap으로 변환
-        img_data = image.tobytes('raw', 'RGB')
-        qimg = QImage(img_data, image.width, image.height, image.width * 3, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qimg)
-        
-        image_label = QLabel()
-        image_label.setPixmap(pixmap)
-        image_label.setAlignment(Qt.AlignCenter)
-        image_label.setFixedSize(110, 110)
-        image_label.setStyleSheet("""
-            QLabel {
-                border: 2px solid #ccc;
-                border-radius: 8px;
-                padding: 3px;
-                background-color: white;
-            }
-        """)
-        layout.addWidget(image_label)
-
-        # 이름 레이블
-        name_label = QLabel(name)
-        name_label.setAlignment(Qt.AlignCenter)
-        name_label.setStyleSheet("""
-            QLabel {
-                color: #333;
-                font-size: 12px;
-                margin-top: 5px;
-            }
-        """)
-        layout.addWidget(name_label)
-
-        # 체크박스 추가
-        checkbox = QCheckBox()
-        layout.addWidget(checkbox, alignment=Qt.AlignCenter)
-
-        widget.setLayout(layout)
-        widget.setProperty('name', name)
-        return widget
+    def on_faces_added(self, paths):
+        self.face_model.add_faces([(os.path.splitext(os.path.basename(path))[0], path) for path in paths])
 
     def register_face(self):
         try:
@@ -732,12 +609,15 @@ class ManagementTab(QWidget):
                         new_path = os.path.join(faces_dir, f"{name}_{counter}.jpg")
                         counter += 1
 
+                    # 추가 사진(name_1.jpg ...)도 같은 사람으로 묶이도록 복사 전에 기록
+                    IdentityManifest(faces_dir).assign(new_path, name)
                     # 이미지 복사 및 저장
                     shutil.copyfile(file_name, new_path)
+                    # 등록 시 썸네일을 미리 생성
+                    make_thumbnails(new_path)
 
-                    self.known_faces.append((name, new_path))
-                    self.update_face_grid()
-                    self.load_known_faces()
+                    # 감시 알림을 기다리지 않고 바로 반영 (목록, 인덱스, 명단)
+                    self.gallery_service.rescan()
 
                     QMessageBox.information(
                         self, '등록 완료', f'{name}의 얼굴이 등록되었습니다.'
@@ -749,14 +629,7 @@ class ManagementTab(QWidget):
             )
 
     def delete_faces(self):
-        selected_faces = []
-        for i in range(self.grid_layout.count()):
-            widget = self.grid_layout.itemAt(i).widget()
-            if widget:
-                checkbox = widget.findChild(QCheckBox)
-                if checkbox and checkbox.isChecked():
-                    name = widget.property('name')
-                    selected_faces.append(name)
+        selected_faces = self.face_model.checked_faces()
 
         if not selected_faces:
             QMessageBox.information(self, '삭제할 얼굴 없음', '삭제할 얼굴을 선택하세요.')
@@ -764,40 +637,18 @@ class ManagementTab(QWidget):
 
         reply = QMessageBox.question(
             self, '확인', 
-            f'선택한 {len(selected_faces)}명의 얼굴을 ��제하시겠습니까?',
+            f'선택한 {len(selected_faces)}명의 얼굴을 삭제하시겠습니까?',
             QMessageBox.Yes | QMessageBox.No
         )
         
         if reply == QMessageBox.Yes:
-            faces_dir = "faces"
-            for name in selected_faces:
-                # 파일 경로 찾기
-                for face in self.known_faces:
-                    if face[0] == name:
-                        file_path = face[1]
-                        if os.path.exists(file_path):
-                            os.remove(file_path)
-                        self.known_faces.remove(face)
-                        break
-            self.update_face_grid()
-            self.load_known_faces()
+            for name, file_path in selected_faces:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+            # 썸네일 무효화와 목록/인덱스/명단 갱신은 갤러리 서비스가 처리
+            self.gallery_service.rescan()
             QMessageBox.information(self, '삭제 완료', '선택한 얼굴이 삭제되었습니다.')
 
-    def prev_page(self):
-        if self.current_page > 0:
-            self.current_page -= 1
-            self.update_face_grid()
-
-    def next_page(self):
-        total_faces = len([
-            face for face in self.known_faces 
-            if self.search_bar.text().lower() in face[0].lower()
-        ])
-        total_pages = (total_faces - 1) // self.items_per_page + 1
-        if self.current_page < total_pages - 1:
-            self.current_page += 1
-            self.update_face_grid()
-
     def bulk_register_faces(self):
         try:
             # 폴더 선택 다이얼로그
@@ -806,79 +657,22 @@ class ManagementTab(QWidget):
             )
             
             if folder_path:
-                # 결과 저장을 위한 변수들
-                success_count = 0
-                skip_count = 0
-                fail_count = 0
-                error_files = []
-                
-                # faces 디렉토리 확인
-                faces_dir = "faces"
-                if not os.path.exists(faces_dir):
-                    os.makedirs(faces_dir)
-                
-                # 진행 상황을 보여줄 메시지 박스
-                progress = QMessageBox()
-                progress.setWindowTitle("등록 진행 중")
-                progress.setText("얼굴 등록을 진행하고 있습니다...")
-                progress.show()
-                
-                # 지원하는 이미지 확장자
-                valid_extensions = ('.jpg', '.jpeg', '.png')
-                
-                # 폴더 내의 모든 이미지 파일 처리
-                for filename in os.listdir(folder_path):
-                    if filename.lower().endswith(valid_extensions):
-                        try:
-                            # 파일 경로
-                            file_path = os.path.join(folder_path, filename)
-                            
-                            # 이름 추출 (확장자 제외)
-                            name = os.path.splitext(filename)[0]
-                            
-                            # 이미 존재하는 얼굴인지 확인
-                            existing_path = os.path.join(faces_dir, f"{name}.jpg")
-                            if os.path.exists(existing_path):
-                                skip_count += 1
-                                continue
-                            
-                            # 얼굴 인식 확인
-                            image = face_recognition.load_image_file(file_path)
-                            face_locations = face_recognition.face_locations(image)
-                            
-                            if len(face_locations) > 0:
-                                # 이미지를 faces 폴더에 복사
-                                new_path = os.path.join(faces_dir, f"{name}.jpg")
-                                
-                                # PIL을 사용하여 이미지 처리 및 저장
-                                img = Image.open(file_path)
-                                img = img.convert('RGB')
-                                img.save(new_path, 'JPEG', quality=95)
-                                
-                                self.known_faces.append((name, new_path))
-                                success_count += 1
-                            else:
-                                fail_count += 1
-                                error_files.append(f"{filename} (얼굴 감지 실패)")
-                                
-                        except Exception as e:
-                            fail_count += 1
-                            error_files.append(f"{filename} (오류: {str(e)})")
-                
-                # 진행 상황 메시지 박스 닫기
-                progress.close()
-                
-                # 결과 업데이트
-                self.update_face_grid()
-                self.load_known_faces()
-                
-                # 결과 메시지 생성
-                result_message = f"등록 완료:\n\n성공: {success_count}개\n건너뜀: {skip_count}개\n실패: {fail_count}개"
-                if error_files:
-                    result_message += "\n\n실패한 파일들:\n" + "\n".join(error_files)
-                
-                # 결과 표시
-                QMessageBox.information(self, '대량 등록 완료', result_message)
+                # 진행 상황과 취소 버튼을 보여줄 다이얼로그
+                self.bulk_progress = QProgressDialog("얼굴 등록을 진행하고 있습니다...", "취소", 0, 0, self)
+                self.bulk_progress.setWindowTitle("등록 진행 중")
+                self.bulk_progress.setWindowModality(Qt.WindowModal)
+                self.bulk_progress.setMinimumDuration(0)
+
+                # 이미지 디코딩/검출/인코딩은 작업 프로세스에서 병렬 처리
+                self.bulk_thread = BulkEnrollmentThread(folder_path, self.face_cache)
+                self.bulk_thread.progress.connect(self.on_bulk_progress)
+                self.bulk_thread.completed.connect(self.on_bulk_completed)
+                self.bulk_progress.canceled.connect(self.bulk_thread.cancel)
+                self.bulk_register_btn.setEnabled(False)
+                # 등록이 끝날 때까지 파일 하나하나의 변경 알림은 미룸
+                self.gallery_service.pause()
+                self.bulk_thread.start()
+                self.bulk_progress.show()
                 
         except Exception as e:
             QMessageBox.warning(
@@ -886,6 +680,31 @@ class ManagementTab(QWidget):
                 f'대량 등록 중 오류가 발생했습니다: {str(e)}'
             )
 
+    def on_bulk_progress(self, done, total, filename):
+        """대량 등록 진행 상황 표시"""
+        self.bulk_progress.setMaximum(total)
+        self.bulk_progress.setValue(done)
+        self.bulk_progress.setLabelText(f"{filename} 처리 완료 ({done}/{total})")
+
+    def on_bulk_completed(self, summary):
+        """대량 등록 결과 반영"""
+        self.bulk_progress.close()
+        self.bulk_register_btn.setEnabled(True)
+        self.bulk_thread.wait()
+        self.bulk_thread = None
+
+        # 결과 업데이트 (인코딩은 이미 캐시에 기록되어 있으므로 다시 인코딩하지 않음)
+        self.gallery_service.resume()
+        
+        # 결과 메시지 생성
+        title = '대량 등록 취소됨' if summary["cancelled"] else '대량 등록 완료'
+        result_message = f"등록 완료:\n\n성공: {summary['success']}개\n건너뜀: {summary['skip']}개\n실패: {summary['fail']}개"
+        if summary["errors"]:
+            result_message += "\n\n실패한 파일들:\n" + "\n".join(summary["errors"])
+        
+        # 결과 표시
+        QMessageBox.information(self, title, result_message)
+
 
 class AttendanceSystem(QMainWindow):
     def __init__(self):
@@ -922,12 +741,12 @@ class AttendanceSystem(QMainWindow):
             QLabel {
                 font-size: 14px;
             }
-            QTableWidget {
+            QTableView {
                 border: 1px solid #ddd;
                 border-radius: 8px;
                 background-color: white;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
             }
         """)
@@ -941,16 +760,39 @@ class AttendanceSystem(QMainWindow):
         tabs = QTabWidget()
         tabs.setTabPosition(QTabWidget.West)
 
+        # 환경 변수로 요청된 지표 내보내기 시작 (Prometheus 엔드포인트, JSON 로그)
+        self.metrics_exporters = start_exporters_from_env()
+
+        # 두 탭이 같은 인코딩 캐시와 썸네일 캐시를 공유
+        self.face_cache = FaceEncodingCache("faces")
+        self.thumbnail_cache = ThumbnailCache()
+        self.gallery_service = GalleryService("faces", self.thumbnail_cache, parent=self)
+
         # 출결 탭
-        self.attendance_tab = AttendanceTab()
+        self.attendance_tab = AttendanceTab(self.face_cache, self.thumbnail_cache)
         tabs.addTab(self.attendance_tab, QIcon(), "출결")
 
         # 관리 탭
-        self.management_tab = ManagementTab()
+        self.management_tab = ManagementTab(self.face_cache, self.thumbnail_cache, self.gallery_service)
         tabs.addTab(self.management_tab, QIcon(), "관리")
 
+        # faces 디렉토리가 바뀌면 (앱 안팎 모두) 바뀐 파일만 인식 인덱스와 명단에 반영
+        self.gallery_service.faces_added.connect(self.attendance_tab.add_known_faces)
+        self.gallery_service.faces_removed.connect(self.attendance_tab.remove_known_faces)
+        self.gallery_service.faces_modified.connect(self.attendance_tab.add_known_faces)
+
         main_layout.addWidget(tabs)
 
+    def closeEvent(self, event):
+        # 종료 시 카메라 및 작업 스레드 정리
+        self.attendance_tab.shutdown()
+        if self.management_tab.bulk_thread is not None:
+            self.management_tab.bulk_thread.cancel()
+            self.management_tab.bulk_thread.wait()
+        self.management_tab.face_model.shutdown()
+        stop_exporters(self.metrics_exporters)
+        super().closeEvent(event)
+
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
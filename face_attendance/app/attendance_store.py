@@ -0,0 +1,152 @@
+import csv
+import glob
+import os
+import re
+import sqlite3
+import threading
+
+
+CSV_HEADER = ['이름', '시간', '상태']
+SYNCHRONOUS_BY_DURABILITY = {"none": "OFF", "batch": "FULL", "event": "FULL"}
+
+
+def daily_csv_path(date_string, directory="."):
+    return os.path.join(directory, f'attendance_{date_string}.csv')
+
+
+class AttendanceStore:
+    """SQLite(WAL 모드) 기반 출석 기록 저장소
+
+    (date, name) 인덱스로 날짜 범위/집계 조회를 빠르게 처리하며,
+    일별 CSV 파일과 내보내기 파일은 이 저장소에서 만들어집니다.
+    """
+
+    def __init__(self, path="attendance.db", durability="batch"):
+        self.path = path
+        is_new = not os.path.exists(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={SYNCHRONOUS_BY_DURABILITY.get(durability, 'FULL')}")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS attendance (
+                id INTEGER PRIMARY KEY,
+                date TEXT NOT NULL,
+                time TEXT NOT NULL,
+                name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                UNIQUE (date, name, time)
+            );
+            CREATE INDEX IF NOT EXISTS idx_attendance_date_name ON attendance (date, name);
+            CREATE INDEX IF NOT EXISTS idx_attendance_name_date ON attendance (name, date);
+        """)
+        self._conn.commit()
+
+        # 처음 만들 때는 기존 일별 CSV 파일을 가져옴
+        if is_new:
+            self.import_daily_csvs(os.path.dirname(os.path.abspath(path)))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def insert_many(self, events):
+        """[{"date", "time", "name", "status"}, ...] 을 한 트랜잭션으로 기록 (중복은 무시)"""
+        rows = [(e["date"], e["time"], e["name"], e["status"]) for e in events]
+        with self._lock:
+            before = self._conn.total_changes
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO attendance (date, time, name, status) VALUES (?, ?, ?, ?)",
+                    rows)
+            return self._conn.total_changes - before
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def records(self, start_date, end_date=None, names=None, status=None):
+        """기간 내 출석 기록 [(date, time, name, status), ...] (날짜, 시간 순)"""
+        end_date = end_date or start_date
+        sql = "SELECT date, time, name, status FROM attendance WHERE date BETWEEN ? AND ?"
+        params = [start_date, end_date]
+        if names:
+            names = list(names)
+            sql += f" AND name IN ({','.join('?' * len(names))})"
+            params += names
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY date, time, id"
+        return self._query(sql, params)
+
+    def present_names(self, date_string):
+        """해당 날짜에 출석한 이름 집합"""
+        return set(row[0] for row in self._query(
+            "SELECT DISTINCT name FROM attendance WHERE date = ? AND status = '출석'", (date_string,)))
+
+    def attendance_counts(self, start_date, end_date):
+        """기간 내 이름별 출석 일수 [(name, days), ...]"""
+        return self._query(
+            "SELECT name, COUNT(DISTINCT date) FROM attendance "
+            "WHERE date BETWEEN ? AND ? AND status = '출석' GROUP BY name ORDER BY name",
+            (start_date, end_date))
+
+    def daily_counts(self, start_date, end_date):
+        """기간 내 날짜별 출석 인원 [(date, count), ...]"""
+        return self._query(
+            "SELECT date, COUNT(DISTINCT name) FROM attendance "
+            "WHERE date BETWEEN ? AND ? AND status = '출석' GROUP BY date ORDER BY date",
+            (start_date, end_date))
+
+    def present_on_all_days(self, start_date, end_date):
+        """기록이 있는 모든 날짜에 출석한 이름 목록"""
+        return [row[0] for row in self._query(
+            "SELECT name FROM attendance WHERE date BETWEEN ? AND ? AND status = '출석' "
+            "GROUP BY name HAVING COUNT(DISTINCT date) = ("
+            "  SELECT COUNT(DISTINCT date) FROM attendance WHERE date BETWEEN ? AND ?"
+            ") ORDER BY name",
+            (start_date, end_date, start_date, end_date))]
+
+    def hourly_counts(self, date_string):
+        """해당 날짜의 시간대별 출석 수 [(hour, count), ...]"""
+        return self._query(
+            "SELECT substr(time, 1, 2) AS hour, COUNT(*) FROM attendance "
+            "WHERE date = ? AND status = '출석' GROUP BY hour ORDER BY hour",
+            (date_string,))
+
+    def export_csv(self, filename, start_date, end_date=None):
+        """기간 내 기록을 CSV 로 저장 (하루면 이름/시간/상태, 여러 날이면 날짜 열 추가)"""
+        rows = self.records(start_date, end_date)
+        multi_day = end_date is not None and end_date != start_date
+        tmp = filename + ".tmp"
+        with open(tmp, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            if multi_day:
+                writer.writerow(['날짜'] + CSV_HEADER)
+                for date_string, time_string, name, status in rows:
+                    writer.writerow([date_string, name, time_string, status])
+            else:
+                writer.writerow(CSV_HEADER)
+                for _, time_string, name, status in rows:
+                    writer.writerow([name, time_string, status])
+        os.replace(tmp, filename)
+        return len(rows)
+
+    def import_daily_csvs(self, directory="."):
+        """기존 attendance_YYYY-MM-DD.csv 파일들을 저장소로 가져옴"""
+        imported = 0
+        for filename in sorted(glob.glob(os.path.join(directory, 'attendance_*.csv'))):
+            match = re.search(r'attendance_(\d{4}-\d{2}-\d{2})\.csv$', filename)
+            if not match:
+                continue
+            try:
+                with open(filename, 'r', newline='', encoding='utf-8-sig') as f:
+                    reader = csv.reader(f)
+                    next(reader, None)  # 헤더
+                    events = [{"date": match.group(1), "name": row[0], "time": row[1], "status": row[2]}
+                              for row in reader if len(row) >= 3]
+                imported += self.insert_many(events)
+            except Exception as e:
+                print(f"출석 기록 가져오기 실패 ({filename}): {str(e)}")
+        return imported
@@ -0,0 +1,111 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QSize, QSortFilterProxyModel
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QStyledItemDelegate
+
+
+ATTENDANCE_COLUMNS = ['이름', '시간', '상태', '사진']
+NAME_COLUMN, TIME_COLUMN, STATUS_COLUMN, PHOTO_COLUMN = range(4)
+ImagePathRole = Qt.UserRole + 1
+
+
+class AttendanceTableModel(QAbstractTableModel):
+    """오늘 세션의 출석 기록을 열 단위 리스트로 보관하는 테이블 모델
+
+    셀마다 위젯을 만들지 않고, 사진 열은 ThumbnailDelegate 가 그립니다.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names = []
+        self._times = []
+        self._statuses = []
+        self._image_paths = []
+        self._font = QFont("Arial", 12)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(ATTENDANCE_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return ATTENDANCE_COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            if column == NAME_COLUMN:
+                return self._names[row]
+            if column == TIME_COLUMN:
+                return self._times[row]
+            if column == STATUS_COLUMN:
+                return self._statuses[row]
+            return None
+        if role == ImagePathRole:
+            return self._image_paths[row]
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.FontRole:
+            return self._font
+        return None
+
+    def append_record(self, name, time_string, status, image_path):
+        row = len(self._names)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._names.append(name)
+        self._times.append(time_string)
+        self._statuses.append(status)
+        self._image_paths.append(image_path)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._names, self._times, self._statuses, self._image_paths = [], [], [], []
+        self.endResetModel()
+
+
+class StatusFilterProxyModel(QSortFilterProxyModel):
+    """상태 열로 필터링하는 프록시 ("전체"면 모든 행 표시)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterKeyColumn(STATUS_COLUMN)
+        self.setDynamicSortFilter(True)
+
+    def set_status(self, status):
+        if status == "전체":
+            self.setFilterRegExp("")
+        else:
+            self.setFilterRegExp(f"^{status}$")
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """ThumbnailCache 의 썸네일을 셀에 직접 그리는 델리게이트"""
+
+    def __init__(self, thumbnail_cache, size=80, parent=None):
+        super().__init__(parent)
+        self.thumbnail_cache = thumbnail_cache
+        self.size = size
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        image_path = index.data(ImagePathRole)
+        if not image_path:
+            return
+        try:
+            pixmap = self.thumbnail_cache.pixmap(image_path, self.size)
+        except OSError:
+            # 출석 이후 얼굴 파일이 삭제된 경우
+            return
+        if pixmap.isNull():
+            return
+        target = QRect(0, 0, pixmap.width(), pixmap.height())
+        target.moveCenter(option.rect.center())
+        painter.drawPixmap(target, pixmap)
+
+    def sizeHint(self, option, index):
+        return QSize(self.size + 4, self.size + 4)
@@ -0,0 +1,172 @@
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+
+
+from attendance_store import daily_csv_path
+
+
+DURABILITY_LEVELS = ("none", "batch", "event")
+
+
+class AttendanceWriter(threading.Thread):
+    """출석 이벤트를 저널에 남기고 배치로 저장소에 반영하는 비동기 기록기
+
+    submit() 은 이벤트를 큐에 넣기만 하므로 호출한 스레드(GUI 등)에서는 파일 입출력이
+    없습니다. 기록 스레드는 저널 파일을 한 번만 열어 두고, flush_interval 초가 지나거나
+    batch_size 개가 모이면 모은 이벤트를 저널에 한꺼번에 추가한 다음 아직 반영하지 못한
+    이벤트 전체를 AttendanceStore 에 INSERT OR IGNORE 로 반영하고, 일별 CSV 파일을
+    저장소에서 다시 만든 뒤 저널을 비웁니다. 반영에 실패하면 저널과 미반영 이벤트를
+    그대로 두고 다음 주기에 다시 시도하며, 비정상 종료 후에는 시작할 때 저널을 다시
+    반영합니다.
+
+    durability:
+        "none"  - 저널을 OS 버퍼로만 기록 (fsync 없음)
+        "batch" - 배치마다 저널을 fsync 한 뒤 반영
+        "event" - 이벤트마다 저널을 fsync 하고 하나씩 반영 (기록 스레드에서 처리하므로
+                  submit() 이 돌아온 직후가 아니라 기록 스레드가 이벤트를 받은 직후부터 보존)
+    """
+
+    def __init__(self, store, directory=".", journal_name="attendance_journal.jsonl",
+                 flush_interval=1.0, batch_size=100, durability="batch"):
+        super().__init__(daemon=True)
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"알 수 없는 durability 수준: {durability}")
+        self.store = store
+        self.directory = directory
+        self.journal_path = os.path.join(directory, journal_name)
+        self.flush_interval = flush_interval
+        self.batch_size = 1 if durability == "event" else batch_size
+        self.durability = durability
+        self.written = 0
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        # 저널 파일과 미반영 이벤트는 기록 스레드만 다룸
+        self._journal = None
+        self._pending = []
+
+    def submit(self, name, timestamp=None, status="출석"):
+        """출석 이벤트를 기록 스레드의 큐에 넣음 (호출한 스레드에서는 파일/저장소 입출력 없음)"""
+        timestamp = timestamp or datetime.datetime.now()
+        self._queue.put({
+            "name": name,
+            "date": timestamp.strftime('%Y-%m-%d'),
+            "time": timestamp.strftime('%H:%M:%S'),
+            "status": status,
+        })
+
+    def run(self):
+        try:
+            self._open_journal()
+        except Exception as e:
+            print(f"출석 저널 열기 실패: {str(e)}")
+        self.replay()
+        while not (self._stop_event.is_set() and self._queue.empty()):
+            batch = self._collect()
+            if not batch and not self._pending:
+                continue
+            try:
+                # 저널 추가가 실패해도 이벤트는 메모리에 남겨 다음 주기에 반영
+                self._pending.extend(batch)
+                self._append_journal(batch)
+                self.written += self._apply_pending()
+            except Exception as e:
+                # 미반영 이벤트와 저널은 그대로 남으므로 다음 주기에 다시 시도
+                print(f"출석 기록 저장 중 오류 발생: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def flush(self):
+        """지금까지 추가된 이벤트가 모두 처리될 때까지 대기"""
+        if self.is_alive():
+            self._queue.join()
+
+    def _collect(self):
+        """flush_interval 동안 최대 batch_size 개의 이벤트를 모음"""
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval))
+        except queue.Empty:
+            return batch
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            # 종료 중에는 기다리지 않고 남은 이벤트만 가져옴
+            remaining = 0 if self._stop_event.is_set() else deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _open_journal(self):
+        """저널을 이어 쓰기로 열고, 지난 실행의 미반영 이벤트를 읽어 둠 (기록 도중 끊긴 줄은 건너뜀)"""
+        os.makedirs(self.directory or ".", exist_ok=True)
+        self._journal = open(self.journal_path, 'a+b')
+        self._journal.seek(0)
+        data = self._journal.read()
+        for line in data.decode('utf-8', errors='ignore').splitlines():
+            try:
+                self._pending.append(json.loads(line))
+            except ValueError:
+                continue
+        if data and not data.endswith(b"\n"):
+            # 끊긴 줄 뒤에 새 이벤트가 붙지 않도록 줄을 끝냄
+            self._journal.write(b"\n")
+            self._sync()
+
+    def _append_journal(self, events):
+        """이벤트를 저널에 한꺼번에 추가"""
+        if self._journal is None or not events:
+            return
+        self._journal.write("".join(json.dumps(event, ensure_ascii=False) + "\n"
+                                    for event in events).encode('utf-8'))
+        self._sync()
+
+    def _sync(self):
+        self._journal.flush()
+        if self.durability != "none":
+            os.fsync(self._journal.fileno())
+
+    def _apply_pending(self):
+        """미반영 이벤트 전체를 저장소에 반영하고, 모두 반영된 뒤에만 저널을 비움 (반영한 이벤트 수 반환)"""
+        events = self._pending
+        if events:
+            # 1. 저장소에 한 트랜잭션으로 기록 (UNIQUE 제약으로 이미 있는 기록은 무시)
+            self.store.insert_many(events)
+
+            # 2. 일별 CSV 파일은 저장소의 뷰로 다시 생성
+            for date_string in set(event["date"] for event in events):
+                self.store.export_csv(daily_csv_path(date_string, self.directory), date_string)
+
+        # 3. 저널에는 반영한 이벤트만 있으므로 (추가는 이 스레드만 함) 통째로 비움
+        if self._journal is not None:
+            self._journal.truncate(0)
+            self._sync()
+        self._pending = []
+        return len(events)
+
+    def replay(self):
+        """이전 실행에서 반영하지 못한 저널 이벤트를 다시 기록"""
+        try:
+            count = self._apply_pending()
+        except Exception as e:
+            print(f"저널 반영 중 오류 발생: {str(e)}")
+            return
+        if count:
+            print(f"저널에서 출석 기록 {count}건을 다시 반영했습니다.")
+
+    def close(self, timeout=5.0):
+        """남은 이벤트를 모두 기록하고 스레드 종료"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
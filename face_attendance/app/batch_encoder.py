@@ -0,0 +1,135 @@
+import cv2
+import numpy as np
+
+
+# dlib 모델 (얼굴 정렬용 5점 랜드마크, 인코더) - 처음 사용할 때 한 번만 찾음
+_models = None
+
+
+def _dlib_models():
+    """face_recognition 이 내부에서 쓰는 dlib 모델 (찾을 수 없으면 False)"""
+    global _models
+    if _models is None:
+        try:
+            import dlib
+            from face_recognition import api
+
+            _models = (dlib, api.pose_predictor_5_point, api.face_encoder)
+        except (ImportError, AttributeError):
+            _models = False
+    return _models
+
+
+def _rect(location):
+    import dlib
+
+    top, right, bottom, left = location
+    return dlib.rectangle(int(left), int(top), int(right), int(bottom))
+
+
+def _encode_chips(face_encoder, chips, counts, num_jitters):
+    """정렬된 얼굴 조각 전체를 한 번에 인코딩하고 프레임별 개수(counts)대로 나누어 반환"""
+    descriptors = face_encoder.compute_face_descriptor(chips, num_jitters) if chips else []
+
+    results = []
+    offset = 0
+    for count in counts:
+        results.append([np.array(descriptor) for descriptor in descriptors[offset:offset + count]])
+        offset += count
+    return results
+
+
+def encode_faces_batched(frames, num_jitters=1):
+    """[(RGB 이미지, 얼굴 위치 목록), ...] 의 모든 얼굴을 한 번의 dlib 호출로 인코딩
+
+    face_recognition.face_encodings 는 얼굴마다 인코더를 따로 호출하지만, 여기서는
+    모든 프레임의 얼굴을 정렬된 150x150 조각으로 만든 뒤 한 묶음으로 인코딩합니다.
+    반환값은 입력 프레임 순서대로의 인코딩 목록입니다.
+    """
+    models = _dlib_models()
+    if not models:
+        # dlib 내부 모델을 쓸 수 없으면 프레임마다 기존 방식으로 인코딩
+        import face_recognition
+
+        return [face_recognition.face_encodings(image, locations) if locations else []
+                for image, locations in frames]
+
+    dlib, pose_predictor, face_encoder = models
+    chips = []
+    counts = []
+    for image, locations in frames:
+        counts.append(len(locations))
+        if not locations:
+            continue
+        landmarks = dlib.full_object_detections()
+        for location in locations:
+            landmarks.append(pose_predictor(image, _rect(location)))
+        # compute_face_descriptor 의 기본 padding(0.25) 과 같은 정렬
+        chips.extend(dlib.get_face_chips(image, landmarks, size=150, padding=0.25))
+
+    return _encode_chips(face_encoder, chips, counts, num_jitters)
+
+
+class CropBuffer:
+    """원본 해상도 프레임에서 얼굴 주변만 잘라 RGB 로 변환하는 재사용 버퍼
+
+    한 번 할당한 메모리를 계속 쓰고, 더 큰 얼굴이 나올 때만 늘립니다. 반환한 조각은
+    다음 crop() 호출 때 덮어쓰이므로 그 전에 사용(또는 복사)해야 합니다.
+    """
+
+    def __init__(self, margin=0.5):
+        self.margin = margin
+        self._buffer = np.empty(0, dtype=np.uint8)
+
+    def crop(self, frame, location):
+        """BGR 프레임에서 얼굴 위치 (top, right, bottom, left) 주변을 잘라 (RGB 조각, 조각 안의 위치) 반환"""
+        height, width = frame.shape[:2]
+        top, right, bottom, left = location
+        pad_y = int((bottom - top) * self.margin)
+        pad_x = int((right - left) * self.margin)
+        crop_top, crop_bottom = max(0, top - pad_y), min(height, bottom + pad_y)
+        crop_left, crop_right = max(0, left - pad_x), min(width, right + pad_x)
+        crop_height, crop_width = crop_bottom - crop_top, crop_right - crop_left
+
+        size = crop_height * crop_width * 3
+        if self._buffer.size < size:
+            self._buffer = np.empty(size, dtype=np.uint8)
+        # dlib 은 연속된 배열이 필요하므로 평평한 버퍼의 앞부분을 이미지 모양으로 사용
+        rgb = self._buffer[:size].reshape(crop_height, crop_width, 3)
+        cv2.cvtColor(frame[crop_top:crop_bottom, crop_left:crop_right], cv2.COLOR_BGR2RGB, dst=rgb)
+        return rgb, (top - crop_top, right - crop_left, bottom - crop_top, left - crop_left)
+
+
+def encode_face_crops(frames, crop_buffer, num_jitters=1):
+    """[(원본 BGR 프레임, 원본 좌표 얼굴 위치 목록), ...] 을 원본 해상도 얼굴 조각으로 인코딩
+
+    검출은 축소 프레임에서 하더라도 인코딩은 원본 해상도의 얼굴 주변 조각에서만 하므로
+    멀리 있는 작은 얼굴도 정확하게 인코딩되고, 인코더는 얼굴 밖의 화소를 보지 않습니다.
+    반환값은 입력 프레임 순서대로의 인코딩 목록입니다.
+    """
+    models = _dlib_models()
+    if not models:
+        import face_recognition
+
+        results = []
+        for frame, locations in frames:
+            encodings = []
+            for location in locations:
+                rgb, local = crop_buffer.crop(frame, location)
+                encodings.extend(face_recognition.face_encodings(rgb, [local]))
+            results.append(encodings)
+        return results
+
+    dlib, pose_predictor, face_encoder = models
+    chips = []
+    counts = []
+    for frame, locations in frames:
+        counts.append(len(locations))
+        for location in locations:
+            rgb, local = crop_buffer.crop(frame, location)
+            landmarks = dlib.full_object_detections()
+            landmarks.append(pose_predictor(rgb, _rect(local)))
+            # 정렬된 조각은 새 배열로 복사되므로 다음 얼굴에서 버퍼를 다시 써도 됨
+            chips.extend(dlib.get_face_chips(rgb, landmarks, size=150, padding=0.25))
+
+    return _encode_chips(face_encoder, chips, counts, num_jitters)
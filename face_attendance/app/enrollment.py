@@ -0,0 +1,130 @@
+import concurrent.futures
+import os
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from thumbnail_cache import save_thumbnails
+
+
+VALID_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def enroll_image(source_path, target_path):
+    """이미지를 한 번만 디코딩하여 얼굴 검출, 인코딩, JPEG 저장까지 처리 (작업 프로세스에서 실행)
+
+    반환값: (원본 경로, 저장 경로, 인코딩 또는 None, 오류 메시지 또는 None)
+    """
+    import face_recognition
+    from PIL import Image
+
+    try:
+        image = face_recognition.load_image_file(source_path)
+        face_locations = face_recognition.face_locations(image)
+        if len(face_locations) == 0:
+            return source_path, target_path, None, "얼굴 감지 실패"
+
+        # 검출한 위치를 그대로 사용하여 다시 검출하지 않음
+        face_encoding = face_recognition.face_encodings(image, face_locations[:1])[0]
+        pil_image = Image.fromarray(image)
+        pil_image.save(target_path, 'JPEG', quality=95)
+        # 같은 디코딩 결과로 목록/출석 화면용 썸네일도 생성
+        save_thumbnails(pil_image, target_path)
+        return source_path, target_path, face_encoding, None
+    except Exception as e:
+        return source_path, target_path, None, f"오류: {str(e)}"
+
+
+def plan_enrollment(folder_path, faces_dir="faces"):
+    """등록할 (원본 경로, 저장 경로) 목록과 건너뛸 파일 수를 계산"""
+    tasks = []
+    skip_count = 0
+    reserved = set()
+    for filename in sorted(os.listdir(folder_path)):
+        if not filename.lower().endswith(VALID_EXTENSIONS):
+            continue
+        name = os.path.splitext(filename)[0]
+        target_path = os.path.join(faces_dir, f"{name}.jpg")
+        # 이미 존재하는 얼굴이거나 같은 이름이 폴더에 중복된 경우 건너뜀
+        if target_path in reserved or os.path.exists(target_path):
+            skip_count += 1
+            continue
+        reserved.add(target_path)
+        tasks.append((os.path.join(folder_path, filename), target_path))
+    return tasks, skip_count
+
+
+class BulkEnrollmentThread(QThread):
+    """프로세스 풀에서 대량 등록을 병렬로 처리하고 진행 상황을 시그널로 전달하는 스레드
+
+    결과 인코딩은 face_cache 에 바로 기록되므로 등록 후 다시 인코딩하지 않습니다.
+    """
+
+    # (완료 수, 전체 수, 파일 이름)
+    progress = pyqtSignal(int, int, str)
+    # {"registered": [경로], "success", "skip", "fail", "errors": [메시지], "cancelled"}
+    completed = pyqtSignal(dict)
+
+    def __init__(self, folder_path, face_cache, faces_dir="faces", max_workers=None,
+                 flush_every=100, parent=None):
+        super().__init__(parent)
+        self.folder_path = folder_path
+        self.face_cache = face_cache
+        self.faces_dir = faces_dir
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.flush_every = flush_every
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        if not os.path.exists(self.faces_dir):
+            os.makedirs(self.faces_dir)
+
+        tasks, skip_count = plan_enrollment(self.folder_path, self.faces_dir)
+        summary = {"registered": [], "success": 0, "skip": skip_count, "fail": 0,
+                   "errors": [], "cancelled": False}
+        total = len(tasks)
+        done = 0
+        pending_cache = []
+
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                task_iter = iter(tasks)
+                running = set()
+                # 취소에 빨리 반응하도록 작업자 수의 2배까지만 미리 제출
+                while True:
+                    while not self._cancelled and len(running) < self.max_workers * 2:
+                        task = next(task_iter, None)
+                        if task is None:
+                            break
+                        running.add(executor.submit(enroll_image, *task))
+                    if not running:
+                        break
+
+                    finished, running = concurrent.futures.wait(
+                        running, timeout=0.2, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in finished:
+                        source_path, target_path, encoding, error = future.result()
+                        filename = os.path.basename(source_path)
+                        done += 1
+                        if error is None:
+                            pending_cache.append((target_path, encoding))
+                            summary["registered"].append(target_path)
+                            summary["success"] += 1
+                        else:
+                            summary["fail"] += 1
+                            summary["errors"].append(f"{filename} ({error})")
+                        self.progress.emit(done, total, filename)
+
+                    if len(pending_cache) >= self.flush_every:
+                        self.face_cache.put(pending_cache)
+                        pending_cache = []
+        except Exception as e:
+            summary["errors"].append(f"오류: {str(e)}")
+        finally:
+            if pending_cache:
+                self.face_cache.put(pending_cache)
+
+        summary["cancelled"] = self._cancelled
+        self.completed.emit(summary)
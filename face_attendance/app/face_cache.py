@@ -0,0 +1,324 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+from PIL import Image
+
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+ENCODING_SIZE = 128
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-1 해시 계산"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encode_face_file(image_path):
+    """이미지 파일에서 첫 번째 얼굴의 인코딩을 계산 (얼굴이 없으면 None)"""
+    import face_recognition
+
+    face_image = np.array(Image.open(image_path).convert('RGB'))
+    face_encodings = face_recognition.face_encodings(face_image)
+    if len(face_encodings) > 0:
+        return face_encodings[0]
+    return None
+
+
+class FaceEncodingCache:
+    """faces 디렉토리의 얼굴 인코딩을 디스크에 보관하는 캐시
+
+    encodings.npy 에는 (N, 128) 인코딩 행렬을, manifest.json 에는 파일별
+    이름/경로/mtime/크기/해시와 행 번호를 저장합니다. refresh() 는 새로
+    추가되었거나 변경된 파일만 다시 인코딩하고 나머지는 메모리 맵으로 읽습니다.
+    """
+
+    MANIFEST_VERSION = 1
+
+    def __init__(self, faces_dir="faces", cache_dir="face_cache", encode_fn=None):
+        self.faces_dir = faces_dir
+        self.cache_dir = cache_dir
+        self.encode_fn = encode_fn or encode_face_file
+        self.matrix_path = os.path.join(cache_dir, "encodings.npy")
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+
+        # filename -> {"name", "path", "mtime", "size", "hash", "row"}
+        self.entries = {}
+        self._lock = threading.RLock()
+        self.encodings = np.zeros((0, ENCODING_SIZE), dtype=np.float64)
+
+    def _read(self):
+        """디스크의 매니페스트와 인코딩 행렬 읽기"""
+        self.entries = {}
+        self.encodings = np.zeros((0, ENCODING_SIZE), dtype=np.float64)
+        if not (os.path.exists(self.manifest_path) and os.path.exists(self.matrix_path)):
+            return
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") != self.MANIFEST_VERSION:
+                return
+            # 한 번의 메모리 맵 읽기로 전체 행렬 로드
+            encodings = np.load(self.matrix_path, mmap_mode='r')
+            if encodings.ndim != 2 or encodings.shape[1] != ENCODING_SIZE:
+                return
+            self.entries = manifest.get("files", {})
+            self.encodings = encodings
+        except Exception as e:
+            print(f"인코딩 캐시 읽기 실패, 전체 재인코딩합니다: {str(e)}")
+            self.entries = {}
+            self.encodings = np.zeros((0, ENCODING_SIZE), dtype=np.float64)
+
+    def _write(self):
+        """매니페스트와 인코딩 행렬을 원자적으로 저장"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # 교체할 파일을 메모리 맵으로 열어 둔 채로는 덮어쓸 수 없으므로(Windows) 메모리로 복사
+        if isinstance(self.encodings, np.memmap):
+            self.encodings = np.array(self.encodings, dtype=np.float64)
+
+        matrix_tmp = self.matrix_path + ".tmp"
+        with open(matrix_tmp, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.encodings, dtype=np.float64))
+        os.replace(matrix_tmp, self.matrix_path)
+
+        manifest_tmp = self.manifest_path + ".tmp"
+        with open(manifest_tmp, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.MANIFEST_VERSION, "files": self.entries},
+                      f, ensure_ascii=False)
+        os.replace(manifest_tmp, self.manifest_path)
+
+    def _is_current(self, entry, stat, path):
+        """캐시 항목이 현재 파일과 일치하는지 확인"""
+        if entry is None:
+            return False
+        if entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            return True
+        # mtime만 바뀐 경우(복사, touch 등)는 해시로 다시 확인
+        if entry["size"] == stat.st_size and entry.get("hash") == file_hash(path):
+            entry["mtime"] = stat.st_mtime
+            return True
+        return False
+
+    def refresh(self):
+        """faces 디렉토리와 캐시를 동기화하고 (이름 목록, 경로 목록, 인코딩 행렬) 반환"""
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self):
+        if not os.path.exists(self.faces_dir):
+            os.makedirs(self.faces_dir)
+
+        self._read()
+        old_entries = self.entries
+        old_encodings = self.encodings
+
+        new_entries = {}
+        kept_rows = []   # 캐시에서 그대로 가져올 기존 행 번호
+        kept_files = []
+        encoded = []     # 새로 인코딩한 (파일 이름, 인코딩)
+        image_entries = sorted(
+            (e for e in os.scandir(self.faces_dir)
+             if e.is_file() and e.name.lower().endswith(IMAGE_EXTENSIONS)),
+            key=lambda e: e.name
+        )
+        changed = set(old_entries) != set(e.name for e in image_entries)
+
+        for dir_entry in image_entries:
+            filename = dir_entry.name
+            stat = dir_entry.stat()
+            entry = old_entries.get(filename)
+            if entry is not None:
+                previous_mtime = entry["mtime"]
+                if self._is_current(entry, stat, dir_entry.path):
+                    changed = changed or entry["mtime"] != previous_mtime
+                    if entry["row"] is not None:
+                        kept_rows.append(entry["row"])
+                        kept_files.append(filename)
+                    new_entries[filename] = entry
+                    continue
+
+            # 새로 추가되었거나 변경된 파일만 인코딩
+            changed = True
+            entry = {
+                "name": os.path.splitext(filename)[0],
+                "path": dir_entry.path,
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "hash": file_hash(dir_entry.path),
+                "row": None,
+            }
+            try:
+                encoding = self.encode_fn(dir_entry.path)
+                if encoding is not None:
+                    encoded.append((filename, np.asarray(encoding, dtype=np.float64)))
+                else:
+                    print(f"경고: {filename}에서 얼굴을 찾을 수 없습니다.")
+            except Exception as e:
+                print(f"얼굴 로딩 중 오류 발생 ({filename}): {str(e)}")
+                continue
+            new_entries[filename] = entry
+
+        # 기존 행(메모리 맵)과 새 행을 하나의 행렬로 재구성
+        parts = []
+        if not encoded and kept_rows == list(range(len(old_encodings))):
+            # 변경이 없으면 메모리 맵을 그대로 사용
+            parts.append(old_encodings)
+        elif kept_rows:
+            parts.append(np.asarray(old_encodings[kept_rows], dtype=np.float64))
+        if encoded:
+            parts.append(np.vstack([encoding for _, encoding in encoded]))
+        if parts:
+            encodings = np.vstack(parts) if len(parts) > 1 else parts[0]
+        else:
+            encodings = np.zeros((0, ENCODING_SIZE), dtype=np.float64)
+
+        row_files = kept_files + [filename for filename, _ in encoded]
+        for row, filename in enumerate(row_files):
+            new_entries[filename]["row"] = row
+
+        self.entries = new_entries
+        self.encodings = encodings
+        del old_encodings, parts, encodings
+        if changed:
+            self._save()
+
+        return self.known_faces()
+
+    def add_files(self, paths, executor=None):
+        """지정한 파일만 인코딩하여 캐시에 추가하고 (경로 목록, 인코딩 목록) 반환 (얼굴이 없는 파일은 빠짐)
+
+        executor (프로세스 풀 등) 를 주면 새로 인코딩할 파일을 그 작업자들에서 나누어 인코딩합니다.
+        """
+        items = []
+        with self._lock:
+            stale = []
+            for path in paths:
+                filename = os.path.basename(path)
+                try:
+                    entry = self.entries.get(filename)
+                    if entry is not None and self._is_current(entry, os.stat(path), path):
+                        items.append((path, None))  # put() 에서 캐시된 값을 사용
+                        continue
+                    stale.append(path)
+                except Exception as e:
+                    print(f"얼굴 로딩 중 오류 발생 ({filename}): {str(e)}")
+
+            jobs = [(path, executor.submit(self.encode_fn, path) if executor is not None else None)
+                    for path in stale]
+            for path, job in jobs:
+                try:
+                    items.append((path, job.result() if job is not None else self.encode_fn(path)))
+                except Exception as e:
+                    print(f"얼굴 로딩 중 오류 발생 ({os.path.basename(path)}): {str(e)}")
+            return self.put(items)
+
+    def put(self, items):
+        """이미 계산된 [(경로, 인코딩 또는 None), ...] 을 캐시에 기록하고 (경로 목록, 인코딩 목록) 반환
+
+        병렬 등록 작업처럼 인코딩을 다른 곳에서 계산한 경우 다시 인코딩하지 않고 저장합니다.
+        반환하는 경로는 입력 경로 그대로이므로 kim.jpg, kim.png 처럼 이름이 같은 파일도 구분됩니다.
+        """
+        paths = []
+        encodings = []
+        with self._lock:
+            new_rows = []
+            dirty = False
+            for path, encoding in items:
+                filename = os.path.basename(path)
+                try:
+                    stat = os.stat(path)
+                    entry = self.entries.get(filename)
+                    if entry is not None and self._is_current(entry, stat, path):
+                        # 내용이 같은 파일은 캐시된 인코딩을 그대로 사용
+                        if entry["row"] is not None:
+                            paths.append(path)
+                            encodings.append(self._cached_encoding(entry))
+                        continue
+                    dirty = True
+                    entry = {
+                        "name": os.path.splitext(filename)[0],
+                        "path": path,
+                        "mtime": stat.st_mtime,
+                        "size": stat.st_size,
+                        "hash": file_hash(path),
+                        "row": None,
+                    }
+                    # 변경된 파일의 이전 행은 제거 후 다시 추가
+                    self._drop_rows([filename])
+                    if encoding is not None:
+                        entry["row"] = len(self.encodings) + len(new_rows)
+                        new_rows.append(np.asarray(encoding, dtype=np.float64))
+                        paths.append(path)
+                        encodings.append(new_rows[-1])
+                    else:
+                        print(f"경고: {filename}에서 얼굴을 찾을 수 없습니다.")
+                    self.entries[filename] = entry
+                except Exception as e:
+                    print(f"얼굴 로딩 중 오류 발생 ({filename}): {str(e)}")
+
+            if new_rows:
+                self.encodings = np.vstack([np.asarray(self.encodings), np.vstack(new_rows)])
+            if dirty:
+                self._save()
+        return paths, encodings
+
+    def _cached_encoding(self, entry):
+        if entry["row"] is None:
+            return None
+        return np.array(self.encodings[entry["row"]], dtype=np.float64)
+
+    def remove_files(self, paths):
+        """지정한 파일을 캐시에서 제거"""
+        filenames = [os.path.basename(path) for path in paths]
+        with self._lock:
+            self._drop_rows(filenames)
+            for filename in filenames:
+                self.entries.pop(filename, None)
+            self._save()
+
+    def _drop_rows(self, filenames):
+        """파일에 해당하는 인코딩 행을 행렬에서 제거하고 행 번호를 다시 매김"""
+        rows = [self.entries[f]["row"] for f in filenames
+                if f in self.entries and self.entries[f]["row"] is not None]
+        if not rows:
+            return
+        for filename in filenames:
+            if filename in self.entries:
+                self.entries[filename]["row"] = None
+        self.encodings = np.delete(np.asarray(self.encodings), rows, axis=0)
+        removed = np.sort(rows)
+        for entry in self.entries.values():
+            if entry["row"] is not None:
+                entry["row"] -= int(np.searchsorted(removed, entry["row"]))
+
+    def _save(self):
+        try:
+            self._write()
+        except Exception as e:
+            print(f"인코딩 캐시 저장 실패: {str(e)}")
+
+    def known_faces(self):
+        """인코딩이 있는 항목의 (이름 목록, 경로 목록, 인코딩 행렬) 반환 (행 순서)"""
+        with self._lock:
+            rows = sorted(
+                (entry["row"], entry["name"], entry["path"])
+                for entry in self.entries.values() if entry["row"] is not None
+            )
+            encodings = self.encodings
+        names = [name for _, name, _ in rows]
+        paths = [path for _, _, path in rows]
+        return names, paths, encodings
+
+    def enrolled_paths(self):
+        """인코딩 성공 여부와 관계없이 캐시에 등록된 모든 사진 경로"""
+        with self._lock:
+            return sorted(entry["path"] for entry in self.entries.values())
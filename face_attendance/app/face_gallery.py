@@ -0,0 +1,234 @@
+import bisect
+import itertools
+
+from PyQt5.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QObject, QRunnable, QSize, QSortFilterProxyModel,
+    QThreadPool, QTimer, pyqtSignal
+)
+from PyQt5.QtGui import QColor, QPixmap
+from PyQt5.QtWidgets import QListView
+
+
+GALLERY_THUMBNAIL_SIZE = 100
+PathRole = Qt.UserRole + 1
+
+
+class ThumbnailLoaderSignals(QObject):
+    # (원본 경로, QImage 또는 None)
+    loaded = pyqtSignal(str, object)
+
+
+class ThumbnailLoader(QRunnable):
+    """작업 스레드에서 썸네일 QImage 를 디코딩 (QPixmap 변환은 GUI 스레드에서 처리)"""
+
+    def __init__(self, thumbnail_cache, image_path, size):
+        super().__init__()
+        self.thumbnail_cache = thumbnail_cache
+        self.image_path = image_path
+        self.size = size
+        self.signals = ThumbnailLoaderSignals()
+
+    def run(self):
+        try:
+            image = self.thumbnail_cache.image(self.image_path, self.size)
+        except Exception as e:
+            print(f"썸네일 로드 중 오류 발생 ({self.image_path}): {str(e)}")
+            image = None
+        self.signals.loaded.emit(self.image_path, image)
+
+
+class FaceGalleryModel(QAbstractListModel):
+    """등록된 얼굴 목록 모델
+
+    뷰가 화면에 보이는 항목의 이미지만 요청하므로, 썸네일은 요청된 항목만
+    스레드 풀에서 비동기로 읽어 ThumbnailCache 에 넣습니다.
+    """
+
+    def __init__(self, thumbnail_cache, size=GALLERY_THUMBNAIL_SIZE, max_threads=4, parent=None):
+        super().__init__(parent)
+        self.thumbnail_cache = thumbnail_cache
+        self.size = size
+        self._faces = []        # [(이름, 경로)]
+        self._rows = {}         # 경로 -> 행
+        self._checked = set()   # 선택된 경로
+        self._pending = set()   # 로딩 중인 경로
+        self._failed = set()    # 로드에 실패한 경로
+        self._priority = itertools.count()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._placeholder = QPixmap(size, size)
+        self._placeholder.fill(QColor("#eeeeee"))
+
+    def set_faces(self, faces):
+        """(이름, 경로) 목록으로 모델 전체를 교체 (선택 상태는 남아 있는 항목만 유지)"""
+        self.beginResetModel()
+        self._faces = sorted(faces)
+        self._rows = {path: row for row, (_, path) in enumerate(self._faces)}
+        self._checked &= set(self._rows)
+        self._failed.clear()
+        self.endResetModel()
+
+    def add_faces(self, faces):
+        """(이름, 경로) 목록을 정렬 위치에 삽입 (많으면 한 번에 재구성)"""
+        faces = sorted(face for face in set(faces) if face[1] not in self._rows)
+        if not faces:
+            return
+        if len(faces) > max(64, len(self._faces) // 4):
+            self.set_faces(self._faces + faces)
+            return
+        # 행 번호 표는 삽입이 모두 끝난 뒤 처음 바뀐 행부터 한 번만 다시 계산
+        first = len(self._faces)
+        for face in faces:
+            row = bisect.bisect_left(self._faces, face)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._faces.insert(row, face)
+            self.endInsertRows()
+            first = min(first, row)
+        self._reindex(first)
+
+    def remove_faces(self, paths):
+        """경로에 해당하는 항목 제거"""
+        rows = sorted((self._rows.pop(path) for path in set(paths) if path in self._rows),
+                      reverse=True)
+        if not rows:
+            return
+        # 뒤쪽 행부터 지우면 앞쪽 행 번호는 바뀌지 않으므로 행 번호 표는 마지막에 한 번만 갱신
+        for row in rows:
+            path = self._faces[row][1]
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._faces[row]
+            self._checked.discard(path)
+            self._failed.discard(path)
+            self.endRemoveRows()
+        self._reindex(rows[-1])
+
+    def refresh_faces(self, paths):
+        """원본이 바뀐 항목의 썸네일을 다시 읽도록 표시"""
+        for path in paths:
+            self._failed.discard(path)
+            row = self._rows.get(path)
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def _reindex(self, start):
+        for row in range(start, len(self._faces)):
+            self._rows[self._faces[row][1]] = row
+
+    def faces(self):
+        return list(self._faces)
+
+    def checked_faces(self):
+        """선택된 (이름, 경로) 목록"""
+        return [face for face in self._faces if face[1] in self._checked]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._faces)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name, path = self._faces[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == Qt.DecorationRole:
+            return self._thumbnail(path)
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if path in self._checked else Qt.Unchecked
+        if role == Qt.ToolTipRole:
+            return path
+        if role == PathRole:
+            return path
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        path = self._faces[index.row()][1]
+        if value == Qt.Checked:
+            self._checked.add(path)
+        else:
+            self._checked.discard(path)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def _thumbnail(self, path):
+        pixmap = self.thumbnail_cache.get(path, self.size)
+        if pixmap is not None:
+            return pixmap
+        if path not in self._pending and path not in self._failed:
+            self._pending.add(path)
+            loader = ThumbnailLoader(self.thumbnail_cache, path, self.size)
+            loader.signals.loaded.connect(self._on_thumbnail_loaded)
+            # 가장 최근에 보인 항목을 먼저 읽도록 요청 순서대로 우선순위를 높임
+            self._pool.start(loader, next(self._priority) % (1 << 30))
+        return self._placeholder
+
+    def _on_thumbnail_loaded(self, path, image):
+        self._pending.discard(path)
+        if image is None or image.isNull():
+            self._failed.add(path)
+            return
+        self.thumbnail_cache.put(path, self.size, QPixmap.fromImage(image))
+        row = self._rows.get(path)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def shutdown(self):
+        self._pool.clear()
+        self._pool.waitForDone()
+
+
+class FaceGalleryView(QListView):
+    """아이콘 모드의 가상화된 얼굴 목록 (검색은 입력이 멈춘 뒤 한 번만 적용)"""
+
+    def __init__(self, model, search_delay=250, parent=None):
+        super().__init__(parent)
+        self.source_model = model
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(model)
+        self.proxy_model.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setModel(self.proxy_model)
+
+        size = model.size
+        self.setViewMode(QListView.IconMode)
+        self.setIconSize(QSize(size, size))
+        self.setGridSize(QSize(size + 40, size + 50))
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(200)
+        self.setWordWrap(True)
+        self.setSelectionMode(QListView.ExtendedSelection)
+
+        self._pending_filter = ""
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(search_delay)
+        self._search_timer.timeout.connect(self._apply_filter)
+
+    def set_search_text(self, text):
+        """검색어 변경 (search_delay 밀리초 동안 입력이 없을 때 적용)"""
+        self._pending_filter = text
+        self._search_timer.start()
+
+    def _apply_filter(self):
+        self.proxy_model.setFilterFixedString(self._pending_filter)
+
+    def keyPressEvent(self, event):
+        # 스페이스 키로 선택한 항목들의 체크 상태를 한 번에 전환
+        if event.key() == Qt.Key_Space and self.selectionModel().hasSelection():
+            indexes = self.selectionModel().selectedIndexes()
+            state = Qt.Unchecked if all(
+                index.data(Qt.CheckStateRole) == Qt.Checked for index in indexes) else Qt.Checked
+            for index in indexes:
+                self.proxy_model.setData(index, state, Qt.CheckStateRole)
+            return
+        super().keyPressEvent(event)
@@ -0,0 +1,126 @@
+import threading
+
+import numpy as np
+
+
+def top_k_smallest(squared, k):
+    """제곱 거리 행렬 (M, N) 에서 행마다 가장 가까운 k개의 (거리, 열 번호) 를 정렬하여 반환"""
+    count = squared.shape[1]
+    k = min(k, count)
+    if k < count:
+        indices = np.argpartition(squared, k - 1, axis=1)[:, :k]
+    else:
+        indices = np.tile(np.arange(count), (len(squared), 1))
+    top = np.take_along_axis(squared, indices, axis=1)
+    order = np.argsort(top, axis=1)
+    indices = np.take_along_axis(indices, order, axis=1)
+    distances = np.sqrt(np.take_along_axis(top, order, axis=1))
+    return distances, indices
+
+
+class FaceIndex:
+    """등록된 얼굴 인코딩을 하나의 연속된 float32 (N, 128) 행렬로 보관하는 검색 인덱스
+
+    각 행의 제곱 노름을 미리 계산해 두고, 한 프레임의 모든 얼굴을 한 번의
+    행렬 곱으로 비교합니다. add()/remove() 는 전체 재구성 없이 행을 추가하거나
+    마지막 행과 교체하는 방식으로 삭제합니다.
+    """
+
+    def __init__(self, dim=128, capacity=64):
+        self.dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._norms = np.zeros(capacity, dtype=np.float32)
+        self._names = []
+        self._rows_by_name = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._names)
+
+    @property
+    def names(self):
+        return list(self._names)
+
+    def _reserve(self, size):
+        """행렬 용량이 부족하면 두 배씩 늘림"""
+        capacity = self._matrix.shape[0]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity = max(capacity * 2, 64)
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        norms = np.zeros(capacity, dtype=np.float32)
+        count = len(self._names)
+        matrix[:count] = self._matrix[:count]
+        norms[:count] = self._norms[:count]
+        self._matrix = matrix
+        self._norms = norms
+
+    def build(self, names, encodings):
+        """인덱스를 주어진 이름/인코딩으로 새로 구성"""
+        with self._lock:
+            self._names = []
+            self._rows_by_name = {}
+            self.add(names, encodings)
+
+    def add(self, names, encodings):
+        """얼굴 인코딩을 인덱스에 추가"""
+        encodings = np.asarray(encodings, dtype=np.float32).reshape(-1, self.dim)
+        if len(names) != len(encodings):
+            raise ValueError("이름과 인코딩의 개수가 다릅니다.")
+        with self._lock:
+            start = len(self._names)
+            self._reserve(start + len(names))
+            self._matrix[start:start + len(names)] = encodings
+            self._norms[start:start + len(names)] = np.einsum('ij,ij->i', encodings, encodings)
+            for offset, name in enumerate(names):
+                self._names.append(name)
+                self._rows_by_name.setdefault(name, set()).add(start + offset)
+
+    def remove(self, names):
+        """이름에 해당하는 모든 행 삭제 (마지막 행을 빈 자리로 옮김)"""
+        with self._lock:
+            for name in names:
+                for row in sorted(self._rows_by_name.pop(name, ()), reverse=True):
+                    last = len(self._names) - 1
+                    if row != last:
+                        self._move_row(last, row)
+                    self._names.pop()
+
+    def _move_row(self, src, dst):
+        """src 행을 dst 위치로 옮김 (하위 클래스가 행별 데이터를 추가로 옮길 수 있음)"""
+        moved_name = self._names[src]
+        self._matrix[dst] = self._matrix[src]
+        self._norms[dst] = self._norms[src]
+        self._names[dst] = moved_name
+        moved_rows = self._rows_by_name[moved_name]
+        moved_rows.discard(src)
+        moved_rows.add(dst)
+
+    def search(self, queries, k=1):
+        """쿼리 인코딩 (M, 128) 에 대해 가까운 순서의 (거리 (M, k), 행 번호 (M, k)) 반환"""
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            count = len(self._names)
+            if count == 0 or len(queries) == 0:
+                return (np.zeros((len(queries), 0), dtype=np.float32),
+                        np.zeros((len(queries), 0), dtype=np.int64))
+            matrix = self._matrix[:count]
+            norms = self._norms[:count]
+
+            # ||q - x||^2 = ||q||^2 + ||x||^2 - 2 q·x 를 한 번의 행렬 곱으로 계산
+            squared = (np.einsum('ij,ij->i', queries, queries)[:, None]
+                       + norms[None, :] - 2.0 * (queries @ matrix.T))
+            np.maximum(squared, 0.0, out=squared)
+
+        return top_k_smallest(squared, k)
+
+    def match(self, queries, k=1):
+        """쿼리마다 [(이름, 거리), ...] 형태의 상위 k개 결과 반환"""
+        with self._lock:
+            distances, indices = self.search(queries, k)
+            names = self._names
+            return [
+                [(names[index], float(distance)) for index, distance in zip(row_indices, row_distances)]
+                for row_indices, row_distances in zip(indices, distances)
+            ]
@@ -0,0 +1,174 @@
+import copy
+import itertools
+
+import cv2
+import numpy as np
+
+
+UNKNOWN_NAME = "미등록"
+
+
+def box_iou(a, b):
+    """두 박스 (top, right, bottom, left) 의 IoU"""
+    top = max(a[0], b[0])
+    right = min(a[1], b[1])
+    bottom = min(a[2], b[2])
+    left = max(a[3], b[3])
+    if right <= left or bottom <= top:
+        return 0.0
+    intersection = (right - left) * (bottom - top)
+    area_a = (a[1] - a[3]) * (a[2] - a[0])
+    area_b = (b[1] - b[3]) * (b[2] - b[0])
+    return intersection / float(area_a + area_b - intersection)
+
+
+class Track:
+    """프레임 사이에서 같은 얼굴을 가리키는 추적 정보"""
+
+    def __init__(self, track_id, box, timestamp):
+        self.track_id = track_id
+        self.box = np.asarray(box, dtype=np.float32)
+        self.velocity = np.zeros(4, dtype=np.float32)  # 초당 박스 좌표 변화량
+        self.timestamp = timestamp
+        self.name = None
+        self.distance = None
+        self.identified_at = None
+        self.just_identified = False
+        self.misses = 0
+
+    @property
+    def label(self):
+        return self.name if self.name is not None else UNKNOWN_NAME
+
+    def predict_box(self, timestamp, max_horizon=0.5):
+        """등속 모델로 timestamp 시점의 박스를 추정 (최대 max_horizon 초까지)"""
+        dt = min(max(timestamp - self.timestamp, 0.0), max_horizon)
+        top, right, bottom, left = self.box + self.velocity * dt
+        return int(top), int(right), int(bottom), int(left)
+
+
+class FaceTracker:
+    """IoU 기반의 가벼운 얼굴 추적기
+
+    검출 결과를 기존 트랙과 IoU 로 연결하고, 새로 나타난 트랙이나 신원 확인이
+    오래된 트랙만 인코딩/매칭 대상으로 돌려줍니다.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_misses=3, reidentify_after=3.0,
+                 unknown_reidentify_after=1.0, smoothing=0.5):
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.reidentify_after = reidentify_after
+        self.unknown_reidentify_after = unknown_reidentify_after
+        self.smoothing = smoothing
+        self.tracks = []
+        self._ids = itertools.count(1)
+
+    def reset(self):
+        self.tracks = []
+
+    def _needs_identity(self, track, timestamp):
+        if track.identified_at is None:
+            return True
+        limit = self.reidentify_after if track.name is not None else self.unknown_reidentify_after
+        return timestamp - track.identified_at >= limit
+
+    def update(self, boxes, timestamp):
+        """검출된 박스 목록으로 트랙을 갱신하고 신원 확인이 필요한 [(트랙, 박스 번호), ...] 반환"""
+        for track in self.tracks:
+            track.just_identified = False
+
+        # IoU 가 큰 쌍부터 탐욕적으로 연결
+        pairs = []
+        for t_index, track in enumerate(self.tracks):
+            predicted = track.predict_box(timestamp)
+            for d_index, box in enumerate(boxes):
+                iou = box_iou(predicted, box)
+                if iou >= self.iou_threshold:
+                    pairs.append((iou, t_index, d_index))
+        pairs.sort(reverse=True)
+
+        matched_tracks = set()
+        matched_boxes = {}
+        for _, t_index, d_index in pairs:
+            if t_index in matched_tracks or d_index in matched_boxes:
+                continue
+            matched_tracks.add(t_index)
+            matched_boxes[d_index] = self.tracks[t_index]
+
+        for d_index, track in matched_boxes.items():
+            box = np.asarray(boxes[d_index], dtype=np.float32)
+            dt = timestamp - track.timestamp
+            if dt > 0:
+                velocity = (box - track.box) / dt
+                track.velocity = self.smoothing * track.velocity + (1 - self.smoothing) * velocity
+            track.box = box
+            track.timestamp = timestamp
+            track.misses = 0
+
+        # 연결되지 않은 트랙은 일정 횟수 이상 놓치면 삭제
+        survivors = []
+        for t_index, track in enumerate(self.tracks):
+            if t_index not in matched_tracks:
+                track.misses += 1
+                if track.misses > self.max_misses:
+                    continue
+            survivors.append(track)
+        self.tracks = survivors
+
+        # 새로 나타난 얼굴은 새 트랙 생성
+        for d_index, box in enumerate(boxes):
+            if d_index not in matched_boxes:
+                track = Track(next(self._ids), box, timestamp)
+                self.tracks.append(track)
+                matched_boxes[d_index] = track
+
+        return [
+            (track, d_index) for d_index, track in sorted(matched_boxes.items())
+            if self._needs_identity(track, timestamp)
+        ]
+
+    def set_identity(self, track, name, distance, timestamp):
+        """매칭 결과를 트랙에 반영 (name 이 None 이면 미등록)
+
+        신원이 바뀐 경우에만 just_identified 를 설정하여 같은 사람의 재확인은 무시합니다.
+        """
+        track.just_identified = name != track.name
+        track.name = name
+        track.distance = distance
+        track.identified_at = timestamp
+
+    def snapshot(self):
+        """다른 스레드로 전달할 수 있도록 현재 트랙을 복사하여 반환"""
+        return [copy.copy(track) for track in self.tracks]
+
+
+def draw_tracks(image, tracks, timestamp, scale=1.0):
+    """이미지에 트랙 박스와 이름을 그림 (검출 사이의 프레임은 이동 속도로 위치를 보간)
+
+    scale 은 원본 프레임 좌표를 image 좌표로 바꾸는 배율입니다 (축소된 표시용 이미지 등).
+    """
+    for track in tracks:
+        top, right, bottom, left = track.predict_box(timestamp)
+        if scale != 1.0:
+            top, right, bottom, left = (int(top * scale), int(right * scale),
+                                        int(bottom * scale), int(left * scale))
+        name = track.label
+        cv2.rectangle(image, 
+                    (left, top), 
+                    (right, bottom), 
+                    (0, 255, 0), 3)  # 박스 두께 증가
+
+        # 텍스트 표시 최적화
+        y_position = bottom + 30
+        cv2.rectangle(image,
+                    (left, y_position-30),
+                    (right, y_position+10),
+                    (0, 255, 0), cv2.FILLED)
+
+        # OpenCV putText로 변경 (성능 향상)
+        cv2.putText(image, name,
+                  (left + 10, y_position),
+                  cv2.FONT_HERSHEY_DUPLEX, 0.8,  # 글자 크기 증가
+                  (255, 255, 255), 2)  # 글자 두께 증가
+    return image
@@ -0,0 +1,136 @@
+import math
+import threading
+import time
+
+
+class AdaptiveScheduler:
+    """처리할 프레임 간격과 검출 해상도를 측정값에 따라 조절하는 스케줄러
+
+    - 단계별 처리 시간(EMA)과 목표 CPU 사용률(target_cpu)로 처리 간격을 계산
+    - MotionGate 의 움직임 결과로 장면 변화량(activity)을 반영
+    - 움직임도 얼굴도 없으면 검출을 쉬고, 사람이 많거나 얼굴이 작으면
+      검출 배율(scale)을 낮춰 해상도를 높임
+    """
+
+    def __init__(self, target_cpu=0.5, min_interval=1, max_interval=15,
+                 scales=(2, 3, 4, 6), default_scale=4, min_face_size=40,
+                 idle_check_interval=150, smoothing=0.2):
+        self.target_cpu = target_cpu
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.scales = tuple(sorted(scales))
+        self.min_face_size = min_face_size
+        self.idle_check_interval = idle_check_interval
+        self.smoothing = smoothing
+
+        self.interval = 3
+        self.scale = default_scale
+        self.default_scale = default_scale
+        self.activity = 0.0
+        self.moving = True
+        self.face_count = 0
+        self.stage_latency = {}
+        self.total_latency = 0.0
+        self.capture_fps = 30.0
+        self.processed = 0
+        self.skipped_static = 0
+
+        self._lock = threading.Lock()
+        self._last_capture = None
+        self._last_processed_index = None
+
+    def _ema(self, old, new):
+        if old is None:
+            return new
+        return old + self.smoothing * (new - old)
+
+    def is_idle(self):
+        return not self.moving and self.face_count == 0
+
+    def should_process(self, frame_index, motion, timestamp=None):
+        """캡처 스레드에서 프레임마다 호출: 움직임 검사 결과(MotionResult)를 보고
+        이 프레임을 인식 단계로 보낼지 결정"""
+        timestamp = timestamp if timestamp is not None else time.monotonic()
+        with self._lock:
+            if self._last_capture is not None and timestamp > self._last_capture:
+                self.capture_fps = self._ema(self.capture_fps, 1.0 / (timestamp - self._last_capture))
+            self._last_capture = timestamp
+
+            self.moving = motion.moving
+            self.activity = self._ema(self.activity, motion.activity)
+
+            if self._last_processed_index is not None:
+                since = frame_index - self._last_processed_index
+                if since < self.interval:
+                    return False
+                # 움직임도 추적 중인 얼굴도 없으면 검출을 건너뛰고
+                # idle_check_interval 프레임마다 한 번만 전체 프레임을 확인
+                if self.is_idle() and since < self.idle_check_interval:
+                    self.skipped_static += 1
+                    return False
+
+            self._last_processed_index = frame_index
+            return True
+
+    def record(self, stage_latency, face_boxes=()):
+        """인식 워커에서 처리 후 호출: 단계별 처리 시간(초)과 검출된 박스로 다음 결정을 갱신"""
+        with self._lock:
+            self.processed += 1
+            for stage, latency in stage_latency.items():
+                self.stage_latency[stage] = self._ema(self.stage_latency.get(stage), latency)
+            self.total_latency = sum(self.stage_latency.values())
+            self.face_count = len(face_boxes)
+            self._update_interval()
+            self._update_scale(face_boxes)
+
+    def _update_interval(self):
+        # 초당 처리 가능 횟수 = 목표 CPU 사용률 / 프레임당 처리 시간
+        if self.total_latency <= 0:
+            return
+        rate = self.target_cpu / self.total_latency
+        interval = math.ceil(self.capture_fps / max(rate, 1e-6))
+        self.interval = int(min(max(interval, self.min_interval), self.max_interval))
+
+    def _update_scale(self, face_boxes):
+        index = self.scales.index(self.scale) if self.scale in self.scales else 0
+        detect_latency = self.stage_latency.get("detect", 0.0)
+        budget = self.target_cpu / max(self.capture_fps / max(self.interval, 1), 1e-6)
+
+        if face_boxes:
+            # 가장 작은 얼굴이 축소 프레임에서 검출 한계에 가까우면 해상도를 높임
+            smallest = min(bottom - top for (top, right, bottom, left) in face_boxes)
+            if smallest / self.scale < self.min_face_size * 1.5 and index > 0:
+                finer = self.scales[index - 1]
+                # 검출 비용은 픽셀 수에 비례한다고 보고 예산 안에서만 변경
+                if detect_latency * (self.scale / finer) ** 2 <= budget:
+                    self.scale = finer
+                    return
+            if smallest / self.scale > self.min_face_size * 4 and index < len(self.scales) - 1:
+                self.scale = self.scales[index + 1]
+                return
+        elif self.scale < self.default_scale:
+            self.scale = min(s for s in self.scales if s > self.scale)
+            return
+
+        # 예산을 넘으면 해상도를 낮춤
+        if detect_latency > budget and index < len(self.scales) - 1:
+            self.scale = self.scales[index + 1]
+
+    def metrics(self):
+        """현재 결정과 측정값"""
+        with self._lock:
+            interval = self.idle_check_interval if self.is_idle() else self.interval
+            return {
+                "interval": interval,
+                "idle": self.is_idle(),
+                "scale": self.scale,
+                "moving": self.moving,
+                "activity": round(self.activity, 4),
+                "face_count": self.face_count,
+                "capture_fps": round(self.capture_fps, 1),
+                "processed_fps": round(self.capture_fps / max(interval, 1), 1),
+                "latency_ms": {stage: round(value * 1000.0, 2) for stage, value in self.stage_latency.items()},
+                "total_latency_ms": round(self.total_latency * 1000.0, 2),
+                "processed": self.processed,
+                "skipped_static": self.skipped_static,
+            }
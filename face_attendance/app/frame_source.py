@@ -0,0 +1,147 @@
+import collections
+import os
+import threading
+import time
+
+import cv2
+
+
+class LatestQueue:
+    """크기가 제한된 스레드 안전 큐 (가득 차면 가장 오래된 항목을 버림)
+
+    maxsize=1 이면 항상 최신 프레임만 남으므로 소비자가 느려도
+    처리 대기열이 쌓이지 않습니다.
+    """
+
+    def __init__(self, maxsize=1):
+        self._items = collections.deque(maxlen=maxsize)
+        self._condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._condition:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """항목을 꺼냄 (timeout 동안 없으면 None)"""
+        with self._condition:
+            if not self._items:
+                self._condition.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def get_nowait(self):
+        with self._condition:
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def clear(self):
+        with self._condition:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+def parse_source(source):
+    """카메라 번호 문자열은 정수로, 그 외(파일 경로, RTSP/HTTP URL)는 그대로 반환"""
+    if isinstance(source, int):
+        return source
+    source = str(source).strip()
+    return int(source) if source.isdigit() else source
+
+
+def is_live_source(source):
+    """카메라/스트림이면 True, 로컬 동영상 파일이면 False"""
+    source = parse_source(source)
+    return isinstance(source, int) or not os.path.isfile(source)
+
+
+def open_capture(source, width=1280, height=720, fps=30):
+    """카메라 번호, 동영상 파일, RTSP URL 을 열어 VideoCapture 반환 (실패 시 None)"""
+    source = parse_source(source)
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        capture.release()
+        return None
+    if isinstance(source, int):
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        capture.set(cv2.CAP_PROP_FPS, fps)
+    elif not os.path.isfile(source):
+        # 네트워크 스트림은 내부 버퍼를 줄여 지연을 최소화
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return capture
+
+
+class FrameReader(threading.Thread):
+    """실시간 소스에서 계속 프레임을 읽어 최신 (프레임, 시각) 만 큐에 남기는 스레드
+
+    읽기에 연속으로 실패하면 reconnect_delay 초 후 소스를 다시 열고,
+    max_reconnects 번을 넘기면 종료합니다 (None 이면 무제한).
+    동영상 파일은 끝까지 읽으면 종료합니다.
+    """
+
+    def __init__(self, source, frame_queue=None, reconnect_delay=2.0, max_reconnects=None):
+        super().__init__(daemon=True)
+        self.source = source
+        self.frame_queue = frame_queue or LatestQueue(maxsize=1)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnects = max_reconnects
+        self.frames_read = 0
+        self.reconnects = 0
+        self.failed = False
+        self.live = is_live_source(source)
+        self._stop_event = threading.Event()
+        self._capture = None
+
+    def run(self):
+        failures = 0
+        while not self._stop_event.is_set():
+            if self._capture is None:
+                self._capture = open_capture(self.source)
+                if self._capture is None:
+                    if not self._retry():
+                        break
+                    continue
+
+            ret, frame = self._capture.read()
+            if not ret and not self.live:
+                break
+            if not ret:
+                failures += 1
+                if failures > 100:
+                    failures = 0
+                    self._capture.release()
+                    self._capture = None
+                    if not self._retry():
+                        break
+                else:
+                    time.sleep(0.01)
+                continue
+            failures = 0
+            self.frames_read += 1
+            self.frame_queue.put((frame, time.monotonic()))
+
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+    def _retry(self):
+        if self.max_reconnects is not None and self.reconnects >= self.max_reconnects:
+            print(f"영상 소스를 열 수 없습니다: {self.source}")
+            self.failed = True
+            return False
+        self.reconnects += 1
+        self._stop_event.wait(self.reconnect_delay)
+        return not self._stop_event.is_set()
+
+    def stop(self, timeout=5.0):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
@@ -0,0 +1,104 @@
+import os
+
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+class GalleryService(QObject):
+    """faces 디렉토리를 감시하여 바뀐 파일만 알려 주는 공유 갤러리 서비스
+
+    QFileSystemWatcher 의 변경 알림을 settle_delay 밀리초 동안 모았다가 한 번만
+    디렉토리를 훑고, 이전 상태(파일별 mtime/크기)와 비교한 추가/삭제/변경 파일 경로만
+    시그널로 보냅니다. 관리 탭(목록), 출결 탭(인덱스, 명단)은 이 시그널을 받아 바뀐
+    항목만 갱신하고, 썸네일 캐시는 서비스가 직접 무효화합니다. 프로그램 밖에서
+    파일을 복사하거나 지워도 재시작 없이 반영됩니다.
+    """
+
+    # 경로 목록
+    faces_added = pyqtSignal(list)
+    faces_removed = pyqtSignal(list)
+    faces_modified = pyqtSignal(list)
+
+    def __init__(self, faces_dir="faces", thumbnail_cache=None, settle_delay=500, parent=None):
+        super().__init__(parent)
+        self.faces_dir = faces_dir
+        self.thumbnail_cache = thumbnail_cache
+        if not os.path.exists(faces_dir):
+            os.makedirs(faces_dir)
+
+        self._paused = 0
+        self._snapshot = self._scan()
+
+        # 대량 복사처럼 알림이 연달아 오면 마지막 알림 후 한 번만 확인
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(settle_delay)
+        self._settle_timer.timeout.connect(self.rescan)
+
+        self._watcher = QFileSystemWatcher([faces_dir], self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+    def _scan(self):
+        """파일 이름 -> (mtime, 크기)"""
+        snapshot = {}
+        for entry in os.scandir(self.faces_dir):
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                stat = entry.stat()
+                snapshot[entry.name] = (stat.st_mtime, stat.st_size)
+        return snapshot
+
+    def _path(self, filename):
+        return os.path.join(self.faces_dir, filename)
+
+    def faces(self):
+        """현재 등록된 (이름, 경로) 목록"""
+        return sorted((os.path.splitext(filename)[0], self._path(filename))
+                      for filename in self._snapshot)
+
+    def _on_directory_changed(self, path):
+        if not self._paused:
+            self._settle_timer.start()
+
+    def pause(self):
+        """대량 등록처럼 파일을 여러 개 쓰는 동안 알림을 미룸 (resume() 과 짝으로 호출)"""
+        self._paused += 1
+        self._settle_timer.stop()
+
+    def resume(self):
+        """미뤄 둔 변경을 한 번에 반영"""
+        self._paused = max(0, self._paused - 1)
+        if not self._paused:
+            self.rescan()
+
+    def rescan(self):
+        """디렉토리를 다시 확인하여 바뀐 파일만 시그널로 알리고 (추가, 삭제, 변경) 경로 목록 반환"""
+        if self._paused:
+            return [], [], []
+        self._settle_timer.stop()
+        try:
+            current = self._scan()
+        except OSError as e:
+            print(f"얼굴 디렉토리 확인 중 오류 발생: {str(e)}")
+            return [], [], []
+
+        previous = self._snapshot
+        added = [self._path(name) for name in sorted(set(current) - set(previous))]
+        removed = [self._path(name) for name in sorted(set(previous) - set(current))]
+        modified = [self._path(name) for name in sorted(set(current) & set(previous))
+                    if current[name] != previous[name]]
+        self._snapshot = current
+
+        if self.thumbnail_cache is not None:
+            # 삭제/변경된 파일의 썸네일은 다음 요청 때 다시 만들도록 제거
+            for path in removed + modified:
+                self.thumbnail_cache.invalidate(path)
+
+        if removed:
+            self.faces_removed.emit(removed)
+        if added:
+            self.faces_added.emit(added)
+        if modified:
+            self.faces_modified.emit(modified)
+        return added, removed, modified
@@ -0,0 +1,233 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+
+IDENTITY_MANIFEST = "identities.json"
+
+
+def file_stem(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+class IdentityManifest:
+    """얼굴 사진 파일이 누구의 사진인지 기록하는 faces/identities.json
+
+    register_face 가 같은 이름으로 추가 사진(name_1.jpg ...)을 저장할 때 파일 이름 ->
+    사람 이름을 명시적으로 기록합니다. 기록이 없는 파일은 파일 이름 자체가 사람
+    이름이므로, '김민수_2023001.jpg' 처럼 번호가 붙은 파일이 임의로 합쳐지지 않습니다.
+    다른 객체가 파일을 고친 내용은 reload() 를 호출할 때(변경 묶음마다 한 번) 반영합니다.
+    """
+
+    def __init__(self, faces_dir="faces"):
+        self.path = os.path.join(faces_dir, IDENTITY_MANIFEST)
+        self._names = {}    # 파일 이름 -> 사람 이름
+        self._mtime = None
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """파일 수정 시각이 바뀌었으면 다시 읽음"""
+        with self._lock:
+            self._reload()
+
+    def _reload(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self._names, self._mtime = {}, None
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._names = json.load(f)
+        except Exception as e:
+            print(f"사람 이름 목록 읽기 실패: {str(e)}")
+            self._names = {}
+        self._mtime = mtime
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._names, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    def identity(self, path):
+        """사진 파일의 사람 이름 (기록이 없으면 파일 이름, 파일은 다시 읽지 않음)"""
+        with self._lock:
+            return self._names.get(os.path.basename(path)) or file_stem(path)
+
+    def assign(self, path, name):
+        """사진 파일을 name 의 사진으로 기록"""
+        with self._lock:
+            self._reload()
+            self._names[os.path.basename(path)] = name
+            self._save()
+
+    def forget(self, paths):
+        """삭제된 사진 파일의 기록 제거"""
+        with self._lock:
+            self._reload()
+            removed = [self._names.pop(os.path.basename(path), None) for path in paths]
+            if any(name is not None for name in removed):
+                self._save()
+
+
+def _pairwise_distances(vectors):
+    squared = np.einsum('ij,ij->i', vectors, vectors)
+    distances = squared[:, None] + squared[None, :] - 2.0 * (vectors @ vectors.T)
+    np.maximum(distances, 0.0, out=distances)
+    return np.sqrt(distances)
+
+
+def compute_prototypes(encodings, max_medoids=3, iterations=5):
+    """한 사람의 인코딩 (N, 128) 을 중심점 + 최대 max_medoids 개 대표 표본으로 압축
+
+    사진이 한 장이면 그대로 사용하고, 여러 장이면 평균(중심점)과 함께
+    k-medoids 로 고른 실제 표본을 대표로 둡니다. 조명/각도가 다른 사진이
+    섞여 있어도 각 묶음의 대표가 남으므로 평균 하나보다 정확하고,
+    사진이 늘어나도 검색할 행 수는 1 + max_medoids 개를 넘지 않습니다.
+    """
+    encodings = np.atleast_2d(np.asarray(encodings, dtype=np.float64))
+    if len(encodings) <= 1:
+        return encodings.copy()
+
+    centroid = encodings.mean(axis=0)
+    k = min(max_medoids, len(encodings))
+    if k <= 0:
+        return centroid[None, :]
+
+    distances = _pairwise_distances(encodings)
+    # 중심점에 가장 가까운 표본부터 시작해 가장 먼 표본을 차례로 추가 (farthest-first)
+    medoids = [int(np.argmin(np.linalg.norm(encodings - centroid, axis=1)))]
+    while len(medoids) < k:
+        medoids.append(int(np.argmax(distances[:, medoids].min(axis=1))))
+
+    for _ in range(iterations):
+        assign = np.argmin(distances[:, medoids], axis=1)
+        updated = []
+        for cluster in range(len(medoids)):
+            members = np.flatnonzero(assign == cluster)
+            if len(members) == 0:
+                updated.append(medoids[cluster])
+                continue
+            # 묶음 안에서 다른 표본까지의 거리 합이 가장 작은 표본
+            costs = distances[np.ix_(members, members)].sum(axis=1)
+            updated.append(int(members[np.argmin(costs)]))
+        if updated == medoids:
+            break
+        medoids = updated
+
+    return np.vstack([centroid[None, :], encodings[sorted(set(medoids))]])
+
+
+class IdentityGallery:
+    """파일 단위 인코딩을 사람 단위로 묶어 대표 인코딩(프로토타입)을 관리
+
+    인덱스에는 파일마다 한 행이 아니라 사람마다 중심점 + 대표 표본 몇 개만
+    넣으므로, 매칭 결과는 파일 이름이 아닌 사람 이름이 됩니다.
+    """
+
+    def __init__(self, identities=None, max_medoids=3):
+        self.identities = identities or IdentityManifest()
+        self.max_medoids = max_medoids
+        self._samples = {}      # 이름 -> {경로: 인코딩}
+        self._owner = {}        # 경로 -> 이름 (파일이 지워진 뒤에도 제거할 수 있도록 보관)
+        self._prototypes = {}   # 이름 -> (P, 128) 대표 인코딩
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def __contains__(self, name):
+        return name in self._samples
+
+    def build(self, paths, encodings):
+        """파일 경로/인코딩 목록으로 전체를 다시 구성하고 (이름 목록, 대표 인코딩 행렬) 반환"""
+        with self._lock:
+            self._samples = {}
+            self._prototypes = {}
+            self._owner = {}
+            for path, encoding in zip(paths, encodings):
+                self._put(path, encoding)
+            for name in self._samples:
+                self._update_prototypes(name)
+        return self.prototypes()
+
+    def add(self, paths, encodings):
+        """파일을 추가(같은 경로는 교체)하고 대표 인코딩이 바뀐 이름 목록 반환"""
+        changed = set()
+        with self._lock:
+            for path, encoding in zip(paths, encodings):
+                # 같은 파일이 다른 사람으로 다시 등록된 경우 이전 사람에서 제거
+                changed.update(self._pop(path))
+                changed.add(self._put(path, encoding))
+            for name in changed:
+                self._update_prototypes(name)
+        return sorted(changed)
+
+    def remove(self, paths):
+        """파일을 제거하고 대표 인코딩이 바뀐 이름 목록 반환 (사진이 모두 지워진 이름 포함)"""
+        changed = set()
+        with self._lock:
+            for path in paths:
+                changed.update(self._pop(path))
+            for name in changed:
+                self._update_prototypes(name)
+        return sorted(changed)
+
+    def _put(self, path, encoding):
+        path = os.path.normpath(path)
+        name = self.identities.identity(path)
+        self._samples.setdefault(name, {})[path] = np.asarray(encoding)
+        self._owner[path] = name
+        return name
+
+    def _pop(self, path):
+        """경로를 제거하고 영향을 받은 이름 목록 반환"""
+        path = os.path.normpath(path)
+        name = self._owner.pop(path, None)
+        if name is None:
+            return []
+        samples = self._samples[name]
+        samples.pop(path, None)
+        if not samples:
+            del self._samples[name]
+        return [name]
+
+    def identity_of(self, path):
+        """이미 반영된 파일이면 그때의 이름, 아니면 현재 기록 기준의 이름"""
+        with self._lock:
+            name = self._owner.get(os.path.normpath(path))
+        return name or self.identities.identity(path)
+
+    def _update_prototypes(self, name):
+        samples = self._samples.get(name)
+        if not samples:
+            self._prototypes.pop(name, None)
+            return
+        self._prototypes[name] = compute_prototypes(np.vstack(list(samples.values())), self.max_medoids)
+
+    def prototypes(self, names=None):
+        """(이름 목록, 대표 인코딩 행렬) 반환 (이름은 대표 인코딩 행마다 반복)"""
+        with self._lock:
+            names = self._prototypes if names is None else [n for n in names if n in self._prototypes]
+            row_names = []
+            parts = []
+            for name in names:
+                prototypes = self._prototypes[name]
+                row_names.extend([name] * len(prototypes))
+                parts.append(prototypes)
+        if not parts:
+            return [], np.zeros((0, 128), dtype=np.float64)
+        return row_names, np.vstack(parts)
+
+    def sample_paths(self, name):
+        """이름에 속한 사진 경로 목록 (정렬)"""
+        with self._lock:
+            return sorted(self._samples.get(name, ()))
@@ -0,0 +1,285 @@
+import collections
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+METRIC_PREFIX = "face_attendance"
+
+
+class TimerStats:
+    """최근 window 개 측정값과 누적 합/횟수를 보관하는 타이머"""
+
+    def __init__(self, window=512):
+        self.count = 0
+        self.total = 0.0
+        self.recent = collections.deque(maxlen=window)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+
+    def summary(self):
+        values = sorted(self.recent)
+        if not values:
+            return {"count": self.count, "sum_s": self.total}
+
+        def quantile(q):
+            return values[min(len(values) - 1, int(q * len(values)))] * 1000.0
+
+        return {
+            "count": self.count,
+            "sum_s": round(self.total, 6),
+            "mean_ms": round(1000.0 * sum(values) / len(values), 3),
+            "p50_ms": round(quantile(0.50), 3),
+            "p95_ms": round(quantile(0.95), 3),
+            "p99_ms": round(quantile(0.99), 3),
+            "max_ms": round(values[-1] * 1000.0, 3),
+        }
+
+
+class Metrics:
+    """단계별 타이머, 카운터, 게이지를 모으는 가벼운 계측기
+
+    enabled 가 False 이면 모든 기록이 바로 반환되므로 꺼 둔 상태의 비용은
+    속성 확인 한 번뿐입니다. 실행 중에 set_enabled() 로 켜고 끌 수 있습니다.
+    """
+
+    def __init__(self, enabled=False, window=512):
+        self.enabled = enabled
+        self.window = window
+        self.started = time.monotonic()
+        self._counters = collections.defaultdict(int)
+        self._gauges = {}
+        self._timers = {}
+        self._lock = threading.Lock()
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timers.clear()
+            self.started = time.monotonic()
+
+    def inc(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = TimerStats(self.window)
+            timer.observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """with metrics.timer("stage_render"): ... 형태로 구간 시간 측정"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self):
+        """현재 값 전체를 JSON 으로 저장할 수 있는 dict 로 반환"""
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started, 1e-6)
+            return {
+                "timestamp": time.time(),
+                "uptime_s": round(elapsed, 1),
+                "enabled": self.enabled,
+                "counters": dict(self._counters),
+                "rates_per_s": {name: round(value / elapsed, 3) for name, value in self._counters.items()},
+                "gauges": dict(self._gauges),
+                "timers": {name: timer.summary() for name, timer in self._timers.items()},
+            }
+
+    def prometheus_text(self):
+        """Prometheus 텍스트 형식 (타이머는 summary 로 내보냄)"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = _metric_name(name) + "_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, value in sorted(snapshot["gauges"].items()):
+            if isinstance(value, bool):
+                value = int(value)
+            if not isinstance(value, (int, float)):
+                continue
+            metric = _metric_name(name)
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+        for name, summary in sorted(snapshot["timers"].items()):
+            metric = _metric_name(name) + "_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                if key in summary:
+                    lines.append(f'{metric}{{quantile="{quantile}"}} {summary[key] / 1000.0:.6f}')
+            lines.append(f"{metric}_sum {summary['sum_s']:.6f}")
+            lines.append(f"{metric}_count {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+    def format_overlay(self, stages=None):
+        """화면 오버레이용 짧은 문자열"""
+        snapshot = self.snapshot()
+        lines = []
+        timers = snapshot["timers"]
+        for name in stages or sorted(timers):
+            summary = timers.get(name)
+            if summary and "p50_ms" in summary:
+                lines.append(f"{name:<18} p50 {summary['p50_ms']:7.2f}  p95 {summary['p95_ms']:7.2f} ms")
+        rates = snapshot["rates_per_s"]
+        for name in sorted(snapshot["counters"]):
+            lines.append(f"{name:<18} {snapshot['counters'][name]:>8}  ({rates[name]:.1f}/s)")
+        for name, value in sorted(snapshot["gauges"].items()):
+            lines.append(f"{name:<18} {value}")
+        return "\n".join(lines)
+
+
+def _metric_name(name):
+    return f"{METRIC_PREFIX}_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+class MetricsHTTPServer:
+    """로컬에서 /metrics (Prometheus 텍스트) 와 /metrics.json 을 제공하는 HTTP 서버"""
+
+    def __init__(self, metrics, host="127.0.0.1", port=9108):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body = json.dumps(metrics.snapshot(), ensure_ascii=False).encode("utf-8")
+                    content_type = "application/json; charset=utf-8"
+                elif self.path.startswith("/metrics"):
+                    body = metrics.prometheus_text().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # 요청마다 콘솔에 출력하지 않음
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class JsonMetricsLogger(threading.Thread):
+    """interval 초마다 지표 스냅샷을 JSON 한 줄로 파일에 추가하는 스레드"""
+
+    def __init__(self, metrics, path, interval=60.0):
+        super().__init__(daemon=True)
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def write(self):
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.metrics.snapshot(), ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"지표 기록 중 오류 발생: {str(e)}")
+
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(5.0)
+        self.write()
+
+
+# 프로그램 전체에서 공유하는 기본 계측기 (기본값은 꺼짐)
+METRICS = Metrics()
+
+
+def start_exporters(metrics=None, port=None, log_path=None, log_interval=60.0, host="127.0.0.1"):
+    """요청된 내보내기를 시작하고 (시작된 객체 목록) 반환 (하나라도 있으면 계측을 켬)"""
+    metrics = metrics or METRICS
+    exporters = []
+    if port:
+        try:
+            exporters.append(MetricsHTTPServer(metrics, host, int(port)).start())
+            print(f"지표 엔드포인트: http://{host}:{port}/metrics")
+        except OSError as e:
+            print(f"지표 서버 시작 실패: {str(e)}")
+    if log_path:
+        logger = JsonMetricsLogger(metrics, log_path, log_interval)
+        logger.start()
+        exporters.append(logger)
+    if exporters:
+        metrics.set_enabled(True)
+    return exporters
+
+
+def start_exporters_from_env(metrics=None):
+    """환경 변수로 계측 설정
+
+    FACE_ATTENDANCE_METRICS=1                켜기
+    FACE_ATTENDANCE_METRICS_PORT=9108        Prometheus 엔드포인트
+    FACE_ATTENDANCE_METRICS_LOG=metrics.jsonl  JSON 로그 파일
+    FACE_ATTENDANCE_METRICS_INTERVAL=60      JSON 로그 간격(초)
+    """
+    metrics = metrics or METRICS
+    if os.environ.get("FACE_ATTENDANCE_METRICS", "").lower() in ("1", "true", "yes", "on"):
+        metrics.set_enabled(True)
+    return start_exporters(
+        metrics,
+        port=os.environ.get("FACE_ATTENDANCE_METRICS_PORT"),
+        log_path=os.environ.get("FACE_ATTENDANCE_METRICS_LOG"),
+        log_interval=float(os.environ.get("FACE_ATTENDANCE_METRICS_INTERVAL", "60")),
+    )
+
+
+def stop_exporters(exporters):
+    for exporter in exporters:
+        exporter.stop()
@@ -0,0 +1,112 @@
+import cv2
+import numpy as np
+
+
+class MotionResult:
+    """움직임 검사 결과 (activity: 움직인 픽셀 비율, rois: 원본 좌표의 (top, right, bottom, left) 목록)"""
+
+    def __init__(self, moving, activity, rois):
+        self.moving = moving
+        self.activity = activity
+        self.rois = rois
+
+
+class MotionGate:
+    """얼굴 검출 전에 움직임이 있는 프레임과 영역만 골라내는 가벼운 게이트
+
+    프레임을 width 폭으로 줄인 회색조 영상에서 이전 프레임과의 차이("diff") 또는
+    MOG2 배경 차분("mog2")으로 움직임 마스크를 만들고, 움직인 영역의 박스를
+    원본 프레임 좌표로 돌려줍니다.
+    """
+
+    def __init__(self, method="diff", width=160, threshold=15, min_area=0.002,
+                 padding=0.5, merge_ratio=0.5):
+        if method not in ("diff", "mog2"):
+            raise ValueError(f"알 수 없는 움직임 감지 방식: {method}")
+        self.method = method
+        self.width = width
+        self.threshold = threshold
+        self.min_area = min_area        # 움직임으로 인정할 최소 면적 (작은 프레임 대비 비율)
+        self.padding = padding          # 얼굴 전체가 들어가도록 영역을 넓히는 비율
+        self.merge_ratio = merge_ratio  # 영역 합이 이 비율을 넘으면 프레임 전체를 사용
+        self._previous = None
+        self._subtractor = None
+        self._kernel = np.ones((3, 3), np.uint8)
+
+    def reset(self):
+        self._previous = None
+        self._subtractor = None
+
+    def _mask(self, gray):
+        if self.method == "mog2":
+            if self._subtractor is None:
+                self._subtractor = cv2.createBackgroundSubtractorMOG2(
+                    history=500, varThreshold=16, detectShadows=False)
+            return self._subtractor.apply(gray)
+
+        if self._previous is None or self._previous.shape != gray.shape:
+            self._previous = gray
+            return None
+        diff = cv2.absdiff(gray, self._previous)
+        self._previous = gray
+        _, mask = cv2.threshold(diff, self.threshold, 255, cv2.THRESH_BINARY)
+        return mask
+
+    def update(self, frame):
+        """프레임의 움직임을 검사 (첫 프레임은 전체를 움직임으로 간주)"""
+        height, width = frame.shape[:2]
+        ratio = width / float(self.width)
+        small = cv2.resize(frame, (self.width, max(1, int(height / ratio))), interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+
+        mask = self._mask(gray)
+        if mask is None:
+            return MotionResult(True, 1.0, [(0, width, height, 0)])
+
+        mask = cv2.dilate(mask, self._kernel, iterations=2)
+        activity = float(np.count_nonzero(mask)) / mask.size
+        if activity < self.min_area:
+            return MotionResult(False, activity, [])
+
+        min_pixels = self.min_area * mask.size
+        rois = []
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for contour in contours:
+            if cv2.contourArea(contour) < min_pixels:
+                continue
+            x, y, w, h = cv2.boundingRect(contour)
+            pad_x, pad_y = int(w * self.padding) + 1, int(h * self.padding) + 1
+            rois.append((
+                max(0, int((y - pad_y) * ratio)),
+                min(width, int((x + w + pad_x) * ratio)),
+                min(height, int((y + h + pad_y) * ratio)),
+                max(0, int((x - pad_x) * ratio)),
+            ))
+        if not rois:
+            return MotionResult(False, activity, [])
+
+        rois = merge_regions(rois)
+        covered = sum((bottom - top) * (right - left) for top, right, bottom, left in rois)
+        if covered > self.merge_ratio * width * height:
+            rois = [(0, width, height, 0)]
+        return MotionResult(True, activity, rois)
+
+
+def merge_regions(regions):
+    """겹치는 (top, right, bottom, left) 영역을 하나로 합침"""
+    regions = list(regions)
+    merged = True
+    while merged:
+        merged = False
+        result = []
+        while regions:
+            top, right, bottom, left = regions.pop()
+            for i, (t, r, b, l) in enumerate(result):
+                if left < r and l < right and top < b and t < bottom:
+                    result[i] = (min(top, t), max(right, r), max(bottom, b), min(left, l))
+                    merged = True
+                    break
+            else:
+                result.append((top, right, bottom, left))
+        regions = result
+    return regions
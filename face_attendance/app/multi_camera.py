@@ -0,0 +1,337 @@
+import concurrent.futures
+import datetime
+import os
+import threading
+import time
+
+from batch_encoder import CropBuffer, encode_faces_batched
+from face_tracker import FaceTracker
+from frame_scheduler import AdaptiveScheduler
+from frame_source import FrameReader
+from motion_gate import MotionGate
+from recognition_engine import detect_face_locations, detection_regions, shrink_frame
+
+
+def detect_only(rgb_small_frame, regions, scale):
+    """작업 프로세스에서 축소 프레임의 얼굴 검출만 수행
+
+    인코딩은 추적기가 확인이 필요하다고 판단한 얼굴만, 원본 해상도 조각으로 잘라
+    다시 작업 풀에 넣어 수행합니다. 반환값: (얼굴 위치 목록, [], {"detect": 초})
+    """
+    started = time.perf_counter()
+    face_locations = detect_face_locations(rgb_small_frame, regions, scale)
+    return face_locations, [], {"detect": time.perf_counter() - started}
+
+
+class CameraStats:
+    """카메라 하나의 처리 통계"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.monotonic()
+        self.frames = 0         # 카메라에서 읽은 프레임
+        self.dropped = 0        # 처리 전에 새 프레임으로 덮어쓴 프레임
+        self.skipped = 0        # 움직임/스케줄러 판단으로 건너뛴 프레임
+        self.processed = 0      # 작업 풀에서 인식한 프레임
+        self.faces = 0
+        self.recorded = 0
+        self.errors = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def add_latency(self, latency):
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def as_dict(self):
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        return {
+            "camera": self.name,
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "skipped": self.skipped,
+            "processed": self.processed,
+            "faces": self.faces,
+            "recorded": self.recorded,
+            "errors": self.errors,
+            "capture_fps": round(self.frames / elapsed, 1),
+            "processed_fps": round(self.processed / elapsed, 2),
+            "avg_latency_ms": round(1000 * self.latency_total / self.processed, 1) if self.processed else 0.0,
+            "max_latency_ms": round(1000 * self.latency_max, 1),
+        }
+
+
+class CameraStream:
+    """카메라별 상태 (캡처 스레드, 움직임 게이트, 스케줄러, 추적기, 통계)"""
+
+    def __init__(self, name, source, motion_method="diff", reconnect_delay=2.0, max_reconnects=None):
+        self.name = name
+        self.reader = FrameReader(source, reconnect_delay=reconnect_delay, max_reconnects=max_reconnects)
+        self.motion_gate = MotionGate(method=motion_method)
+        self.scheduler = AdaptiveScheduler()
+        self.tracker = FaceTracker()
+        self.stats = CameraStats(name)
+        self.in_flight = None   # 검출 작업: (future, 제출 시각, 프레임 시각, 배율, 축소 시간, 원본 프레임)
+        self.encoding = None    # 인코딩 작업: (future, 결과 시작 위치, 얼굴 수, 제출 시각, 반영할 정보)
+
+    @property
+    def busy(self):
+        return self.in_flight is not None or self.encoding is not None
+
+    @property
+    def finished(self):
+        return not self.reader.is_alive() and len(self.reader.frame_queue) == 0 and not self.busy
+
+
+class MultiCameraService:
+    """여러 영상 소스를 하나의 인식 작업 풀과 하나의 얼굴 인덱스로 처리하는 서비스
+
+    - 카메라마다 FrameReader 스레드가 최신 프레임 하나만 유지하므로, 처리가 밀리면
+      오래된 프레임은 자동으로 버려집니다.
+    - 검출은 프로세스 풀에서 병렬로 처리하고, 추적기가 확인이 필요하다고 판단한
+      얼굴만 이 프로세스에서 원본 해상도 조각으로 잘라 다시 풀에서 인코딩합니다.
+      dlib 인코더는 여러 작업자에서 나누어 돌고, 이 프로세스는 제출/추적/매칭만 하므로
+      인코딩을 기다리며 다른 카메라의 제출이 밀리지 않습니다. 매칭은 이 프로세스의
+      RecognitionEngine 인덱스 하나에서 수행하므로 갤러리는 한 벌만 메모리에 올라갑니다.
+    - 카메라마다 동시에 하나의 작업(검출 또는 인코딩)만 풀에 넣고 순서를 돌아가며
+      제출하므로 한 카메라가 작업자를 독점하지 않습니다.
+    - 기본적으로 카메라마다 인코딩 작업을 따로 넣어 여러 작업자에 나누고, batch_encode 를
+      켜면 batch_delay 초 동안(또는 얼굴이 batch_size 개 모일 때까지) 다른 카메라의
+      검출을 기다렸다가 최대 batch_size 개씩 묶어 인코딩합니다. 얼굴이 많은 출입구처럼
+      한 화면에 여러 명이 있을 때 인코더 호출 비용이 줄어듭니다.
+    """
+
+    def __init__(self, engine, sources, max_workers=None, motion_method="diff",
+                 reconnect_delay=2.0, max_reconnects=None, stats_interval=30.0,
+                 batch_encode=False, batch_size=32, batch_delay=0.01):
+        self.engine = engine
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.batch_encode = batch_encode
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.crop_buffer = CropBuffer()
+        self.streams = [
+            CameraStream(f"cam{i}", source, motion_method, reconnect_delay, max_reconnects)
+            for i, source in enumerate(sources)
+        ]
+        self.stats_interval = stats_interval
+        self._next_stream = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def stats(self):
+        return [stream.stats.as_dict() for stream in self.streams]
+
+    def print_stats(self):
+        for item in self.stats():
+            print(" ".join(f"{key}={value}" for key, value in item.items()))
+
+    def run(self):
+        names = self.engine.load_known_faces()
+        print(f"등록된 얼굴 {len(names)}명을 불러왔습니다. 카메라 {len(self.streams)}대, 작업자 {self.max_workers}개")
+        for stream in self.streams:
+            stream.reader.start()
+
+        last_stats = time.monotonic()
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                while not self._stop_event.is_set():
+                    submitted = self._submit_round(executor)
+                    completed = self._collect_results(executor)
+                    if all(stream.finished for stream in self.streams):
+                        break
+                    if not submitted and not completed:
+                        time.sleep(0.005)
+                    if self.stats_interval and time.monotonic() - last_stats >= self.stats_interval:
+                        self.print_stats()
+                        last_stats = time.monotonic()
+                # 종료 시 진행 중인 작업 결과까지 반영
+                self._collect_results(executor, wait=True)
+        finally:
+            for stream in self.streams:
+                stream.reader.stop()
+            for stream in self.streams:
+                stream.stats.frames = stream.reader.frames_read
+                stream.stats.dropped = stream.reader.frame_queue.dropped
+        self.print_stats()
+
+    def _in_flight_count(self):
+        return sum(1 for stream in self.streams if stream.busy)
+
+    def _submit_round(self, executor):
+        """카메라를 순서대로 돌며 작업이 없는 카메라의 최신 프레임을 제출"""
+        submitted = 0
+        count = len(self.streams)
+        for offset in range(count):
+            if self._in_flight_count() >= self.max_workers:
+                break
+            stream = self.streams[(self._next_stream + offset) % count]
+            if stream.busy:
+                continue
+            item = stream.reader.frame_queue.get_nowait()
+            if item is None:
+                continue
+            frame, timestamp = item
+            stream.stats.frames = stream.reader.frames_read
+            stream.stats.dropped = stream.reader.frame_queue.dropped
+
+            motion = stream.motion_gate.update(frame)
+            if not stream.scheduler.should_process(stream.reader.frames_read, motion, timestamp):
+                stream.stats.skipped += 1
+                continue
+
+            scale = stream.scheduler.scale
+            started = time.perf_counter()
+            height, width = frame.shape[:2]
+            rgb_small_frame = shrink_frame(frame, scale)
+            regions = detection_regions(motion.rois, stream.tracker.tracks, timestamp, width, height)
+            resize_time = time.perf_counter() - started
+            # 원본 프레임 대신 축소 프레임만 작업 프로세스로 전달 (원본은 인코딩용으로 보관)
+            future = executor.submit(detect_only, rgb_small_frame, regions, scale)
+            stream.in_flight = (future, time.perf_counter(), timestamp, scale, resize_time, frame)
+            submitted += 1
+        # 다음 라운드는 다음 카메라부터 시작
+        self._next_stream = (self._next_stream + 1) % max(count, 1)
+        return submitted
+
+    def _collect_results(self, executor, wait=False):
+        """끝난 검출 결과로 인코딩 작업을 넣고, 끝난 인코딩 결과를 카메라별로 반영"""
+        completed = self._collect_detections(executor, wait)
+        return completed + self._collect_encodings(wait)
+
+    def _collect_detections(self, executor, wait=False):
+        """검출이 끝난 카메라의 추적기를 갱신하고 새 얼굴의 원본 해상도 조각을 인코딩 작업으로 제출
+
+        batch_encode 를 켜면 첫 결과가 나온 뒤 batch_delay 초까지는 다른 카메라의 검출을
+        기다려 묶음을 키우고, 모인 얼굴이 batch_size 개를 넘으면 바로 제출합니다.
+        """
+        pending_streams = [stream for stream in self.streams if stream.in_flight is not None]
+        if not pending_streams:
+            return 0
+        futures = [stream.in_flight[0] for stream in pending_streams]
+        if wait:
+            concurrent.futures.wait(futures)
+        elif not any(future.done() for future in futures):
+            return 0
+        elif self.batch_encode:
+            deadline = time.perf_counter() + self.batch_delay
+            while True:
+                remaining = [future for future in futures if not future.done()]
+                if not remaining or self._ready_faces(pending_streams) >= self.batch_size:
+                    break
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                concurrent.futures.wait(remaining, timeout=timeout,
+                                        return_when=concurrent.futures.FIRST_COMPLETED)
+
+        # 1단계: 끝난 검출 결과로 추적기를 갱신하고 인코딩이 필요한 얼굴만 원본 프레임에서 자름
+        ready = []
+        completed = 0
+        for stream in pending_streams:
+            future, submitted_at, timestamp, scale, resize_time, frame = stream.in_flight
+            if not future.done():
+                continue
+            stream.in_flight = None
+            try:
+                face_locations, _, stage_latency = future.result()
+            except Exception as e:
+                stream.stats.errors += 1
+                print(f"[{stream.name}] 프레임 처리 중 오류 발생: {str(e)}")
+                continue
+            stage_latency["resize"] = resize_time
+            boxes, pending = self._track(stream, timestamp, scale, face_locations)
+            context = (submitted_at, timestamp, resize_time, face_locations, boxes, pending, stage_latency)
+            if not pending:
+                # 새 얼굴이 없으면 인코딩 없이 바로 반영
+                stage_latency["encode"] = 0.0
+                self._complete(stream, context, [])
+                completed += 1
+                continue
+            crops = []
+            for _, index in pending:
+                rgb, local = self.crop_buffer.crop(frame, boxes[index])
+                # 조각 버퍼는 다음 crop() 에서 덮어쓰이므로 작업 프로세스로 보낼 사본을 만듦
+                crops.append((rgb.copy(), [local]))
+            ready.append((stream, context, crops))
+
+        # 2단계: 조각을 작업 풀에 넣어 인코딩 (기본은 카메라별 작업, batch_encode 면 batch_size 개씩 묶음)
+        groups = []
+        for item in ready:
+            if groups and self.batch_encode and sum(len(crops) for _, _, crops in groups[-1]) < self.batch_size:
+                groups[-1].append(item)
+            else:
+                groups.append([item])
+        for group in groups:
+            crops = [crop for _, _, item_crops in group for crop in item_crops]
+            future = executor.submit(encode_faces_batched, crops)
+            started = time.perf_counter()
+            offset = 0
+            for stream, context, item_crops in group:
+                stream.encoding = (future, offset, len(item_crops), started, context)
+                offset += len(item_crops)
+            self.engine.metrics.set_gauge("encode_batch_faces", len(crops))
+        return completed
+
+    def _collect_encodings(self, wait=False):
+        """끝난 인코딩 작업의 결과를 각 카메라의 추적기에 돌려주고 출석 기록"""
+        encoding_streams = [stream for stream in self.streams if stream.encoding is not None]
+        if wait and encoding_streams:
+            concurrent.futures.wait([stream.encoding[0] for stream in encoding_streams])
+        completed = 0
+        for stream in encoding_streams:
+            future, offset, count, started, context = stream.encoding
+            if not future.done():
+                continue
+            stream.encoding = None
+            completed += 1
+            try:
+                # 조각마다 얼굴 하나씩이므로 조각별 인코딩 목록의 첫 항목이 그 얼굴의 인코딩
+                encodings = [face_encodings[0] for face_encodings in future.result()[offset:offset + count]]
+            except Exception as e:
+                stream.stats.errors += 1
+                print(f"[{stream.name}] 얼굴 인코딩 중 오류 발생: {str(e)}")
+                continue
+            context[-1]["encode"] = time.perf_counter() - started
+            self._complete(stream, context, encodings)
+        return completed
+
+    def _complete(self, stream, context, encodings):
+        """검출 단계에서 넘겨받은 정보와 인코딩으로 매칭/출석 기록 후 통계 갱신"""
+        submitted_at, timestamp, resize_time, face_locations, boxes, pending, stage_latency = context
+        self._finish(stream, timestamp, boxes, pending, encodings, stage_latency)
+        stream.stats.processed += 1
+        stream.stats.faces += len(face_locations)
+        stream.stats.add_latency(time.perf_counter() - submitted_at + resize_time)
+
+    def _ready_faces(self, streams):
+        """검출이 끝난 작업들의 얼굴 수 (묶음 크기 판단용)"""
+        count = 0
+        for stream in streams:
+            future = stream.in_flight[0]
+            if future.done() and future.exception() is None:
+                count += len(future.result()[0])
+        return count
+
+    def _track(self, stream, timestamp, scale, face_locations):
+        """검출 결과를 원본 좌표로 바꿔 추적기를 갱신하고 (박스 목록, 확인이 필요한 얼굴) 반환"""
+        boxes = [(top*scale, right*scale, bottom*scale, left*scale)
+                 for (top, right, bottom, left) in face_locations]
+        return boxes, stream.tracker.update(boxes, timestamp)
+
+    def _finish(self, stream, timestamp, boxes, pending, encodings, stage_latency):
+        """확인이 필요한 얼굴만 공유 인덱스에서 매칭하고 출석 기록"""
+        started = time.perf_counter()
+        if pending:
+            self.engine.identify(stream.tracker, pending, encodings, timestamp)
+        stage_latency["match"] = time.perf_counter() - started
+        stream.scheduler.record(stage_latency, boxes)
+        self.engine.observe_stages(stage_latency, len(boxes))
+
+        now = datetime.datetime.now()
+        for name in self.engine.arrivals(stream.tracker.tracks, timestamp, stream.name):
+            if self.engine.record_attendance(name, now):
+                stream.stats.recorded += 1
+                print(f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] [{stream.name}] {name} 출석")
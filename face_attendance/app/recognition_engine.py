@@ -0,0 +1,271 @@
+import datetime
+import os
+import threading
+import time
+
+import cv2
+import face_recognition
+
+from batch_encoder import CropBuffer, encode_face_crops, encode_faces_batched
+from face_cache import FaceEncodingCache
+from ann_index import create_face_index
+from identity_gallery import IdentityGallery, IdentityManifest
+from recognition_events import RecognitionEvents
+from face_tracker import FaceTracker
+from frame_scheduler import AdaptiveScheduler
+from motion_gate import merge_regions
+from attendance_store import AttendanceStore
+from attendance_writer import AttendanceWriter
+from metrics import METRICS
+
+
+def detect_face_locations(rgb_small_frame, regions, scale):
+    """축소 프레임에서 얼굴 위치 검출 (regions 가 있으면 해당 영역에서만 HOG 실행)"""
+    if not regions:
+        return face_recognition.face_locations(rgb_small_frame, model="hog")  # CPU 최적화
+
+    face_locations = []
+    for (top, right, bottom, left) in regions:
+        top, right, bottom, left = top//scale, -(-right//scale), -(-bottom//scale), left//scale
+        if bottom - top < 20 or right - left < 20:
+            continue
+        crop = rgb_small_frame[top:bottom, left:right]
+        for (t, r, b, l) in face_recognition.face_locations(crop, model="hog"):
+            face_locations.append((t + top, r + left, b + top, l + left))
+    return face_locations
+
+
+def detection_regions(motion_regions, tracks, timestamp, width, height):
+    """검출 영역: 움직임 영역 + 추적 중인 얼굴 주변 (합이 프레임 절반을 넘으면 [] = 프레임 전체)"""
+    regions = list(motion_regions)
+    for track in tracks:
+        top, right, bottom, left = track.predict_box(timestamp)
+        margin = (bottom - top) // 2
+        regions.append((max(0, top - margin), min(width, right + margin),
+                        min(height, bottom + margin), max(0, left - margin)))
+    regions = merge_regions(regions)
+    if sum((b - t) * (r - l) for t, r, b, l in regions) > 0.5 * width * height:
+        regions = []
+    return regions
+
+
+def shrink_frame(frame, scale):
+    """BGR 프레임을 1/scale 로 줄여 RGB 로 변환"""
+    height, width = frame.shape[:2]
+    small_frame = cv2.resize(frame, (width//scale, height//scale))
+    return cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+
+
+class RecognitionEngine:
+    """PyQt 없이 동작하는 얼굴 인식 + 출석 기록 엔진
+
+    얼굴 로딩(인코딩 캐시 → 인덱스), 프레임 단위 검출/추적/매칭, 출석 기록을
+    담당합니다. GUI(AttendanceTab)와 헤드리스 서비스(recognition_service.py)가
+    같은 엔진을 사용합니다.
+    """
+
+    def __init__(self, faces_dir="faces", face_cache=None, index_backend="ivf",
+                 db_path="attendance.db", attendance_dir=".", tolerance=0.6, durability="batch",
+                 metrics=None, native_crops=True, event_options=None):
+        self.faces_dir = faces_dir
+        self.metrics = metrics or METRICS
+        self.tolerance = tolerance
+        self.face_cache = face_cache or FaceEncodingCache(faces_dir)
+        # 사진 파일을 사람 단위로 묶어 중심점 + 대표 표본만 인덱스에 넣음
+        # (어느 파일이 누구의 사진인지는 faces/identities.json 에 명시적으로 기록)
+        self.identities = IdentityManifest(faces_dir)
+        self.gallery = IdentityGallery(self.identities)
+        # 등록 인원이 많아지면 (2만 명 이상) 자동으로 IVF 근사 검색 사용
+        self.face_index = create_face_index(index_backend)
+        self.face_tracker = FaceTracker()
+        self.scheduler = AdaptiveScheduler()
+        # 검출은 축소 프레임에서, 인코딩은 원본 해상도의 얼굴 조각에서 수행
+        self.native_crops = native_crops
+        self.crop_buffer = CropBuffer()
+        # 프레임별 인식 결과를 투표/디바운스/쿨다운을 거친 도착 이벤트로 변환
+        self.events = RecognitionEvents(**(event_options or {}))
+
+        # 출석 기록 저장소와 기록기 (이벤트를 모아 별도 스레드에서 배치로 저장)
+        self.attendance_store = AttendanceStore(db_path, durability=durability)
+        self.attendance_writer = AttendanceWriter(self.attendance_store, attendance_dir,
+                                                  durability=durability)
+        self.attendance_writer.start()
+
+        # 날짜별 출석 처리된 이름
+        self._present = {}
+        self._lock = threading.Lock()
+
+    def load_known_faces(self):
+        """인코딩 캐시에서 로드하여 인덱스를 다시 만들고 등록된 전체 이름 목록을 반환"""
+        try:
+            names, paths, encodings = self.face_cache.refresh()
+        except Exception as e:
+            print(f"얼굴 로딩 중 오류 발생: {str(e)}")
+            paths, encodings = [], []
+
+        self.identities.reload()
+        self.face_index.build(*self.gallery.build(paths, encodings))
+        return self.enrolled_names()
+
+    def enrolled_names(self):
+        """인코딩 성공 여부와 관계없이 사진이 등록된 모든 사람 이름"""
+        return sorted(set(self.identities.identity(path)
+                          for path in self.face_cache.enrolled_paths()))
+
+    def _reindex(self, names):
+        """대표 인코딩이 바뀐 사람만 인덱스에서 교체"""
+        self.face_index.remove(names)
+        self.face_index.add(*self.gallery.prototypes(names))
+
+    def add_known_faces(self, paths, executor=None):
+        """새로 등록된 얼굴 파일만 인코딩하여 해당 사람의 대표 인코딩을 갱신하고 이름 목록을 반환
+
+        executor 를 주면 인코딩은 그 작업자(프로세스 풀 등)에서 수행합니다.
+        """
+        # 등록 화면이 기록한 사람 이름을 변경 묶음마다 한 번만 다시 읽음
+        self.identities.reload()
+        # 캐시는 인코딩된 파일의 경로를 그대로 돌려줌 (얼굴이 없는 파일은 빠짐)
+        encoded_paths, encodings = self.face_cache.add_files(paths, executor=executor)
+        if encoded_paths:
+            self._reindex(self.gallery.add(encoded_paths, encodings))
+        return sorted(set(self.identities.identity(path) for path in paths))
+
+    def remove_known_faces(self, paths):
+        """삭제된 얼굴 파일을 캐시와 인덱스에서 제거하고, 사진이 모두 지워진 이름 목록을 반환
+
+        비용은 지운 파일 수에 비례합니다 (남은 사진 여부는 갤러리의 사람별 표본으로 판단).
+        """
+        self.identities.reload()
+        # 기록을 지우기 전에 삭제된 파일이 누구의 사진이었는지 확인
+        candidates = set(self.gallery.identity_of(path) for path in paths)
+        self.face_cache.remove_files(paths)
+        self._reindex(self.gallery.remove(paths))
+        self.identities.forget(paths)
+        return sorted(name for name in candidates if name not in self.gallery)
+
+    def identity_image(self, name):
+        """출석 화면에 보여줄 대표 사진 경로 (name.jpg 가 있으면 우선, 없으면 None)"""
+        primary = os.path.join(self.faces_dir, f"{name}.jpg")
+        if os.path.exists(primary):
+            return primary
+        for path in self.gallery.sample_paths(name):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def reset_session(self):
+        """새 영상 세션 시작 (추적 상태와 스케줄러 초기화)"""
+        self.face_tracker.reset()
+        self.events.reset()
+        self.scheduler = AdaptiveScheduler()
+        return self.scheduler
+
+    def detect_faces(self, rgb_small_frame, regions, scale):
+        return detect_face_locations(rgb_small_frame, regions, scale)
+
+    def recognize_faces(self, frame, timestamp, motion_regions):
+        """프레임에서 얼굴을 찾아 추적 중인 트랙 목록을 반환
+
+        HOG 검출은 움직임이 있는 영역과 추적 중인 얼굴 주변에서만 수행하고,
+        인코딩과 매칭은 새로 나타난 트랙이나 신원 확인이 오래된 트랙에만 수행합니다.
+        """
+        # 검출 배율은 스케줄러가 부하와 얼굴 크기에 따라 결정
+        scale = self.scheduler.scale
+        stage_latency = {}
+        started = time.perf_counter()
+        height, width = frame.shape[:2]
+        rgb_small_frame = shrink_frame(frame, scale)
+        stage_latency["resize"] = time.perf_counter() - started
+
+        # 검출 영역: 움직임 영역 + 추적 중인 얼굴 주변 (둘 다 없으면 프레임 전체)
+        regions = detection_regions(motion_regions, self.face_tracker.tracks, timestamp, width, height)
+
+        # 얼굴 인식 처리
+        started = time.perf_counter()
+        face_locations = self.detect_faces(rgb_small_frame, regions, scale)
+        stage_latency["detect"] = time.perf_counter() - started
+
+        # 원본 프레임 좌표로 변환하여 추적기 갱신
+        boxes = [(top*scale, right*scale, bottom*scale, left*scale)
+                 for (top, right, bottom, left) in face_locations]
+        pending = self.face_tracker.update(boxes, timestamp)
+
+        if pending:
+            started = time.perf_counter()
+            # 프레임의 새 얼굴을 한 번의 인코더 호출로 처리
+            if self.native_crops:
+                face_encodings = encode_face_crops(
+                    [(frame, [boxes[index] for _, index in pending])], self.crop_buffer)[0]
+            else:
+                face_encodings = encode_faces_batched(
+                    [(rgb_small_frame, [face_locations[index] for _, index in pending])])[0]
+            stage_latency["encode"] = time.perf_counter() - started
+
+            # 확인이 필요한 얼굴만 한 번의 행렬 연산으로 매칭
+            started = time.perf_counter()
+            self.identify(self.face_tracker, pending, face_encodings, timestamp)
+            stage_latency["match"] = time.perf_counter() - started
+        else:
+            stage_latency["encode"] = 0.0
+            stage_latency["match"] = 0.0
+
+        self.scheduler.record(stage_latency, boxes)
+        self.observe_stages(stage_latency, len(boxes))
+        self.metrics.set_gauge("tracks", len(self.face_tracker.tracks))
+        return self.face_tracker.snapshot()
+
+    def observe_stages(self, stage_latency, face_count):
+        """한 번의 인식 처리에 대한 단계별 시간과 얼굴 수를 계측기에 기록"""
+        if not self.metrics.enabled:
+            return
+        for stage, seconds in stage_latency.items():
+            self.metrics.observe(f"stage_{stage}", seconds)
+        self.metrics.inc("recognitions")
+        self.metrics.inc("faces_detected", face_count)
+
+    def identify(self, tracker, pending, encodings, timestamp):
+        """추적기의 (트랙, 검출 번호) 목록을 인코딩으로 매칭하여 신원 설정"""
+        matches = self.face_index.match(encodings, k=1)
+        self.metrics.inc("faces_encoded", len(pending))
+        for (track, _), candidates in zip(pending, matches):
+            if candidates and candidates[0][1] < self.tolerance:
+                tracker.set_identity(track, candidates[0][0], candidates[0][1], timestamp)
+                self.metrics.inc("faces_identified")
+            else:
+                tracker.set_identity(track, None, None, timestamp)
+                self.metrics.inc("faces_unknown")
+
+    def arrivals(self, tracks, timestamp, source=None):
+        """이번 처리 결과에서 도착 이벤트가 발생한 이름 목록 (source 는 카메라 구분용)"""
+        names = self.events.update(tracks, timestamp, source)
+        if names:
+            self.metrics.inc("arrival_events", len(names))
+        return names
+
+    def is_present(self, name, date=None):
+        """해당 날짜(기본: 오늘)에 이미 출석 처리되었는지 확인"""
+        date = date or datetime.date.today()
+        with self._lock:
+            return name in self._present.get(date, ())
+
+    def record_attendance(self, name, timestamp=None, status="출석"):
+        """timestamp 날짜에 처음 확인된 이름이면 기록기에 출석 이벤트를 넣고 True 반환"""
+        timestamp = timestamp or datetime.datetime.now()
+        with self._lock:
+            present = self._present.setdefault(timestamp.date(), set())
+            if name in present:
+                return False
+            present.add(name)
+        self.attendance_writer.submit(name, timestamp, status)
+        self.metrics.inc("attendance_recorded")
+        return True
+
+    def export_csv(self, filename, start_date, end_date=None):
+        """대기 중인 기록을 반영한 뒤 저장소에서 기간 내 기록을 CSV 로 내보냄"""
+        self.attendance_writer.flush()
+        return self.attendance_store.export_csv(filename, start_date, end_date)
+
+    def close(self):
+        """남은 출석 기록을 모두 저장하고 저장소를 닫음"""
+        self.attendance_writer.close()
+        self.attendance_store.close()
@@ -0,0 +1,75 @@
+import collections
+import threading
+
+
+class TrackVotes:
+    """트랙 하나에 대해 같은 이름이 확인된 시각 목록"""
+
+    def __init__(self, name, timestamp):
+        self.name = name
+        self.since = timestamp      # 이 이름이 붙은 시각 (이름이 바뀌면 다시 시작)
+        self.votes = collections.deque()
+        self.fired = False
+
+
+class RecognitionEvents:
+    """프레임마다 나오는 인식 결과를 사람이 '도착'한 이벤트로 줄여 주는 필터
+
+    - 투표: 같은 트랙이 vote_window 초 안에 min_votes 번 이상 같은 이름으로 검출되어야 함
+    - 디바운스: 트랙에 그 이름이 붙은 뒤 debounce 초가 지나야 함 (이름이 바뀌면 처음부터)
+    - 쿨다운: 한 사람에 대한 이벤트는 cooldown 초에 한 번만 (다른 카메라/새 트랙 포함)
+
+    이벤트가 한 번 발생한 트랙은 화면에서 사라질 때까지 다시 발생하지 않으므로,
+    알림/애니메이션/기록 작업은 프레임 수가 아니라 실제 도착 횟수에 비례합니다.
+    """
+
+    def __init__(self, min_votes=3, vote_window=3.0, debounce=0.5, cooldown=300.0):
+        self.min_votes = min_votes
+        self.vote_window = vote_window
+        self.debounce = debounce
+        self.cooldown = cooldown
+        self._tracks = {}       # (소스, 트랙 번호) -> TrackVotes
+        self._last_fired = {}   # 이름 -> 마지막 이벤트 시각
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._tracks.clear()
+            self._last_fired.clear()
+
+    def update(self, tracks, timestamp, source=None):
+        """이번 처리 결과의 트랙 목록을 반영하고 새로 도착한 이름 목록을 반환"""
+        arrivals = []
+        with self._lock:
+            seen = set()
+            for track in tracks:
+                key = (source, track.track_id)
+                seen.add(key)
+                # 이번 프레임에서 검출되지 않고 예측으로만 남은 트랙은 투표하지 않음
+                if track.name is None or track.misses:
+                    if track.name is None:
+                        self._tracks.pop(key, None)
+                    continue
+
+                state = self._tracks.get(key)
+                if state is None or state.name != track.name:
+                    state = self._tracks[key] = TrackVotes(track.name, timestamp)
+                state.votes.append(timestamp)
+                while state.votes and timestamp - state.votes[0] > self.vote_window:
+                    state.votes.popleft()
+
+                if state.fired:
+                    continue
+                if len(state.votes) < self.min_votes or timestamp - state.since < self.debounce:
+                    continue
+                state.fired = True
+                last = self._last_fired.get(track.name)
+                if last is not None and timestamp - last < self.cooldown:
+                    continue
+                self._last_fired[track.name] = timestamp
+                arrivals.append(track.name)
+
+            # 사라진 트랙의 상태 정리 (같은 소스만)
+            for key in [key for key in self._tracks if key[0] == source and key not in seen]:
+                del self._tracks[key]
+        return arrivals
@@ -0,0 +1,206 @@
+"""GUI 없이 카메라/동영상/RTSP 스트림에서 얼굴을 인식하여 출석을 기록하는 서비스
+
+사용 예:
+    python recognition_service.py --source 0
+    python recognition_service.py --source rtsp://192.168.0.10/stream --reconnect-delay 5
+    python recognition_service.py --source lecture.mp4 --db lecture.db
+    python recognition_service.py --source 0 --source rtsp://192.168.0.11/stream --workers 6
+    python recognition_service.py --source rtsp://a/stream --source rtsp://b/stream --batch-encode
+"""
+import argparse
+import datetime
+import signal
+import threading
+import time
+
+import cv2
+
+from frame_source import FrameReader, is_live_source, open_capture
+from motion_gate import MotionGate
+from multi_camera import MultiCameraService
+from recognition_engine import RecognitionEngine
+from metrics import METRICS, start_exporters, stop_exporters
+
+
+class RecognitionService:
+    """영상 소스 하나를 RecognitionEngine 으로 처리하는 헤드리스 루프
+
+    실시간 소스(카메라, 스트림)는 FrameReader 스레드가 최신 프레임만 남기고,
+    동영상 파일은 모든 프레임을 순서대로 읽어 영상 내 시각을 사용합니다.
+    """
+
+    def __init__(self, engine, source, motion_method="diff", reconnect_delay=2.0,
+                 max_reconnects=None, max_frames=None):
+        self.engine = engine
+        self.source = source
+        self.motion_gate = MotionGate(method=motion_method)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnects = max_reconnects
+        self.max_frames = max_frames
+        self.frames = 0
+        self.processed = 0
+        self.recorded = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        names = self.engine.load_known_faces()
+        print(f"등록된 얼굴 {len(names)}명을 불러왔습니다.")
+        self.engine.reset_session()
+        if is_live_source(self.source):
+            self._run_live()
+        else:
+            self._run_file()
+        print(f"처리 종료: 프레임 {self.frames}개, 인식 {self.processed}회, 출석 {self.recorded}건")
+
+    def _run_live(self):
+        reader = FrameReader(self.source, reconnect_delay=self.reconnect_delay,
+                             max_reconnects=self.max_reconnects)
+        reader.start()
+        try:
+            while not self._stop_event.is_set() and not self._reached_limit():
+                item = reader.frame_queue.get(timeout=0.5)
+                if item is None:
+                    if not reader.is_alive():
+                        break
+                    continue
+                frame, timestamp = item
+                self._process(frame, timestamp, datetime.datetime.now())
+        finally:
+            reader.stop()
+
+    def _run_file(self):
+        capture = open_capture(self.source)
+        if capture is None:
+            print(f"영상 소스를 열 수 없습니다: {self.source}")
+            return
+        # 영상 파일은 촬영 시각을 알 수 없으므로 처리 시작 시각 + 영상 내 위치로 기록
+        started_at = datetime.datetime.now()
+        try:
+            while not self._stop_event.is_set() and not self._reached_limit():
+                ret, frame = capture.read()
+                if not ret:
+                    break
+                timestamp = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                self._process(frame, timestamp, started_at + datetime.timedelta(seconds=timestamp))
+        finally:
+            capture.release()
+
+    def _reached_limit(self):
+        return self.max_frames is not None and self.frames >= self.max_frames
+
+    def _process(self, frame, timestamp, wall_time):
+        METRICS.inc("frames_captured")
+        with METRICS.timer("stage_motion"):
+            motion = self.motion_gate.update(frame)
+        scheduler = self.engine.scheduler
+        if scheduler.should_process(self.frames, motion, timestamp):
+            try:
+                tracks = self.engine.recognize_faces(frame, timestamp, motion.rois)
+            except Exception as e:
+                print(f"프레임 처리 중 오류 발생: {str(e)}")
+                tracks = []
+            self.processed += 1
+            for name in self.engine.arrivals(tracks, timestamp):
+                if self.engine.record_attendance(name, wall_time):
+                    self.recorded += 1
+                    print(f"[{wall_time.strftime('%Y-%m-%d %H:%M:%S')}] {name} 출석")
+        self.frames += 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="얼굴인식 출석 헤드리스 서비스")
+    parser.add_argument("--source", action="append",
+                        help="카메라 번호, 동영상 파일 경로 또는 RTSP URL (여러 번 지정하면 다중 카메라 모드)")
+    parser.add_argument("--faces-dir", default="faces", help="등록된 얼굴 이미지 디렉토리")
+    parser.add_argument("--db", default="attendance.db", help="출석 기록 SQLite 파일")
+    parser.add_argument("--attendance-dir", default=".", help="일별 CSV 파일을 만들 디렉토리")
+    parser.add_argument("--index", default="ivf", choices=["exact", "ivf", "hnsw"],
+                        help="얼굴 검색 인덱스 종류")
+    parser.add_argument("--tolerance", type=float, default=0.6, help="같은 사람으로 볼 최대 거리")
+    parser.add_argument("--min-votes", type=int, default=3,
+                        help="출석 이벤트 전에 같은 이름으로 검출되어야 하는 처리 횟수")
+    parser.add_argument("--debounce", type=float, default=0.5,
+                        help="이름이 확인된 뒤 이벤트까지 기다리는 시간(초)")
+    parser.add_argument("--cooldown", type=float, default=300.0,
+                        help="같은 사람의 도착 이벤트를 다시 내지 않는 시간(초)")
+    parser.add_argument("--motion", default="diff", choices=["diff", "mog2"], help="움직임 감지 방식")
+    parser.add_argument("--durability", default="batch", choices=["none", "batch", "event"],
+                        help="출석 기록 저장 보장 수준")
+    parser.add_argument("--reconnect-delay", type=float, default=2.0,
+                        help="스트림이 끊겼을 때 다시 연결하기 전 대기 시간(초)")
+    parser.add_argument("--max-reconnects", type=int, default=None,
+                        help="최대 재연결 횟수 (기본: 무제한)")
+    parser.add_argument("--max-frames", type=int, default=None, help="처리할 최대 프레임 수 (단일 소스)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="다중 카메라 모드의 검출/인코딩 공용 작업 프로세스 수 (기본: CPU 수 - 1)")
+    parser.add_argument("--batch-encode", action="store_true",
+                        help="다중 카메라 모드에서 다른 카메라의 검출을 잠시 기다려 얼굴을 더 모아 한 번에 인코딩")
+    parser.add_argument("--batch-size", type=int, default=32, help="한 번에 인코딩할 최대 얼굴 수")
+    parser.add_argument("--batch-delay", type=float, default=10.0,
+                        help="묶음을 채우기 위해 기다리는 최대 시간(ms)")
+    parser.add_argument("--stats-interval", type=float, default=30.0,
+                        help="다중 카메라 모드에서 카메라별 통계를 출력하는 간격(초)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Prometheus 텍스트 지표를 제공할 로컬 포트 (/metrics)")
+    parser.add_argument("--metrics-log", default=None, help="지표 스냅샷을 JSON 줄로 추가할 파일")
+    parser.add_argument("--metrics-interval", type=float, default=60.0, help="JSON 지표 기록 간격(초)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    exporters = start_exporters(METRICS, port=args.metrics_port, log_path=args.metrics_log,
+                                log_interval=args.metrics_interval)
+    engine = RecognitionEngine(
+        faces_dir=args.faces_dir,
+        index_backend=args.index,
+        db_path=args.db,
+        attendance_dir=args.attendance_dir,
+        tolerance=args.tolerance,
+        durability=args.durability,
+        event_options={"min_votes": args.min_votes, "debounce": args.debounce,
+                       "cooldown": args.cooldown},
+    )
+    sources = args.source or ["0"]
+    if len(sources) > 1:
+        service = MultiCameraService(
+            engine, sources,
+            max_workers=args.workers,
+            motion_method=args.motion,
+            reconnect_delay=args.reconnect_delay,
+            max_reconnects=args.max_reconnects,
+            stats_interval=args.stats_interval,
+            batch_encode=args.batch_encode,
+            batch_size=args.batch_size,
+            batch_delay=args.batch_delay / 1000.0,
+        )
+    else:
+        service = RecognitionService(
+            engine, sources[0],
+            motion_method=args.motion,
+            reconnect_delay=args.reconnect_delay,
+            max_reconnects=args.max_reconnects,
+            max_frames=args.max_frames,
+        )
+
+    # Ctrl+C / 서비스 종료 신호를 받으면 남은 기록을 저장하고 종료
+    def handle_signal(signum, frame):
+        service.stop()
+    signal.signal(signal.SIGINT, handle_signal)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, handle_signal)
+
+    started = time.monotonic()
+    try:
+        service.run()
+    finally:
+        engine.close()
+        stop_exporters(exporters)
+    print(f"소요 시간: {time.monotonic() - started:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
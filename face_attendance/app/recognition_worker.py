@@ -0,0 +1,146 @@
+import concurrent.futures
+import os
+import queue
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from metrics import METRICS
+
+
+class CaptureThread(QThread):
+    """카메라에서 프레임을 읽어 미리보기/인식 큐에 넣는 스레드"""
+
+    capture_failed = pyqtSignal()
+
+    def __init__(self, camera, preview_queue, recognition_queue, scheduler, motion_gate,
+                 metrics=None, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics or METRICS
+        self.camera = camera
+        self.preview_queue = preview_queue
+        self.recognition_queue = recognition_queue
+        self.scheduler = scheduler
+        self.motion_gate = motion_gate
+        self.frame_count = 0
+        self._running = False
+
+    def run(self):
+        self._running = True
+        failures = 0
+        while self._running:
+            ret, frame = self.camera.read()
+            if not ret:
+                failures += 1
+                self.metrics.inc("capture_failures")
+                if failures > 100:
+                    self.capture_failed.emit()
+                    break
+                self.msleep(10)
+                continue
+            failures = 0
+
+            timestamp = time.monotonic()
+            self.preview_queue.put(frame)
+            # 움직임 검사 후 인식할 프레임은 스케줄러가 결정 (인식 큐에는 최신 프레임만 유지)
+            with self.metrics.timer("stage_motion"):
+                motion = self.motion_gate.update(frame)
+            if self.scheduler.should_process(self.frame_count, motion, timestamp):
+                self.recognition_queue.put((frame, timestamp, motion.rois))
+                self.metrics.inc("frames_queued")
+            self.frame_count += 1
+            if self.metrics.enabled:
+                self.metrics.inc("frames_captured")
+                self.metrics.set_gauge("preview_dropped", self.preview_queue.dropped)
+                self.metrics.set_gauge("recognition_dropped", self.recognition_queue.dropped)
+                self.metrics.set_gauge("recognition_queue_depth", len(self.recognition_queue))
+
+    def stop(self):
+        self._running = False
+        self.wait()
+
+
+class RecognitionWorker(QThread):
+    """인식 큐의 최신 프레임을 처리하고 결과를 시그널로 전달하는 워커"""
+
+    faces_recognized = pyqtSignal(object)
+
+    def __init__(self, recognition_queue, recognize_fn, metrics=None, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics or METRICS
+        self.recognition_queue = recognition_queue
+        self.recognize_fn = recognize_fn
+        self._running = False
+
+    def run(self):
+        self._running = True
+        while self._running:
+            item = self.recognition_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            frame, timestamp, regions = item
+            try:
+                with self.metrics.timer("stage_recognition"):
+                    results = self.recognize_fn(frame, timestamp, regions)
+            except Exception as e:
+                print(f"프레임 처리 중 오류 발생: {str(e)}")
+                self.metrics.inc("recognition_errors")
+                continue
+            self.faces_recognized.emit(results)
+
+    def stop(self):
+        self._running = False
+        self.wait()
+
+
+class GalleryUpdateWorker(QThread):
+    """faces 디렉토리 변경(추가/삭제/변경)을 인식 엔진에 반영하는 워커
+
+    새 사진의 인코딩은 프로세스 풀에서, 인덱스 갱신은 이 스레드에서 처리하고
+    명단에 반영할 이름 목록만 시그널로 보내므로 GUI 스레드는 dlib 인코딩을
+    기다리지 않습니다. 변경은 들어온 순서대로 하나씩 처리합니다.
+    """
+
+    names_added = pyqtSignal(list)
+    names_removed = pyqtSignal(list)
+
+    def __init__(self, engine, max_workers=None, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self._jobs = queue.Queue()
+        self._executor = None
+
+    def add_faces(self, paths):
+        """추가되었거나 바뀐 사진 경로 목록 (GUI 스레드에서 호출)"""
+        self._jobs.put(("add", list(paths)))
+
+    def remove_faces(self, paths):
+        """삭제된 사진 경로 목록 (GUI 스레드에서 호출)"""
+        self._jobs.put(("remove", list(paths)))
+
+    def run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            action, paths = job
+            try:
+                if action == "add":
+                    # 작업 프로세스는 처음 사진이 추가될 때 한 번만 시작
+                    if self._executor is None:
+                        self._executor = concurrent.futures.ProcessPoolExecutor(self.max_workers)
+                    self.names_added.emit(self.engine.add_known_faces(paths, executor=self._executor))
+                else:
+                    self.names_removed.emit(self.engine.remove_known_faces(paths))
+            except Exception as e:
+                print(f"얼굴 목록 갱신 중 오류 발생: {str(e)}")
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def stop(self):
+        """남은 변경을 모두 처리한 뒤 종료"""
+        self._jobs.put(None)
+        self.wait()
@@ -0,0 +1,116 @@
+import bisect
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+
+
+NameRole = Qt.UserRole + 1
+PresentRole = Qt.UserRole + 2
+
+
+class RosterModel(QAbstractListModel):
+    """등록 인원 명단과 출석 여부를 한 번 로드해 두고 부분적으로만 갱신하는 모델
+
+    출석 처리(mark_present)는 집합에 추가하고 해당 행만 dataChanged 로 알리므로
+    얼굴 폴더를 다시 읽거나 목록 전체를 다시 만들지 않습니다.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names = []      # 이름순 정렬
+        self._rows = {}       # 이름 -> 행
+        self._present = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self._names[index.row()]
+        if role == Qt.DisplayRole:
+            return name if name in self._present else f"⚠ {name}"
+        if role == NameRole:
+            return name
+        if role == PresentRole:
+            return name in self._present
+        return None
+
+    def set_names(self, names):
+        """명단 전체 교체 (출석 상태는 명단에 남아 있는 이름만 유지)"""
+        self.beginResetModel()
+        self._names = sorted(set(names))
+        self._rows = {name: row for row, name in enumerate(self._names)}
+        self._present &= set(self._names)
+        self.endResetModel()
+
+    def _reindex(self, start):
+        for row in range(start, len(self._names)):
+            self._rows[self._names[row]] = row
+
+    def add_names(self, names):
+        names = sorted(set(names) - set(self._rows))
+        if not names:
+            return
+        # 행 번호 표는 삽입이 모두 끝난 뒤 처음 바뀐 행부터 한 번만 다시 계산
+        first = len(self._names)
+        for name in names:
+            row = bisect.bisect_left(self._names, name)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._names.insert(row, name)
+            self.endInsertRows()
+            first = min(first, row)
+        self._reindex(first)
+
+    def remove_names(self, names):
+        rows = sorted((self._rows.pop(name) for name in set(names) if name in self._rows),
+                      reverse=True)
+        if not rows:
+            return
+        # 뒤쪽 행부터 지우면 앞쪽 행 번호는 바뀌지 않음
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self._present.discard(self._names.pop(row))
+            self.endRemoveRows()
+        self._reindex(rows[-1])
+
+    def mark_present(self, name):
+        """출석 처리 (명단에 없거나 이미 출석이면 False)"""
+        row = self._rows.get(name)
+        if row is None or name in self._present:
+            return False
+        self._present.add(name)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, PresentRole])
+        return True
+
+    def is_present(self, name):
+        return name in self._present
+
+    def present_names(self):
+        return set(self._present)
+
+    def absent_count(self):
+        return len(self._names) - len(self._present)
+
+    def reset_attendance(self, present_names=()):
+        """출석 상태 초기화 (새 날짜 시작 등)"""
+        self._present = set(present_names) & set(self._rows)
+        if self._names:
+            self.dataChanged.emit(self.index(0), self.index(len(self._names) - 1),
+                                  [Qt.DisplayRole, PresentRole])
+
+
+class AbsentFilterProxyModel(QSortFilterProxyModel):
+    """미출석자만 보여주고 이름 검색어로 추가 필터링하는 프록시 모델"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setDynamicSortFilter(True)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterRole(NameRole)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        if index.data(PresentRole):
+            return False
+        return super().filterAcceptsRow(source_row, source_parent)
@@ -0,0 +1,133 @@
+import collections
+import os
+import threading
+
+from PIL import Image
+from PyQt5.QtGui import QImage, QPixmap
+
+
+THUMBNAIL_SIZES = (80, 100, 250)
+
+
+def thumbnail_path(image_path, size, thumbs_dir="thumbnails"):
+    """원본 이미지의 size 픽셀 썸네일 경로
+
+    확장자까지 포함한 파일 이름을 키로 쓰므로 kim.jpg 와 kim.png 의 썸네일이 겹치지 않습니다.
+    """
+    return os.path.join(thumbs_dir, str(size), f"{os.path.basename(image_path)}.jpg")
+
+
+def save_thumbnails(image, image_path, thumbs_dir="thumbnails", sizes=THUMBNAIL_SIZES):
+    """이미 디코딩된 PIL 이미지로 크기별 썸네일을 저장 (Qt 없이 작업 프로세스에서도 사용 가능)"""
+    image = image.convert('RGB')
+    paths = []
+    # 큰 크기부터 줄여 나가면 매번 원본을 다시 줄이지 않아도 됨
+    for size in sorted(sizes, reverse=True):
+        image = image.copy()
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        path = thumbnail_path(image_path, size, thumbs_dir)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 같은 디렉토리의 임시 파일에 쓴 뒤 교체하여 읽는 쪽이 반쯤 쓴 파일을 보지 않도록 함
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            image.save(tmp_path, 'JPEG', quality=90)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        paths.append(path)
+    return paths
+
+
+def make_thumbnails(image_path, thumbs_dir="thumbnails", sizes=THUMBNAIL_SIZES):
+    """원본 이미지를 한 번 디코딩하여 크기별 썸네일 생성"""
+    with Image.open(image_path) as image:
+        return save_thumbnails(image, image_path, thumbs_dir, sizes)
+
+
+def remove_thumbnails(image_path, thumbs_dir="thumbnails", sizes=THUMBNAIL_SIZES):
+    for size in sizes:
+        path = thumbnail_path(image_path, size, thumbs_dir)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class ThumbnailCache:
+    """디스크 썸네일을 메모리 한도 안에서 QPixmap 으로 보관하는 LRU 캐시
+
+    썸네일이 없거나 원본보다 오래된 경우에만 다시 만들고, 그 외에는 작은
+    썸네일 파일만 디코딩합니다. pixmap() 은 GUI 스레드에서만 호출해야 합니다.
+    """
+
+    def __init__(self, thumbs_dir="thumbnails", max_bytes=64 * 1024 * 1024):
+        self.thumbs_dir = thumbs_dir
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = collections.OrderedDict()  # (경로, 크기) -> (QPixmap, 바이트 수)
+        self._lock = threading.Lock()
+        self._regenerating = {}  # 원본 경로 -> 썸네일 생성 잠금
+
+    def _is_stale(self, path, image_path):
+        return not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(image_path)
+
+    def rendition(self, image_path, size):
+        """size 썸네일 파일 경로 (없거나 오래되었으면 생성)"""
+        path = thumbnail_path(image_path, size, self.thumbs_dir)
+        if self._is_stale(path, image_path):
+            # 여러 로더가 같은 원본을 요청해도 (예: 80px, 250px) 생성은 한 번만
+            with self._lock:
+                lock = self._regenerating.setdefault(os.path.normpath(image_path), threading.Lock())
+            with lock:
+                if self._is_stale(path, image_path):
+                    make_thumbnails(image_path, self.thumbs_dir)
+        return path
+
+    def image(self, image_path, size):
+        """썸네일 QImage (QImage 는 작업 스레드에서도 안전하게 만들 수 있음)"""
+        return QImage(self.rendition(image_path, size))
+
+    def get(self, image_path, size):
+        """캐시에 있는 QPixmap 반환 (없으면 None)"""
+        key = (os.path.normpath(image_path), size)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, image_path, size, pixmap):
+        """QPixmap 을 캐시에 넣고 한도를 넘으면 오래된 항목부터 제거"""
+        key = (os.path.normpath(image_path), size)
+        cost = pixmap.width() * pixmap.height() * 4
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old[1]
+            self._items[key] = (pixmap, cost)
+            self.used_bytes += cost
+            while self.used_bytes > self.max_bytes and len(self._items) > 1:
+                _, (_, evicted_cost) = self._items.popitem(last=False)
+                self.used_bytes -= evicted_cost
+
+    def pixmap(self, image_path, size):
+        """size 썸네일 QPixmap (캐시 → 디스크 썸네일 → 원본 순으로 확인)"""
+        pixmap = self.get(image_path, size)
+        if pixmap is not None:
+            return pixmap
+        self.misses += 1
+        pixmap = QPixmap(self.rendition(image_path, size))
+        self.put(image_path, size, pixmap)
+        return pixmap
+
+    def invalidate(self, image_path):
+        """원본이 바뀌거나 삭제되었을 때 캐시와 썸네일 파일 제거 (get/put 과 같은 키 사용)"""
+        image_path = os.path.normpath(image_path)
+        with self._lock:
+            for key in [key for key in self._items if key[0] == image_path]:
+                self.used_bytes -= self._items.pop(key)[1]
+            self._regenerating.pop(image_path, None)
+        remove_thumbnails(image_path, self.thumbs_dir)
@@ -0,0 +1,210 @@
+"""녹화된 강의 영상에서 출석을 일괄 처리하는 배치 모드
+
+사용 예:
+    python video_batch.py lecture.mp4 --stride 5
+    python video_batch.py lecture.mp4 --start-time "2026-03-02 09:00:00" --workers 8
+"""
+import argparse
+import collections
+import concurrent.futures
+import datetime
+import os
+import time
+
+import cv2
+
+from batch_encoder import CropBuffer, encode_face_crops
+from face_tracker import FaceTracker
+from multi_camera import detect_only
+from recognition_engine import RecognitionEngine, shrink_frame
+
+
+class VideoBatchProcessor:
+    """동영상 파일을 타이머 없이 최대 속도로 디코딩하여 출석을 기록하는 처리기
+
+    stride 프레임마다 한 장만 retrieve 하여 BGR 프레임으로 변환하고 나머지는 grab 으로
+    넘깁니다 (대부분의 코덱은 grab 에서도 프레임을 디코딩하므로 줄어드는 것은 변환/복사
+    비용입니다). 검출은 프로세스 풀에서 병렬로 수행하고, 결과는 제출 순서대로 추적기에
+    반영하므로 영상 시간 순서가 유지되며, 추적기가 확인이 필요하다고 판단한 얼굴만
+    원본 해상도 조각으로 인코딩합니다. 출석 시각은 start_time + 영상 내 위치로 기록합니다.
+    """
+
+    def __init__(self, engine, video_path, stride=5, scale=4, max_workers=None,
+                 start_time=None, progress_interval=5.0):
+        self.engine = engine
+        self.video_path = video_path
+        self.stride = max(1, stride)
+        self.scale = scale
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.start_time = start_time
+        self.progress_interval = progress_interval
+        # 영상 시간 기준으로 동작하는 추적기
+        self.tracker = FaceTracker()
+        self.crop_buffer = CropBuffer()
+        self.report = {}
+
+    def _recording_start(self, capture):
+        """영상 녹화 시작 시각 (지정하지 않으면 파일 수정 시각 - 영상 길이)"""
+        if self.start_time is not None:
+            return self.start_time
+        fps = capture.get(cv2.CAP_PROP_FPS) or 0
+        frame_total = capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+        duration = frame_total / fps if fps > 0 else 0
+        modified = datetime.datetime.fromtimestamp(os.path.getmtime(self.video_path))
+        return modified - datetime.timedelta(seconds=duration)
+
+    def run(self):
+        capture = cv2.VideoCapture(self.video_path)
+        if not capture.isOpened():
+            raise IOError(f"영상 파일을 열 수 없습니다: {self.video_path}")
+
+        names = self.engine.load_known_faces()
+        recording_start = self._recording_start(capture)
+        frame_total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        print(f"등록된 얼굴 {len(names)}명, 영상 시작 시각 {recording_start.strftime('%Y-%m-%d %H:%M:%S')}, "
+              f"작업자 {self.max_workers}개, {self.stride}프레임마다 처리")
+
+        decoded = sampled = recorded = faces = 0
+        video_seconds = 0.0
+        in_flight = collections.deque()
+        max_in_flight = self.max_workers * 2
+        started = last_progress = time.monotonic()
+
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                frame_index = 0
+                while True:
+                    # 건너뛸 프레임은 grab 만 하여 색 변환/복사 비용을 줄임
+                    if frame_index % self.stride:
+                        if not capture.grab():
+                            break
+                        frame_index += 1
+                        decoded += 1
+                        continue
+                    ret, frame = capture.read()
+                    if not ret:
+                        break
+                    decoded += 1
+                    timestamp = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                    video_seconds = max(video_seconds, timestamp)
+                    # 작업 프로세스에는 축소 프레임만 보내고 원본은 인코딩용으로 보관
+                    in_flight.append((timestamp, frame, executor.submit(
+                        detect_only, shrink_frame(frame, self.scale), [], self.scale)))
+                    sampled += 1
+                    frame_index += 1
+
+                    # 작업이 너무 많이 쌓이면 가장 오래된 결과부터 순서대로 반영
+                    while len(in_flight) >= max_in_flight or (in_flight and in_flight[0][2].done()):
+                        found, added = self._apply(*in_flight.popleft(), recording_start)
+                        faces += found
+                        recorded += added
+
+                    if self.progress_interval and time.monotonic() - last_progress >= self.progress_interval:
+                        last_progress = time.monotonic()
+                        elapsed = last_progress - started
+                        progress = f"{decoded}/{frame_total}" if frame_total else str(decoded)
+                        print(f"진행: {progress} 프레임, {decoded / elapsed:.1f} fps, 출석 {recorded}건")
+
+                while in_flight:
+                    found, added = self._apply(*in_flight.popleft(), recording_start)
+                    faces += found
+                    recorded += added
+        finally:
+            capture.release()
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.report = {
+            "video": self.video_path,
+            "decoded_frames": decoded,
+            "processed_frames": sampled,
+            "faces": faces,
+            "recorded": recorded,
+            "elapsed_s": round(elapsed, 2),
+            "decode_fps": round(decoded / elapsed, 1),
+            "processed_fps": round(sampled / elapsed, 1),
+            "realtime_factor": round(video_seconds / elapsed, 2),
+        }
+        return self.report
+
+    def _apply(self, timestamp, frame, future, recording_start):
+        """검출 결과를 추적기에 반영하고 새로 확인된 이름의 출석을 기록 (얼굴 수, 출석 수 반환)"""
+        try:
+            face_locations, _, _ = future.result()
+        except Exception as e:
+            print(f"프레임 처리 중 오류 발생 ({timestamp:.1f}초): {str(e)}")
+            return 0, 0
+
+        scale = self.scale
+        boxes = [(top*scale, right*scale, bottom*scale, left*scale)
+                 for (top, right, bottom, left) in face_locations]
+        pending = self.tracker.update(boxes, timestamp)
+        if pending:
+            # 확인이 필요한 얼굴만 원본 해상도 조각에서 인코딩
+            face_encodings = encode_face_crops(
+                [(frame, [boxes[index] for _, index in pending])], self.crop_buffer)[0]
+            self.engine.identify(self.tracker, pending, face_encodings, timestamp)
+
+        recorded = 0
+        wall_time = recording_start + datetime.timedelta(seconds=timestamp)
+        for name in self.engine.arrivals(self.tracker.tracks, timestamp):
+            if self.engine.record_attendance(name, wall_time):
+                recorded += 1
+                print(f"[{wall_time.strftime('%Y-%m-%d %H:%M:%S')}] {name} 출석 (영상 {timestamp:.1f}초)")
+        return len(face_locations), recorded
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="녹화 영상 출석 일괄 처리")
+    parser.add_argument("video", help="처리할 동영상 파일")
+    parser.add_argument("--stride", type=int, default=5, help="몇 프레임마다 한 번 인식할지")
+    parser.add_argument("--scale", type=int, default=4, choices=[1, 2, 3, 4, 6],
+                        help="검출 전에 프레임을 줄이는 배율")
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수 - 1)")
+    parser.add_argument("--start-time", default=None,
+                        help="녹화 시작 시각 'YYYY-MM-DD HH:MM:SS' (기본: 파일 수정 시각 - 영상 길이)")
+    parser.add_argument("--faces-dir", default="faces", help="등록된 얼굴 이미지 디렉토리")
+    parser.add_argument("--db", default="attendance.db", help="출석 기록 SQLite 파일")
+    parser.add_argument("--attendance-dir", default=".", help="일별 CSV 파일을 만들 디렉토리")
+    parser.add_argument("--index", default="ivf", choices=["exact", "ivf", "hnsw"],
+                        help="얼굴 검색 인덱스 종류")
+    parser.add_argument("--tolerance", type=float, default=0.6, help="같은 사람으로 볼 최대 거리")
+    parser.add_argument("--min-votes", type=int, default=3,
+                        help="출석 이벤트 전에 같은 이름으로 검출되어야 하는 처리 횟수")
+    parser.add_argument("--debounce", type=float, default=0.5,
+                        help="이름이 확인된 뒤 이벤트까지 기다리는 시간(초)")
+    parser.add_argument("--cooldown", type=float, default=300.0,
+                        help="같은 사람의 도착 이벤트를 다시 내지 않는 시간(초)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    start_time = None
+    if args.start_time:
+        start_time = datetime.datetime.strptime(args.start_time, '%Y-%m-%d %H:%M:%S')
+
+    engine = RecognitionEngine(
+        faces_dir=args.faces_dir,
+        index_backend=args.index,
+        db_path=args.db,
+        attendance_dir=args.attendance_dir,
+        tolerance=args.tolerance,
+        event_options={"min_votes": args.min_votes, "debounce": args.debounce,
+                       "cooldown": args.cooldown},
+    )
+    processor = VideoBatchProcessor(
+        engine, args.video,
+        stride=args.stride,
+        scale=args.scale,
+        max_workers=args.workers,
+        start_time=start_time,
+    )
+    try:
+        report = processor.run()
+    finally:
+        engine.close()
+    print(" ".join(f"{key}={value}" for key, value in report.items()))
+
+
+if __name__ == "__main__":
+    main()
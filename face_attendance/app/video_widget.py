@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QColor, QImage, QPainter, QPen
+from PyQt5.QtWidgets import QWidget
+
+from face_tracker import draw_tracks
+from metrics import METRICS
+
+
+# Qt 5.14 이상이면 BGR 프레임을 색 변환 없이 그대로 표시
+HAS_BGR888 = hasattr(QImage, "Format_BGR888")
+
+
+def fit_size(frame_width, frame_height, max_width, max_height):
+    """비율을 유지하면서 (max_width, max_height) 안에 들어가는 크기"""
+    ratio = min(max_width / float(frame_width), max_height / float(frame_height))
+    return max(1, int(frame_width * ratio)), max(1, int(frame_height * ratio))
+
+
+class FrameBuffer:
+    """표시 크기로 미리 할당한 버퍼에 프레임을 한 번만 줄여 넣고 QImage 로 감싸는 버퍼
+
+    크기가 바뀔 때만 버퍼와 QImage 를 다시 만들고, 그 외에는 매 프레임
+    cv2.resize 가 같은 버퍼에 결과를 덮어쓰므로 프레임마다 메모리를 새로 할당하지 않습니다.
+    """
+
+    def __init__(self, use_bgr888=HAS_BGR888):
+        self.use_bgr888 = use_bgr888
+        self.image = None
+        self._buffer = None
+        self._rgb = None
+
+    def _allocate(self, width, height):
+        self._buffer = np.empty((height, width, 3), dtype=np.uint8)
+        if self.use_bgr888:
+            self._rgb = None
+            target, image_format = self._buffer, QImage.Format_BGR888
+        else:
+            # BGR888 이 없는 Qt 에서는 RGB 버퍼 하나를 유지하며 변환
+            self._rgb = np.empty_like(self._buffer)
+            target, image_format = self._rgb, QImage.Format_RGB888
+        # QImage 는 버퍼 메모리를 복사하지 않고 그대로 참조
+        self.image = QImage(target.data, width, height, target.strides[0], image_format)
+
+    def render(self, frame, tracks, timestamp, max_width, max_height):
+        """프레임을 표시 크기로 줄이고 트랙을 그려 QImage 반환"""
+        frame_height, frame_width = frame.shape[:2]
+        width, height = fit_size(frame_width, frame_height, max_width, max_height)
+        if self._buffer is None or self._buffer.shape[:2] != (height, width):
+            self._allocate(width, height)
+
+        # 미리보기 축소 비율(보통 2배 이하)에서는 INTER_LINEAR 가 INTER_AREA 보다 몇 배 빠름
+        cv2.resize(frame, (width, height), dst=self._buffer, interpolation=cv2.INTER_LINEAR)
+        draw_tracks(self._buffer, tracks, timestamp, scale=width / float(frame_width))
+        if self._rgb is not None:
+            cv2.cvtColor(self._buffer, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self.image
+
+    def clear(self):
+        self.image = None
+        self._buffer = None
+        self._rgb = None
+
+
+class VideoWidget(QWidget):
+    """카메라 미리보기를 QPixmap 없이 미리 할당한 버퍼에서 바로 그리는 위젯"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frame_buffer = FrameBuffer()
+        self._background = QColor("#202020")
+        self._border = QPen(QColor("#cccccc"), 2)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def set_frame(self, frame, tracks, timestamp):
+        """새 프레임을 버퍼에 넣고 다시 그리기를 요청"""
+        with METRICS.timer("stage_annotate"):
+            self.frame_buffer.render(frame, tracks, timestamp, self.width(), self.height())
+        self.update()
+
+    def clear(self):
+        self.frame_buffer.clear()
+        self.update()
+
+    def paintEvent(self, event):
+        with METRICS.timer("stage_render"):
+            painter = QPainter(self)
+            painter.fillRect(self.rect(), self._background)
+            image = self.frame_buffer.image
+            if image is not None:
+                target = QRect(0, 0, image.width(), image.height())
+                target.moveCenter(self.rect().center())
+                painter.drawImage(target.topLeft(), image)
+            painter.setPen(self._border)
+            painter.drawRect(self.rect().adjusted(1, 1, -1, -1))
+            painter.end()
@@ -0,0 +1,407 @@
+"""카메라/GUI 없이 인식 경로의 단계별 지연 시간을 측정하는 벤치마크
+
+측정 단계:
+    resize, color_convert, hog_detect, encode  - 프레임 처리 (검출/인코딩은 face_recognition 필요)
+    match                                      - 합성 128차원 갤러리(기본 1천/1만/10만 명) 검색
+    annotate, qimage                           - 미리보기 축소·박스 그리기와 화면 그리기 (PyQt5 필요)
+
+사용 예:
+    python face_attendance/benchmarks/bench_recognition.py
+    python face_attendance/benchmarks/bench_recognition.py --make-fixtures faces --fixtures bench_fixtures
+    python face_attendance/benchmarks/bench_recognition.py --fixtures bench_fixtures --save-baseline baseline.json
+    python face_attendance/benchmarks/bench_recognition.py --fixtures bench_fixtures --baseline baseline.json
+
+픽스처 폴더 구조 (없으면 합성 프레임만 사용하고 검출/인코딩 단계는 건너뜀):
+    <fixtures>/faces/   프레임 합성에 사용한 얼굴 사진
+    <fixtures>/frames/  카메라 프레임 이미지 (검출/인코딩 단계 측정용)
+
+--make-fixtures 는 얼굴 사진 폴더와 --seed 로 같은 프레임을 항상 똑같이 합성하므로,
+기준 측정과 비교 측정을 다른 컴퓨터에서 해도 같은 입력을 쓸 수 있습니다. 결과에는
+픽스처 파일의 해시가 기록되어 기준과 입력이 다르면 비교 시 경고합니다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from ann_index import create_face_index  # noqa: E402
+from face_tracker import FaceTracker  # noqa: E402
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def percentile_report(samples):
+    """초 단위 측정값 목록을 밀리초 단위 p50/p95/p99/평균으로 요약"""
+    values = np.asarray(samples, dtype=np.float64) * 1000.0
+    return {
+        "count": int(values.size),
+        "mean_ms": round(float(values.mean()), 4),
+        "p50_ms": round(float(np.percentile(values, 50)), 4),
+        "p95_ms": round(float(np.percentile(values, 95)), 4),
+        "p99_ms": round(float(np.percentile(values, 99)), 4),
+    }
+
+
+def time_call(fn, repeat, warmup=3):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def load_images(directory, limit=None):
+    if not directory or not os.path.isdir(directory):
+        return []
+    images = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.lower().endswith(IMAGE_EXTENSIONS):
+            image = cv2.imread(os.path.join(directory, filename))
+            if image is not None:
+                images.append(image)
+        if limit and len(images) >= limit:
+            break
+    return images
+
+
+def synthetic_frames(count, width, height, seed):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def make_fixtures(faces_dir, output_dir, frame_count=8, faces_per_frame=3, width=1280, height=720,
+                  seed=0, face_limit=12):
+    """얼굴 사진 폴더로 <output_dir>/faces, <output_dir>/frames 픽스처를 결정적으로 생성
+
+    얼굴 사진은 높이 200 픽셀로 맞춰 저장하고, 프레임은 시드로 정한 배경 위에 얼굴을
+    겹치지 않는 칸에 시드로 정한 크기로 붙여 PNG(무손실)로 저장합니다.
+    """
+    faces = load_images(faces_dir, limit=face_limit)
+    if not faces:
+        raise ValueError(f"얼굴 사진이 없습니다: {faces_dir}")
+    faces = [cv2.resize(face, (max(1, face.shape[1] * 200 // face.shape[0]), 200),
+                        interpolation=cv2.INTER_AREA) for face in faces]
+
+    os.makedirs(os.path.join(output_dir, "faces"), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, "frames"), exist_ok=True)
+    for i, face in enumerate(faces):
+        cv2.imwrite(os.path.join(output_dir, "faces", f"face_{i:03d}.png"), face)
+
+    rng = np.random.default_rng(seed)
+    cell_width = width // max(faces_per_frame, 1)
+    for i in range(frame_count):
+        # 밝기 기울기 + 약한 잡음 배경 (HOG 가 배경에서 얼굴을 찾지 않도록 부드럽게)
+        gradient = np.linspace(60, 180, width, dtype=np.float32)[None, :, None]
+        frame = np.clip(gradient + rng.normal(0, 8, (height, width, 3)), 0, 255).astype(np.uint8)
+        for slot in range(faces_per_frame):
+            face = faces[int(rng.integers(len(faces)))]
+            face_height = int(rng.integers(height // 4, height // 2))
+            face_width = min(cell_width, face.shape[1] * face_height // face.shape[0])
+            face = cv2.resize(face, (face_width, face_height))
+            top = int(rng.integers(0, height - face_height + 1))
+            left = slot * cell_width + int(rng.integers(0, cell_width - face_width + 1))
+            frame[top:top + face_height, left:left + face_width] = face
+        cv2.imwrite(os.path.join(output_dir, "frames", f"frame_{i:03d}.png"), frame)
+    return frame_count
+
+
+def fixture_digest(fixtures):
+    """픽스처 폴더의 파일 이름과 내용으로 계산한 SHA-1 (없으면 None)"""
+    if not fixtures or not os.path.isdir(fixtures):
+        return None
+    digest = hashlib.sha1()
+    for root, dirs, files in os.walk(fixtures):
+        dirs.sort()
+        for filename in sorted(files):
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = os.path.join(root, filename)
+            digest.update(os.path.relpath(path, fixtures).replace(os.sep, "/").encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def synthetic_gallery(size, seed, dim=128):
+    """실제 인코딩과 비슷한 크기(노름 약 1)의 무작위 갤러리"""
+    rng = np.random.default_rng(seed)
+    encodings = rng.normal(0.0, 1.0 / np.sqrt(dim), (size, dim)).astype(np.float32)
+    names = [f"person_{i:06d}" for i in range(size)]
+    return names, encodings
+
+
+def bench_frame_stages(frames, scale, repeat):
+    """resize / color_convert 단계"""
+    results = {}
+    index = [0]
+
+    def next_frame():
+        frame = frames[index[0] % len(frames)]
+        index[0] += 1
+        return frame
+
+    def resize():
+        frame = next_frame()
+        height, width = frame.shape[:2]
+        cv2.resize(frame, (width // scale, height // scale))
+
+    small_frames = [cv2.resize(f, (f.shape[1] // scale, f.shape[0] // scale)) for f in frames]
+
+    def color_convert():
+        cv2.cvtColor(small_frames[index[0] % len(small_frames)], cv2.COLOR_BGR2RGB)
+        index[0] += 1
+
+    results["resize"] = time_call(resize, repeat)
+    results["color_convert"] = time_call(color_convert, repeat)
+    return results
+
+
+def bench_face_stages(frames, scale, repeat):
+    """hog_detect / encode 단계 (face_recognition 이 없으면 빈 결과)
+
+    encode 는 RecognitionEngine 과 같은 경로입니다: 축소 프레임에서 검출한 위치를 원본
+    좌표로 바꾸고, 한 프레임의 얼굴을 원본 해상도 조각(CropBuffer 기본 여백)으로 한 번에
+    encode_face_crops 로 인코딩합니다.
+    """
+    try:
+        import face_recognition
+        from batch_encoder import CropBuffer, encode_face_crops
+        from recognition_engine import detect_face_locations, shrink_frame
+    except ImportError:
+        print("face_recognition 이 설치되어 있지 않아 hog_detect/encode 단계를 건너뜁니다.")
+        return {}
+
+    results = {}
+    rgb_small = [shrink_frame(frame, scale) for frame in frames]
+    index = [0]
+
+    def detect():
+        face_recognition.face_locations(rgb_small[index[0] % len(rgb_small)], model="hog")
+        index[0] += 1
+
+    results["hog_detect"] = time_call(detect, max(1, repeat // 10), warmup=1)
+
+    # 프레임마다 위치를 한 번 찾아 두고 인코딩 시간만 측정
+    samples = []
+    for frame, small in zip(frames, rgb_small):
+        locations = detect_face_locations(small, [], scale)
+        if locations:
+            samples.append((frame, [(top*scale, right*scale, bottom*scale, left*scale)
+                                    for (top, right, bottom, left) in locations]))
+    if samples:
+        crop_buffer = CropBuffer()
+
+        def encode():
+            encode_face_crops([samples[index[0] % len(samples)]], crop_buffer)
+            index[0] += 1
+        results["encode"] = time_call(encode, max(1, repeat // 10), warmup=1)
+    return results
+
+
+def bench_match(gallery_sizes, backends, queries_per_frame, repeat, seed):
+    """합성 갤러리 크기/인덱스 종류별 match 단계"""
+    results = {}
+    for size in gallery_sizes:
+        names, encodings = synthetic_gallery(size, seed)
+        rng = np.random.default_rng(seed + 1)
+        # 등록된 얼굴에 작은 잡음을 더한 질의 (실제 재인식 상황과 비슷하게)
+        picks = rng.integers(0, size, (repeat, queries_per_frame))
+        noise = rng.normal(0.0, 0.02, (repeat, queries_per_frame, encodings.shape[1])).astype(np.float32)
+        queries = encodings[picks] + noise
+        for backend in backends:
+            try:
+                index = create_face_index(backend)
+            except ImportError as e:
+                print(f"{backend} 인덱스를 사용할 수 없어 건너뜁니다: {str(e)}")
+                continue
+            started = time.perf_counter()
+            index.build(names, encodings)
+            build_time = time.perf_counter() - started
+            position = [0]
+
+            def match():
+                index.match(queries[position[0] % repeat], k=1)
+                position[0] += 1
+
+            key = f"match[{backend},{size}]"
+            results[key] = time_call(match, repeat)
+            print(f"{key}: 인덱스 생성 {build_time:.2f}초")
+    return results
+
+
+def bench_display_stages(frames, faces_per_frame, repeat, display_size=(960, 540)):
+    """annotate / qimage 단계 (VideoWidget 과 같은 코드 경로)
+
+    annotate - 표시 크기 버퍼로 축소 후 박스 그리기 (FrameBuffer.render)
+    qimage   - 버퍼를 감싼 QImage 를 화면 크기 캔버스에 그리기 (paintEvent)
+    """
+    results = {}
+    height, width = frames[0].shape[:2]
+    tracker = FaceTracker()
+    boxes = []
+    for i in range(faces_per_frame):
+        left = (i * width) // max(faces_per_frame, 1) + 20
+        boxes.append((height // 3, left + 120, height // 3 + 120, left))
+    tracker.update(boxes, 0.0)
+    for track in tracker.tracks:
+        tracker.set_identity(track, "홍길동", 0.3, 0.0)
+    tracks = tracker.snapshot()
+    index = [0]
+
+    try:
+        from PyQt5.QtGui import QImage, QPainter
+        from video_widget import FrameBuffer
+    except ImportError:
+        print("PyQt5 가 설치되어 있지 않아 annotate / qimage 단계를 건너뜁니다.")
+        return results
+
+    frame_buffer = FrameBuffer()
+
+    def annotate():
+        frame_buffer.render(frames[index[0] % len(frames)], tracks, 0.0, *display_size)
+        index[0] += 1
+
+    results["annotate"] = time_call(annotate, repeat)
+
+    canvas = QImage(display_size[0], display_size[1], QImage.Format_RGB32)
+
+    def to_qimage():
+        painter = QPainter(canvas)
+        painter.drawImage(0, 0, frame_buffer.image)
+        painter.end()
+
+    results["qimage"] = time_call(to_qimage, repeat)
+    return results
+
+
+def summarize(raw, gallery_for_fps):
+    """단계별 요약과 프레임당 합계 기반 예상 fps 계산"""
+    stages = {name: percentile_report(samples) for name, samples in raw.items()}
+    frame_stages = ["resize", "color_convert", "hog_detect", "encode", f"match[{gallery_for_fps}]",
+                    "annotate", "qimage"]
+    per_frame = {}
+    for quantile in ("p50_ms", "p95_ms", "p99_ms"):
+        total = sum(stages[name][quantile] for name in frame_stages if name in stages)
+        per_frame[quantile] = round(total, 4)
+        per_frame[quantile.replace("_ms", "_fps")] = round(1000.0 / total, 1) if total > 0 else None
+    per_frame["stages"] = [name for name in frame_stages if name in stages]
+    return stages, per_frame
+
+
+def compare_baseline(stages, baseline, tolerance):
+    """p95 가 기준보다 tolerance 비율 이상 느려진 단계 목록"""
+    regressions = []
+    for name, current in stages.items():
+        reference = baseline.get("stages", {}).get(name)
+        if not reference:
+            continue
+        limit = reference["p95_ms"] * (1.0 + tolerance)
+        if current["p95_ms"] > limit:
+            regressions.append((name, reference["p95_ms"], current["p95_ms"]))
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="얼굴 인식 경로 벤치마크")
+    parser.add_argument("--fixtures", default=None, help="faces/ 와 frames/ 가 있는 픽스처 폴더")
+    parser.add_argument("--make-fixtures", default=None, metavar="FACES_DIR",
+                        help="이 얼굴 사진 폴더와 --seed 로 --fixtures 폴더에 픽스처를 생성한 뒤 측정")
+    parser.add_argument("--fixture-frames", type=int, default=8, help="생성할 픽스처 프레임 수")
+    parser.add_argument("--galleries", default="1000,10000,100000", help="합성 갤러리 크기 목록")
+    parser.add_argument("--backends", default="exact,ivf", help="측정할 인덱스 종류 목록")
+    parser.add_argument("--faces-per-frame", type=int, default=3, help="프레임당 얼굴 수")
+    parser.add_argument("--scale", type=int, default=4, help="검출 전 축소 배율")
+    parser.add_argument("--width", type=int, default=1280, help="합성 프레임 폭")
+    parser.add_argument("--height", type=int, default=720, help="합성 프레임 높이")
+    parser.add_argument("--repeat", type=int, default=200, help="단계별 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드 (재현용)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--save-baseline", default=None, help="결과를 기준 파일로 저장")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용하는 p95 증가 비율")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    gallery_sizes = [int(size) for size in args.galleries.split(",") if size]
+    backends = [backend for backend in args.backends.split(",") if backend]
+
+    if args.make_fixtures:
+        if not args.fixtures:
+            print("--make-fixtures 에는 만들 위치(--fixtures)가 필요합니다.")
+            return 2
+        count = make_fixtures(args.make_fixtures, args.fixtures, args.fixture_frames,
+                              args.faces_per_frame, args.width, args.height, args.seed)
+        print(f"픽스처 프레임 {count}장을 {args.fixtures} 에 만들었습니다.")
+
+    frames = load_images(os.path.join(args.fixtures, "frames") if args.fixtures else None)
+    if not frames:
+        frames = synthetic_frames(8, args.width, args.height, args.seed)
+
+    raw = {}
+    raw.update(bench_frame_stages(frames, args.scale, args.repeat))
+    if args.fixtures:
+        raw.update(bench_face_stages(frames, args.scale, args.repeat))
+    raw.update(bench_match(gallery_sizes, backends, args.faces_per_frame, args.repeat, args.seed))
+    raw.update(bench_display_stages(frames, args.faces_per_frame, args.repeat))
+
+    fps_gallery = f"{backends[0]},{gallery_sizes[-1]}" if backends and gallery_sizes else ""
+    stages, per_frame = summarize(raw, fps_gallery)
+    result = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+        },
+        "config": vars(args),
+        "fixtures_sha1": fixture_digest(args.fixtures),
+        "stages": stages,
+        "per_frame": per_frame,
+    }
+
+    print(f"{'단계':<24}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}")
+    for name, report in stages.items():
+        print(f"{name:<24}{report['p50_ms']:>10.3f}{report['p95_ms']:>10.3f}{report['p99_ms']:>10.3f}")
+    print(f"프레임당 합계 ({', '.join(per_frame['stages'])}): "
+          f"p50 {per_frame['p50_ms']:.2f}ms ({per_frame['p50_fps']} fps), "
+          f"p95 {per_frame['p95_ms']:.2f}ms ({per_frame['p95_fps']} fps)")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            print(f"결과를 {path} 에 저장했습니다.")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("fixtures_sha1") != result["fixtures_sha1"]:
+            print("경고: 기준 측정과 픽스처가 다릅니다 (--make-fixtures 로 같은 입력을 만드세요).")
+        regressions = compare_baseline(stages, baseline, args.tolerance)
+        if regressions:
+            print(f"성능 저하 감지 (p95 허용치 +{args.tolerance:.0%}):")
+            for name, before, after in regressions:
+                print(f"  {name}: {before:.3f}ms → {after:.3f}ms")
+            return 1
+        print("기준 대비 성능 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
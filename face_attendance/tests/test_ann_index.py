@@ -0,0 +1,75 @@
+"""근사 인덱스(IVF/HNSW)의 top-1 결과를 전수 비교 FaceIndex 와 비교하는 테스트"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from ann_index import HNSWIndex, IVFIndex, hnswlib  # noqa: E402
+from face_index import FaceIndex  # noqa: E402
+
+
+GALLERY_SIZE = 4000
+QUERY_COUNT = 500
+
+
+def seeded_gallery(seed=0, dim=128):
+    """실제 인코딩과 비슷한 크기(노름 약 1)의 갤러리와, 등록된 얼굴에 잡음을 더한 질의"""
+    rng = np.random.default_rng(seed)
+    encodings = rng.normal(0.0, 1.0 / np.sqrt(dim), (GALLERY_SIZE, dim)).astype(np.float32)
+    names = [f"person_{i:05d}" for i in range(GALLERY_SIZE)]
+    picks = rng.integers(0, GALLERY_SIZE, QUERY_COUNT)
+    queries = encodings[picks] + rng.normal(0.0, 0.02, (QUERY_COUNT, dim)).astype(np.float32)
+    return names, encodings, queries
+
+
+def top1_agreement(index, reference, queries):
+    expected = [row[0][0] for row in reference.match(queries, k=1)]
+    found = [row[0][0] if row else None for row in index.match(queries, k=1)]
+    return np.mean([a == b for a, b in zip(expected, found)])
+
+
+@pytest.fixture(scope="module")
+def gallery():
+    names, encodings, queries = seeded_gallery()
+    reference = FaceIndex()
+    reference.build(names, encodings)
+    return names, encodings, queries, reference
+
+
+def test_ivf_top1_matches_exact(gallery):
+    names, encodings, queries, reference = gallery
+    index = IVFIndex(min_train_size=1000)
+    index.build(names, encodings)
+    assert index.is_trained
+    assert top1_agreement(index, reference, queries) >= 0.95
+
+
+def test_ivf_trains_on_add_not_search(gallery):
+    names, encodings, queries, reference = gallery
+    index = IVFIndex(min_train_size=1000)
+    index.build(names[:500], encodings[:500])
+    assert not index.is_trained
+    index.add(names[500:], encodings[500:])
+    # 기준을 넘긴 add() 에서 학습이 끝나 있어야 함 (search() 는 학습하지 않음)
+    assert index.is_trained
+    assert top1_agreement(index, reference, queries) >= 0.95
+
+
+def test_ivf_untrained_equals_exact(gallery):
+    names, encodings, queries, _ = gallery
+    reference = FaceIndex()
+    reference.build(names[:500], encodings[:500])
+    index = IVFIndex(min_train_size=1000)
+    index.build(names[:500], encodings[:500])
+    assert top1_agreement(index, reference, queries) == 1.0
+
+
+@pytest.mark.skipif(hnswlib is None, reason="hnswlib 가 설치되어 있지 않음")
+def test_hnsw_top1_matches_exact(gallery):
+    names, encodings, queries, reference = gallery
+    index = HNSWIndex()
+    index.build(names, encodings)
+    assert top1_agreement(index, reference, queries) >= 0.95